@@ -1,137 +1,138 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+import time
+from dataclasses import dataclass
+from fastapi import Depends, HTTPException, status
+from fastapi.security import OAuth2PasswordBearer
+from jose import jwt, JWTError
+from pydantic import ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from typing import Any, List
+from typing import Optional, Union
 
-from app.api.deps import get_db, get_current_user, get_current_admin_user
+from app.core.cache import LRUCache
+from app.core.config import settings
+from app.db.session import get_async_db, get_db
 from app.models.models import User
-from app.schemas.schemas import UserResponse, SavedModelResponse
-from app.core.security import get_password_hash
+from app.schemas.schemas import TokenPayload
 
-router = APIRouter()
+oauth2_scheme = OAuth2PasswordBearer(tokenUrl=f"{settings.API_V1_STR}/auth/login")
 
-@router.get("/me", response_model=UserResponse)
-def read_current_user(current_user: User = Depends(get_current_user)) -> Any:
+@dataclass(frozen=True)
+class Principal:
     """
-    Get current user.
+    The authenticated user as seen by endpoints. Detached from any session so
+    it can be cached between requests.
     """
-    return current_user
+    id: int
+    email: str
+    username: str
+    is_active: bool
+    is_admin: bool
+
+    @classmethod
+    def from_user(cls, user: User) -> "Principal":
+        return cls(
+            id=user.id,
+            email=user.email,
+            username=user.username,
+            is_active=user.is_active,
+            is_admin=user.is_admin,
+        )
+
+# Verified tokens -> (user id, expiry timestamp), so signatures are checked once
+token_cache = LRUCache(settings.AUTH_TOKEN_CACHE_SIZE)
+
+# User id -> Principal. Invalidated explicitly on local writes; the TTL bounds
+# how long other workers may serve a stale principal.
+principal_cache = LRUCache(
+    settings.AUTH_PRINCIPAL_CACHE_SIZE, ttl=settings.AUTH_PRINCIPAL_CACHE_TTL_SECONDS
+)
 
-@router.get("/me/saved-models", response_model=List[SavedModelResponse])
-def read_current_user_saved_models(
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
-) -> Any:
+def invalidate_principal(user_id: int) -> None:
     """
-    Get current user's saved models.
+    Drop the cached principal of a user. Call after changing the user row.
     """
-    return current_user.saved_models
+    principal_cache.pop(user_id)
 
-@router.put("/me/password", response_model=UserResponse)
-def update_user_password(
-    current_password: str,
-    new_password: str,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
-) -> Any:
+def get_token_user_id(token: str) -> int:
     """
-    Update current user password.
+    Decode a bearer token and return the user id it was issued for.
     """
-    from app.core.security import verify_password
+    cached = token_cache.get(token)
+    if cached is not None:
+        user_id, expires_at = cached
+        if expires_at is None or expires_at > time.time():
+            return user_id
+        token_cache.pop(token)
     
-    # Verify current password
-    if not verify_password(current_password, current_user.hashed_password):
+    try:
+        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+        token_data = TokenPayload(**payload)
+    except (JWTError, ValidationError):
+        token_data = None
+    if token_data is None or token_data.sub is None:
         raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Incorrect password",
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+            headers={"WWW-Authenticate": "Bearer"},
         )
-    
-    # Update password
-    current_user.hashed_password = get_password_hash(new_password)
-    db.add(current_user)
-    db.commit()
-    db.refresh(current_user)
-    
-    return current_user
+    expires_at = token_data.exp.timestamp() if token_data.exp else None
+    token_cache.set(token, (token_data.sub, expires_at))
+    return token_data.sub
 
-@router.get("/", response_model=List[UserResponse])
-def read_users(
-    skip: int = 0,
-    limit: int = 100,
-    current_user: User = Depends(get_current_admin_user),
-    db: Session = Depends(get_db),
-) -> Any:
+def check_user(user: Union[User, Principal, None]) -> Union[User, Principal]:
     """
-    Retrieve users. Admin only.
+    Reject missing and inactive users.
     """
-    users = db.query(User).offset(skip).limit(limit).all()
-    return users
-
-@router.get("/{user_id}", response_model=UserResponse)
-def read_user(
-    user_id: int,
-    current_user: User = Depends(get_current_admin_user),
-    db: Session = Depends(get_db),
-) -> Any:
-    """
-    Get a specific user by id. Admin only.
-    """
-    user = db.query(User).filter(User.id == user_id).first()
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="User not found",
         )
+    if not user.is_active:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Inactive user",
+        )
     return user
 
-@router.put("/{user_id}/activate", response_model=UserResponse)
-def activate_user(
-    user_id: int,
-    current_user: User = Depends(get_current_admin_user),
-    db: Session = Depends(get_db),
-) -> Any:
+def _cache_principal(user: Optional[User]) -> Optional[Principal]:
+    if user is None:
+        return None
+    principal = Principal.from_user(user)
+    principal_cache.set(user.id, principal)
+    return principal
+
+def get_current_user(
+    db: Session = Depends(get_db), token: str = Depends(oauth2_scheme)
+) -> Principal:
     """
-    Activate a user. Admin only.
+    Resolve the user from a bearer token.
     """
-    user = db.query(User).filter(User.id == user_id).first()
-    if not user:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="User not found",
-        )
-    
-    user.is_active = True
-    db.add(user)
-    db.commit()
-    db.refresh(user)
-    
-    return user
+    user_id = get_token_user_id(token)
+    principal = principal_cache.get(user_id)
+    if principal is None:
+        principal = _cache_principal(db.get(User, user_id))
+    return check_user(principal)
 
-@router.put("/{user_id}/deactivate", response_model=UserResponse)
-def deactivate_user(
-    user_id: int,
-    current_user: User = Depends(get_current_admin_user),
-    db: Session = Depends(get_db),
-) -> Any:
+async def get_current_user_async(
+    db: AsyncSession = Depends(get_async_db), token: str = Depends(oauth2_scheme)
+) -> Principal:
     """
-    Deactivate a user. Admin only.
+    Resolve the user from a bearer token, for async endpoints.
     """
-    user = db.query(User).filter(User.id == user_id).first()
-    if not user:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="User not found",
-        )
-    
-    # Prevent deactivating self
-    if user.id == current_user.id:
+    user_id = get_token_user_id(token)
+    principal = principal_cache.get(user_id)
+    if principal is None:
+        principal = _cache_principal(await db.get(User, user_id))
+    return check_user(principal)
+
+def get_current_admin_user(current_user: Principal = Depends(get_current_user)) -> Principal:
+    """
+    Require the current user to be an admin.
+    """
+    if not current_user.is_admin:
         raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Cannot deactivate yourself",
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions",
         )
-    
-    user.is_active = False
-    db.add(user)
-    db.commit()
-    db.refresh(user)
-    
-    return user
+    return current_user
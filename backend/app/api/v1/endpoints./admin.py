@@ -0,0 +1,58 @@
+from fastapi import APIRouter, Depends, Query
+from typing import Any, Dict
+
+from app.api.deps import Principal, get_current_admin_user, principal_cache, token_cache
+from app.core.catalog import catalog_cache
+from app.core.export import EXPORT_FORMAT_PATTERN, export_response
+from app.core.hashing import password_hasher
+from app.core.ratelimit import login_account_limiter, login_ip_limiter
+from app.core.recommender import recommendation_cache, recommendation_flights
+from app.core.similarity import similarity_index_cache
+from app.db.exports import recommendation_export
+from app.db.pool import pool_stats
+from app.db.session import async_engine, engine
+
+router = APIRouter()
+
+@router.get("/metrics", response_model=Dict[str, Any])
+def read_metrics(current_user: Principal = Depends(get_current_admin_user)) -> Any:
+    """
+    Get in-process cache and resource metrics for this worker. Admin only.
+    """
+    return {
+        "catalog": catalog_cache.stats(),
+        "recommendation_cache": recommendation_cache.stats(),
+        "recommendation_flights": recommendation_flights.stats(),
+        "similarity_index": similarity_index_cache.stats(),
+        "password_hasher": password_hasher.stats(),
+        "auth": {
+            "tokens": token_cache.stats(),
+            "principals": principal_cache.stats(),
+            "login_account_limiter": login_account_limiter.stats(),
+            "login_ip_limiter": login_ip_limiter.stats(),
+        },
+        "db_pool": {
+            "sync": pool_stats(engine),
+            "async": pool_stats(async_engine.sync_engine),
+        },
+    }
+
+@router.get("/metrics/pool", response_model=Dict[str, Any])
+def read_pool_metrics(current_user: Principal = Depends(get_current_admin_user)) -> Any:
+    """
+    Get database connection pool occupancy and checkout wait times. Admin only.
+    """
+    return {
+        "sync": pool_stats(engine),
+        "async": pool_stats(async_engine.sync_engine),
+    }
+
+@router.get("/exports/recommendations")
+def export_all_recommendations(
+    export_format: str = Query("ndjson", alias="format", pattern=EXPORT_FORMAT_PATTERN),
+    current_user: Principal = Depends(get_current_admin_user),
+) -> Any:
+    """
+    Stream every user's recommendation items as NDJSON or CSV. Admin only.
+    """
+    return export_response(recommendation_export(), export_format, "all-recommendations")
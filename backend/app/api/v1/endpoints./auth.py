@@ -1,25 +1,27 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session
+from sqlalchemy import case, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import timedelta
 from typing import Any
 
-from app.core.security import create_access_token, verify_password
-from app.api.deps import get_db
+from app.core.security import create_access_token
+from app.api.deps import get_async_db
 from app.schemas.schemas import Token, UserCreate, UserResponse
 from app.models.models import User
 from app.core.config import settings
-from app.core.security import get_password_hash
+from app.core.hashing import password_hasher
+from app.core.ratelimit import client_address, login_account_limiter, login_ip_limiter, retry_after_header
 
 router = APIRouter()
 
 @router.post("/register", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
-def register_user(user_in: UserCreate, db: Session = Depends(get_db)) -> Any:
+async def register_user(user_in: UserCreate, db: AsyncSession = Depends(get_async_db)) -> Any:
     """
     Register a new user.
     """
     # Check if user with the same email already exists
-    user = db.query(User).filter(User.email == user_in.email).first()
+    user = (await db.scalars(select(User).where(User.email == user_in.email))).first()
     if user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -27,7 +29,7 @@ def register_user(user_in: UserCreate, db: Session = Depends(get_db)) -> Any:
         )
     
     # Check if username is taken
-    user = db.query(User).filter(User.username == user_in.username).first()
+    user = (await db.scalars(select(User).where(User.username == user_in.username))).first()
     if user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -38,35 +40,64 @@ def register_user(user_in: UserCreate, db: Session = Depends(get_db)) -> Any:
     user = User(
         email=user_in.email,
         username=user_in.username,
-        hashed_password=get_password_hash(user_in.password),
+        hashed_password=await password_hasher.hash(user_in.password),
     )
     db.add(user)
-    db.commit()
-    db.refresh(user)
+    await db.commit()
+    await db.refresh(user)
     return user
 
 @router.post("/login", response_model=Token)
-def login_for_access_token(
-    db: Session = Depends(get_db), form_data: OAuth2PasswordRequestForm = Depends()
+async def login_for_access_token(
+    request: Request,
+    db: AsyncSession = Depends(get_async_db),
+    form_data: OAuth2PasswordRequestForm = Depends(),
 ) -> Any:
     """
     Get access token for credentials.
     """
-    # Try to authenticate with email
-    user = db.query(User).filter(User.email == form_data.username).first()
+    # Throttle per client IP and per account before any database or bcrypt
+    # work; only failed attempts keep their tokens
+    client_ip = client_address(request)
+    account_key = form_data.username.strip().lower()
+    for limiter, key in ((login_ip_limiter, client_ip), (login_account_limiter, account_key)):
+        allowed, retry_after = await limiter.hit(key)
+        if not allowed:
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Too many login attempts, please retry later",
+                headers=retry_after_header(retry_after),
+            )
     
-    # If user not found by email, try username
-    if not user:
-        user = db.query(User).filter(User.username == form_data.username).first()
+    # Authenticate with email or username in one query, preferring an email match
+    is_email = User.email == form_data.username
+    user = (
+        await db.scalars(
+            select(User)
+            .where(or_(is_email, User.username == form_data.username))
+            .order_by(case((is_email, 0), else_=1))
+            .limit(1)
+        )
+    ).first()
     
-    # Validate user and password
-    if not user or not verify_password(form_data.password, user.hashed_password):
+    # Validate user and password (bcrypt runs on the dedicated hashing pool)
+    verified, new_hash = False, None
+    if user:
+        verified, new_hash = await password_hasher.verify_and_update(
+            form_data.password, user.hashed_password
+        )
+    if not verified:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email/username or password",
             headers={"WWW-Authenticate": "Bearer"},
         )
     
+    # Upgrade the stored hash if the bcrypt cost has changed
+    if new_hash:
+        user.hashed_password = new_hash
+        await db.commit()
+    
     # Check if user is active
     if not user.is_active:
         raise HTTPException(
@@ -74,6 +105,10 @@ def login_for_access_token(
             detail="Inactive user",
         )
     
+    # A successful login is not an attempt to throttle
+    await login_ip_limiter.refund(client_ip)
+    await login_account_limiter.refund(account_key)
+    
     # Create access token
     access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = create_access_token(
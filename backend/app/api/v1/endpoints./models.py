@@ -1,88 +1,403 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+import bisect
+import io
+from contextlib import contextmanager
+import orjson
+from fastapi import APIRouter, Depends, File, HTTPException, Query, Request, UploadFile, status
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import func
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from typing import Any, List, Optional
+from typing import Any, Iterator, List, Optional, Union
 
-from app.api.deps import get_db, get_current_user, get_current_admin_user
-from app.models.models import LLMModel, SavedModel, User
+from app.api.deps import Principal, get_async_db, get_db, get_current_user, get_current_admin_user
+from app.core.catalog import catalog_cache
+from app.core.catalog_import import IMPORT_FORMAT_PATTERN, import_stream
+from app.core.config import settings
+from app.core.export import EXPORT_FORMAT_PATTERN, export_response
+from app.core.fieldsets import SUMMARY_FIELDS, parse_fields
+from app.core.http_cache import etag_matches, not_modified, set_cache_headers
+from app.core.pagination import decode_cursor, encode_cursor
+from app.core.pareto import candidate_mask, objective_cache, pareto_front, resolve_objectives
+from app.core.search import search_index_cache
+from app.core.serialization import RawJSONResponse, cursor_page, encode_list, json_array
+from app.core.similarity import embed_query, similarity_index_cache
+from app.db.benchmarks import leaderboard, remove_model_benchmarks, sync_model_benchmarks
+from app.db.exports import model_export
+from app.db.search import (
+    HIGHLIGHT_FIELDS,
+    MARK_START,
+    model_search,
+    model_search_count,
+    render_headline,
+    search_vector_available,
+)
+from app.models.models import LLMModel, SavedModel
 from app.schemas.schemas import (
+    CatalogImportResult,
+    CursorPage,
+    LeaderboardEntry,
     LLMModelCreate,
     LLMModelResponse,
+    LLMModelSummary,
     LLMModelUpdate,
+    ModelSearchHit,
+    ModelSearchResponse,
+    ParetoRequest,
+    ParetoResponse,
     SavedModelCreate,
     SavedModelResponse,
+    SemanticSearchRequest,
+    SimilarModel,
 )
 
 router = APIRouter()
 
-@router.get("/", response_model=List[LLMModelResponse])
-def read_models(
+CATALOG_CACHE_CONTROL = f"public, max-age={settings.CATALOG_CACHE_MAX_AGE}"
+
+@router.get("/", response_model=Union[CursorPage[LLMModelResponse], List[LLMModelResponse]])
+async def read_models(
+    request: Request,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
     provider: Optional[str] = None,
     min_parameters: Optional[float] = None,
     max_parameters: Optional[float] = None,
     license_type: Optional[str] = None,
-    db: Session = Depends(get_db),
+    fields: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db),
 ) -> Any:
     """
     Retrieve LLM models with optional filtering.
+    
+    Pass ``cursor`` (empty for the first page) to get a page envelope with
+    ``next_cursor``, ordered by id. Without it, ``skip``/``limit`` apply.
+    
+    ``fields`` selects a comma separated subset of model fields; ``summary``
+    gives the LLMModelSummary projection.
+    
+    Rows are served from the snapshot's pre-encoded JSON without revalidation.
     """
-    query = db.query(LLMModel)
+    requested_fields = parse_fields(fields)
+    snapshot = await catalog_cache.get_async(db)
+    
+    # The body is a function of the catalog and the query string only
+    if etag_matches(request, snapshot.etag):
+        return not_modified(snapshot.etag, CATALOG_CACHE_CONTROL)
+    models = snapshot.models
     
     # Apply filters
     if provider:
-        query = query.filter(LLMModel.provider == provider)
+        models = [m for m in models if m.provider == provider]
     if min_parameters:
-        query = query.filter(LLMModel.parameters >= min_parameters)
+        models = [m for m in models if m.parameters is not None and m.parameters >= min_parameters]
     if max_parameters:
-        query = query.filter(LLMModel.parameters <= max_parameters)
+        models = [m for m in models if m.parameters is not None and m.parameters <= max_parameters]
     if license_type:
-        query = query.filter(LLMModel.license_type == license_type)
+        models = [m for m in models if m.license_type == license_type]
+    
+    # Apply keyset pagination on id
+    if cursor is not None:
+        start = 0
+        if cursor:
+            after_id, = decode_cursor(cursor, (int,))
+            start = bisect.bisect_right(models, after_id, key=lambda m: m.id)
+        page = models[start:start + limit]
+        next_cursor = None
+        if start + limit < len(models) and page:
+            next_cursor = encode_cursor([page[-1].id])
+    else:
+        # Apply pagination
+        page = models[skip:skip + limit]
+    
+    # Apply sparse fieldset
+    if requested_fields is None:
+        rows = (snapshot.json_rows[m.id] for m in page)
+    elif requested_fields == SUMMARY_FIELDS:
+        rows = (snapshot.summary_rows[m.id] for m in page)
+    else:
+        rows = (m.model_dump_json(include=requested_fields).encode() for m in page)
+    
+    if cursor is not None:
+        content = cursor_page(rows, next_cursor)
+    else:
+        content = json_array(rows)
+    
+    response = RawJSONResponse(content)
+    set_cache_headers(response, snapshot.etag, CATALOG_CACHE_CONTROL)
+    return response
+
+@router.get("/export")
+def export_models(
+    export_format: str = Query("ndjson", alias="format", pattern=EXPORT_FORMAT_PATTERN),
+    current_user: Principal = Depends(get_current_user),
+) -> Any:
+    """
+    Stream the whole catalog as NDJSON or CSV.
+    """
+    return export_response(model_export(), export_format, "models")
+
+@router.post("/import", response_model=CatalogImportResult)
+def import_models(
+    file: UploadFile = File(...),
+    import_format: Optional[str] = Query(None, alias="format", pattern=IMPORT_FORMAT_PATTERN),
+    batch_size: Optional[int] = Query(None, ge=1, le=10000),
+    current_user: Principal = Depends(get_current_admin_user),
+    db: Session = Depends(get_db),
+) -> Any:
+    """
+    Upsert models from an NDJSON or CSV file (format defaults to the file
+    extension), reporting invalid rows by line number. Admin only.
+    """
+    if import_format is None:
+        import_format = "csv" if (file.filename or "").lower().endswith(".csv") else "ndjson"
+    lines = io.TextIOWrapper(file.file, encoding="utf-8-sig", errors="replace", newline="")
+    return import_stream(db, lines, import_format, batch_size)
+
+@router.get("/search", response_model=ModelSearchResponse)
+async def search_models(
+    q: str = Query(..., min_length=1, max_length=200),
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+    db: AsyncSession = Depends(get_async_db),
+) -> Any:
+    """
+    Search models by capability words in their name, strengths, description
+    and weaknesses. Hits come with a relevance score and highlighted snippets.
+    
+    Uses the Postgres full-text index when available; otherwise, or when it
+    finds nothing (e.g. a typo), the in-process BM25 index with trigram
+    matching.
+    """
+    snapshot = await catalog_cache.get_async(db)
+    hits = []
+    total = 0
+    
+    if (
+        settings.SEARCH_BACKEND == "auto"
+        and db.bind.dialect.name == "postgresql"
+        and await search_vector_available(db)
+    ):
+        rows = (await db.execute(model_search(q, limit, offset))).all()
+        for row in rows:
+            model = snapshot.by_id.get(row.id)
+            if model is None:  # newer than the snapshot
+                continue
+            highlights = {
+                field: render_headline(getattr(row, field))
+                for field in HIGHLIGHT_FIELDS
+                if MARK_START in getattr(row, field)
+            }
+            hits.append(ModelSearchHit(model=model, score=round(row.score, 4), highlights=highlights))
+        total = rows[0].total if rows else 0
+        if not rows and offset > 0:
+            # Past the last full-text hit: an empty page of the same results
+            total = await db.scalar(model_search_count(q))
+    
+    if total == 0:
+        # Building the index after a catalog change is CPU-bound, keep it off the event loop
+        index = await run_in_threadpool(search_index_cache.get, snapshot)
+        total, results = index.search(q, limit=limit, offset=offset)
+        hits = [
+            ModelSearchHit(model=snapshot.by_id[hit.model_id], score=hit.score, highlights=hit.highlights)
+            for hit in results
+        ]
     
-    # Apply pagination
-    models = query.offset(skip).limit(limit).all()
-    return models
+    response = ModelSearchResponse(query=q, total=total, items=hits)
+    return RawJSONResponse(response.model_dump_json())
+
+@router.get("/leaderboard", response_model=CursorPage[LeaderboardEntry])
+async def read_leaderboard(
+    benchmark: str = Query(..., min_length=1),
+    min_score: Optional[float] = Query(None, alias="min"),
+    limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db),
+) -> Any:
+    """
+    Rank models by a benchmark score, best first, optionally only those
+    scoring at least ``min``. Ranks and percentiles are over all models with
+    the benchmark. Pass ``next_cursor`` back as ``cursor`` for the next page.
+    """
+    after = tuple(decode_cursor(cursor, (float, int))) if cursor else None
+    rows = (await db.execute(leaderboard(benchmark, min_score=min_score, after=after, limit=limit + 1))).all()
+    
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor([rows[-1].score, rows[-1].id])
+    items = [
+        LeaderboardEntry(
+            model=LLMModelSummary.model_validate(row, from_attributes=True),
+            score=row.score,
+            rank=row.rank,
+            percentile=row.percentile,
+        )
+        for row in rows
+    ]
+    return RawJSONResponse(CursorPage[LeaderboardEntry](items=items, next_cursor=next_cursor).model_dump_json())
+
+@router.post("/pareto", response_model=ParetoResponse)
+async def read_pareto_front(
+    pareto_in: ParetoRequest,
+    db: AsyncSession = Depends(get_async_db),
+) -> Any:
+    """
+    Get the models meeting the hard constraints that no other such model
+    beats on every objective (the Pareto frontier), best first on the first
+    objective.
+    """
+    snapshot = await catalog_cache.get_async(db)
+    columns = await run_in_threadpool(objective_cache.get, snapshot)
+    objectives = resolve_objectives(columns, [(o.name, o.direction) for o in pareto_in.objectives])
+    candidates = candidate_mask(
+        columns,
+        license_types=pareto_in.license_types,
+        min_parameters=pareto_in.min_parameters,
+        max_parameters=pareto_in.max_parameters,
+        max_cost_tier=pareto_in.max_cost_tier,
+        min_scores=pareto_in.min_scores,
+    )
+    total, front, values = await run_in_threadpool(pareto_front, columns, objectives, candidates)
+    
+    # Join the snapshot's pre-encoded summary rows rather than revalidating
+    names = [name for name, _ in objectives]
+    items = (
+        b'{"model":' + snapshot.summary_rows[snapshot.models[position].id]
+        + b',"values":' + orjson.dumps(dict(zip(names, row.tolist()))) + b"}"
+        for position, row in zip(front.tolist(), values)
+    )
+    header = orjson.dumps({
+        "objectives": [{"name": name, "direction": direction} for name, direction in objectives],
+        "candidates": total,
+    })
+    return RawJSONResponse(header[:-1] + b',"items":' + json_array(items) + b"}")
+
+@router.post("/semantic-search", response_model=List[SimilarModel])
+async def semantic_search(
+    search_in: SemanticSearchRequest,
+    db: AsyncSession = Depends(get_async_db),
+) -> Any:
+    """
+    Find the models whose description, strengths and weaknesses are closest
+    in meaning to a free-text query, with cosine similarity scores.
+    """
+    snapshot = await catalog_cache.get_async(db)
+    # Mapping or first building the embeddings is blocking I/O
+    index = await run_in_threadpool(similarity_index_cache.get, snapshot)
+    neighbours = index.nearest(embed_query(search_in.query, index.dimensions), search_in.limit)
+    # The index may be a generation behind while the new one is built
+    items = [
+        SimilarModel(model=snapshot.by_id[model_id], score=score)
+        for model_id, score in neighbours
+        if model_id in snapshot.by_id
+    ]
+    return RawJSONResponse(encode_list(SimilarModel, items))
+
+@router.get("/{model_id}/similar", response_model=List[SimilarModel])
+async def read_similar_models(
+    model_id: int,
+    limit: int = Query(10, ge=1, le=100),
+    db: AsyncSession = Depends(get_async_db),
+) -> Any:
+    """
+    Get the models most similar to a model, by the text of their
+    description, strengths and weaknesses.
+    """
+    snapshot = await catalog_cache.get_async(db)
+    if model_id not in snapshot.by_id:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Model not found",
+        )
+    
+    index = await run_in_threadpool(similarity_index_cache.get, snapshot)
+    neighbours = index.similar(model_id, limit)
+    items = [
+        SimilarModel(model=snapshot.by_id[other_id], score=score)
+        for other_id, score in neighbours
+        if other_id in snapshot.by_id
+    ]
+    return RawJSONResponse(encode_list(SimilarModel, items))
 
 @router.get("/{model_id}", response_model=LLMModelResponse)
-def read_model(model_id: int, db: Session = Depends(get_db)) -> Any:
+async def read_model(
+    model_id: int,
+    request: Request,
+    db: AsyncSession = Depends(get_async_db),
+) -> Any:
     """
     Get a specific LLM model by id.
     """
-    model = db.query(LLMModel).filter(LLMModel.id == model_id).first()
+    snapshot = await catalog_cache.get_async(db)
+    model = snapshot.by_id.get(model_id)
     if not model:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Model not found",
         )
-    return model
+    
+    etag = snapshot.etags[model_id]
+    if etag_matches(request, etag):
+        return not_modified(etag, CATALOG_CACHE_CONTROL)
+    response = RawJSONResponse(snapshot.json_rows[model_id])
+    set_cache_headers(response, etag, CATALOG_CACHE_CONTROL)
+    return response
+
+def _identity_taken(name: str, provider: str, version: Optional[str]) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail=f"Model {name} {version} by {provider} already exists",
+    )
+
+def _check_identity(
+    db: Session, name: str, provider: str, version: Optional[str], exclude_id: Optional[int] = None
+) -> None:
+    """
+    Reject an identity already used by another model. Like the
+    uq_llm_models_identity index, an empty version equals no version.
+    """
+    query = db.query(LLMModel.id).filter(
+        LLMModel.name == name,
+        LLMModel.provider == provider,
+        func.coalesce(LLMModel.version, "") == (version or ""),
+    )
+    if exclude_id is not None:
+        query = query.filter(LLMModel.id != exclude_id)
+    if query.first():
+        raise _identity_taken(name, provider, version)
+
+@contextmanager
+def _identity_guard(db: Session, model: LLMModel) -> Iterator[None]:
+    # A concurrent write can still take the identity after the check
+    try:
+        yield
+    except IntegrityError:
+        db.rollback()
+        raise _identity_taken(model.name, model.provider, model.version)
 
 @router.post("/", response_model=LLMModelResponse, status_code=status.HTTP_201_CREATED)
 def create_model(
     model_in: LLMModelCreate,
-    current_user: User = Depends(get_current_admin_user),
+    current_user: Principal = Depends(get_current_admin_user),
     db: Session = Depends(get_db),
 ) -> Any:
     """
     Create a new LLM model. Admin only.
     """
     # Check if model with same name and version already exists
-    existing_model = db.query(LLMModel).filter(
-        LLMModel.name == model_in.name,
-        LLMModel.provider == model_in.provider,
-        LLMModel.version == model_in.version
-    ).first()
-    
-    if existing_model:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Model {model_in.name} {model_in.version} by {model_in.provider} already exists",
-        )
+    _check_identity(db, model_in.name, model_in.provider, model_in.version)
     
     # Create new model
     model = LLMModel(**model_in.model_dump())
     db.add(model)
-    db.commit()
+    with _identity_guard(db, model):
+        db.flush()
+        sync_model_benchmarks(db, [model])
+        db.commit()
     db.refresh(model)
+    catalog_cache.invalidate()
     
     return model
 
@@ -90,7 +405,7 @@ def create_model(
 def update_model(
     model_id: int,
     model_in: LLMModelUpdate,
-    current_user: User = Depends(get_current_admin_user),
+    current_user: Principal = Depends(get_current_admin_user),
     db: Session = Depends(get_db),
 ) -> Any:
     """
@@ -104,19 +419,32 @@ def update_model(
         )
     
     # Update model attributes
-    for key, value in model_in.model_dump(exclude_unset=True).items():
+    update_data = model_in.model_dump(exclude_unset=True)
+    _check_identity(
+        db,
+        update_data.get("name", model.name),
+        update_data.get("provider", model.provider),
+        update_data.get("version", model.version),
+        exclude_id=model.id,
+    )
+    for key, value in update_data.items():
         setattr(model, key, value)
     
     db.add(model)
-    db.commit()
+    with _identity_guard(db, model):
+        if "performance_benchmarks" in update_data:
+            db.flush()
+            sync_model_benchmarks(db, [model])
+        db.commit()
     db.refresh(model)
+    catalog_cache.invalidate()
     
     return model
 
-@router.delete("/{model_id}", status_code=status.HTTP_204_NO_CONTENT)
+@router.delete("/{model_id}", status_code=status.HTTP_204_NO_CONTENT, response_model=None)
 def delete_model(
     model_id: int,
-    current_user: User = Depends(get_current_admin_user),
+    current_user: Principal = Depends(get_current_admin_user),
     db: Session = Depends(get_db),
 ) -> Any:
     """
@@ -129,15 +457,17 @@ def delete_model(
             detail="Model not found",
         )
     
+    remove_model_benchmarks(db, model.id)
     db.delete(model)
     db.commit()
+    catalog_cache.invalidate()
     
     return None
 
 @router.post("/save", response_model=SavedModelResponse, status_code=status.HTTP_201_CREATED)
 def save_model(
     saved_model_in: SavedModelCreate,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     db: Session = Depends(get_db),
 ) -> Any:
     """
@@ -177,10 +507,10 @@ def save_model(
     
     return saved_model
 
-@router.delete("/save/{model_id}", status_code=status.HTTP_204_NO_CONTENT)
+@router.delete("/save/{model_id}", status_code=status.HTTP_204_NO_CONTENT, response_model=None)
 def unsave_model(
     model_id: int,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     db: Session = Depends(get_db),
 ) -> Any:
     """
@@ -1,13 +1,55 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from datetime import datetime
+
+import anyio
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.concurrency import run_in_threadpool
+from pydantic import TypeAdapter
+from sqlalchemy import tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from typing import Any, List, Dict
+from starlette.requests import ClientDisconnect
+from typing import Any, List, Dict, Optional, Union
 
-from app.api.deps import get_db, get_current_user
-from app.models.models import User, LLMModel, Recommendation, RecommendationItem
+from app.api.deps import (
+    Principal,
+    get_async_db,
+    get_current_admin_user,
+    get_current_user,
+    get_current_user_async,
+    get_db,
+)
+from app.core.batch import DuplexStreamingResponse, aiter_ndjson, parse_profile, run_batch_stream
+from app.core.catalog import catalog_cache
+from app.core.config import settings
+from app.core.export import EXPORT_FORMAT_PATTERN, export_response
+from app.core.fieldsets import wants_summary
+from app.core.http_cache import etag_matches, make_etag, not_modified, set_cache_headers
+from app.core.pagination import decode_cursor, encode_cursor
+from app.core.recommender import (
+    build_profile,
+    load_profile,
+    match_models,
+    match_models_async,
+    scoring_profile_cache,
+)
+from app.core.scoring import DEFAULT_PROFILE
+from app.core.serialization import RawJSONResponse, encode_list
+from app.db.bulk import insert_recommendation
+from app.db.exports import recommendation_export
+from app.db.queries import user_recommendation, user_recommendations
+from app.db.session import SessionLocal
+from app.models.models import Recommendation, RecommendationItem, ScoringProfile
 from app.schemas.schemas import (
+    CursorPage,
     RecommendationCreate, 
+    RecommendationItemResponse,
     RecommendationResponse, 
-    RequirementQuestion
+    RecommendationSummaryResponse,
+    RequirementQuestion,
+    ScoringProfileCreate,
+    ScoringProfileResponse,
+    ScoringProfileUpdate,
 )
 
 router = APIRouter()
@@ -77,81 +119,305 @@ RECOMMENDATION_QUESTIONS = [
     ),
 ]
 
+# The questionnaire never changes at runtime, so serialize it once
+RECOMMENDATION_QUESTIONS_JSON = TypeAdapter(List[RequirementQuestion]).dump_json(RECOMMENDATION_QUESTIONS)
+RECOMMENDATION_QUESTIONS_ETAG = make_etag(RECOMMENDATION_QUESTIONS_JSON)
+QUESTIONS_CACHE_CONTROL = f"public, max-age={settings.QUESTIONS_CACHE_MAX_AGE}"
+
 @router.get("/questions", response_model=List[RequirementQuestion])
-def get_recommendation_questions() -> Any:
+def get_recommendation_questions(request: Request) -> Any:
     """
     Get recommendation questionnaire.
     """
-    return RECOMMENDATION_QUESTIONS
+    if etag_matches(request, RECOMMENDATION_QUESTIONS_ETAG):
+        return not_modified(RECOMMENDATION_QUESTIONS_ETAG, QUESTIONS_CACHE_CONTROL)
+    response = RawJSONResponse(RECOMMENDATION_QUESTIONS_JSON)
+    set_cache_headers(response, RECOMMENDATION_QUESTIONS_ETAG, QUESTIONS_CACHE_CONTROL)
+    return response
+
+@router.get("/profiles", response_model=List[ScoringProfileResponse])
+def read_scoring_profiles(
+    current_user: Principal = Depends(get_current_user),
+    db: Session = Depends(get_db),
+) -> Any:
+    """
+    List the named scoring profiles.
+    """
+    return db.query(ScoringProfile).order_by(ScoringProfile.name).all()
+
+@router.post("/profiles", response_model=ScoringProfileResponse, status_code=status.HTTP_201_CREATED)
+def create_scoring_profile(
+    profile_in: ScoringProfileCreate,
+    current_user: Principal = Depends(get_current_admin_user),
+    db: Session = Depends(get_db),
+) -> Any:
+    """
+    Create a named scoring profile. Admin only.
+    """
+    # Reject profiles that do not compile
+    build_profile(profile_in.weights, profile_in.min_score, profile_in.top_k)
+    
+    if db.query(ScoringProfile).filter(ScoringProfile.name == profile_in.name).first():
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Scoring profile {profile_in.name} already exists",
+        )
+    
+    profile = ScoringProfile(**profile_in.model_dump())
+    db.add(profile)
+    db.commit()
+    db.refresh(profile)
+    scoring_profile_cache.pop(profile.name)
+    
+    return profile
+
+@router.put("/profiles/{profile_id}", response_model=ScoringProfileResponse)
+def update_scoring_profile(
+    profile_id: int,
+    profile_in: ScoringProfileUpdate,
+    current_user: Principal = Depends(get_current_admin_user),
+    db: Session = Depends(get_db),
+) -> Any:
+    """
+    Update a scoring profile. Admin only.
+    """
+    profile = db.query(ScoringProfile).filter(ScoringProfile.id == profile_id).first()
+    if not profile:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Scoring profile not found",
+        )
+    
+    update_data = profile_in.model_dump(exclude_unset=True)
+    if update_data.get("name") is None:
+        update_data.pop("name", None)
+    elif update_data["name"] != profile.name and db.query(ScoringProfile).filter(
+        ScoringProfile.name == update_data["name"]
+    ).first():
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Scoring profile {update_data['name']} already exists",
+        )
+    
+    # Update profile attributes, then check that the result still compiles
+    old_name = profile.name
+    for key, value in update_data.items():
+        setattr(profile, key, value)
+    build_profile(profile.weights, profile.min_score, profile.top_k)
+    
+    db.add(profile)
+    db.commit()
+    db.refresh(profile)
+    scoring_profile_cache.pop(old_name)
+    scoring_profile_cache.pop(profile.name)
+    
+    return profile
+
+@router.delete("/profiles/{profile_id}", status_code=status.HTTP_204_NO_CONTENT, response_model=None)
+def delete_scoring_profile(
+    profile_id: int,
+    current_user: Principal = Depends(get_current_admin_user),
+    db: Session = Depends(get_db),
+) -> Any:
+    """
+    Delete a scoring profile. Admin only.
+    """
+    profile = db.query(ScoringProfile).filter(ScoringProfile.id == profile_id).first()
+    if not profile:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Scoring profile not found",
+        )
+    
+    db.delete(profile)
+    db.commit()
+    scoring_profile_cache.pop(profile.name)
+    
+    return None
 
 @router.post("/", response_model=RecommendationResponse, status_code=status.HTTP_201_CREATED)
-def create_recommendation(
+async def create_recommendation(
     recommendation_in: RecommendationCreate,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db),
 ) -> Any:
     """
     Create a new recommendation based on user requirements.
     """
-    # Create recommendation record
-    recommendation = Recommendation(
-        user_id=current_user.id,
-        requirements=recommendation_in.requirements
+    # Layer the request's own weights over the named profile, if any
+    profile = DEFAULT_PROFILE
+    if recommendation_in.profile is not None:
+        profile = await load_profile(db, recommendation_in.profile)
+    profile = build_profile(
+        recommendation_in.weights,
+        recommendation_in.min_score,
+        recommendation_in.top_k,
+        base=profile,
     )
-    db.add(recommendation)
-    db.commit()
-    db.refresh(recommendation)
     
-    # Get relevant models based on requirements
-    models = get_matching_models(recommendation_in.requirements, db)
+    # Score against one snapshot so every recommended model is in it
+    snapshot = await catalog_cache.get_async(db)
+    results = await match_models_async(
+        recommendation_in.requirements,
+        db,
+        snapshot,
+        profile=profile,
+        strict=recommendation_in.strict,
+    )
     
-    # Create recommendation items
-    for model_score in models:
-        model_id = model_score["model_id"]
-        score = model_score["score"]
-        reasoning = model_score["reasoning"]
+    # Persist the recommendation and its items in a single transaction
+    user_id = current_user.id
+    recommendation_id, created_at, item_ids = await db.run_sync(
+        lambda session: insert_recommendation(session, user_id, recommendation_in.requirements, results)
+    )
+    await db.commit()
+    
+    # Build the response from the scored data instead of re-reading it, and
+    # encode it directly rather than letting FastAPI revalidate it
+    recommendation = RecommendationResponse(
+        id=recommendation_id,
+        requirements=recommendation_in.requirements,
+        created_at=created_at,
+        items=[
+            RecommendationItemResponse(
+                id=item_id,
+                model=snapshot.by_id[result["model_id"]],
+                score=result["score"],
+                reasoning=result["reasoning"],
+            )
+            for item_id, result in zip(item_ids, results)
+        ],
+    )
+    return RawJSONResponse(recommendation.model_dump_json(), status_code=status.HTTP_201_CREATED)
+
+@router.post("/batch")
+async def create_recommendations_batch(
+    request: Request,
+    chunk_size: Optional[int] = Query(None, ge=1, le=10000),
+    current_user: Principal = Depends(get_current_user),
+) -> Any:
+    """
+    Create recommendations for a JSON list or NDJSON stream of requirement dicts.
+    One NDJSON result line per profile is streamed back as chunks complete;
+    an NDJSON body is scored as it arrives rather than read up front.
+    """
+    body_read = anyio.Event()
+    if request.headers.get("content-type", "").startswith("application/x-ndjson"):
+        async def body():
+            try:
+                async for chunk in request.stream():
+                    yield chunk
+            finally:
+                body_read.set()
         
-        item = RecommendationItem(
-            recommendation_id=recommendation.id,
-            model_id=model_id,
-            score=score,
-            reasoning=reasoning
-        )
-        db.add(item)
+        profiles = aiter_ndjson(body())
+    else:
+        try:
+            body = await request.json()
+        except ValueError:
+            body = None
+        body_read.set()
+        if not isinstance(body, list):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Expected a JSON array or an NDJSON stream of requirements",
+            )
+        
+        async def listed():
+            for index, value in enumerate(body):
+                yield index, parse_profile(value)
+        
+        profiles = listed()
     
-    db.commit()
-    db.refresh(recommendation)
+    user_id = current_user.id
     
-    return recommendation
+    async def stream_results():
+        # Use a dedicated session whose lifetime matches the stream
+        db = SessionLocal()
+        try:
+            async for record in run_batch_stream(db, user_id, profiles, chunk_size=chunk_size):
+                yield orjson.dumps(record) + b"\n"
+        except ClientDisconnect:
+            pass
+        finally:
+            await run_in_threadpool(db.close)
+    
+    return DuplexStreamingResponse(stream_results(), body_read, media_type="application/x-ndjson")
 
-@router.get("/", response_model=List[RecommendationResponse])
-def read_recommendations(
+@router.get(
+    "/",
+    response_model=Union[
+        CursorPage[RecommendationResponse],
+        List[RecommendationResponse],
+        CursorPage[RecommendationSummaryResponse],
+        List[RecommendationSummaryResponse],
+    ],
+)
+async def read_recommendations(
     skip: int = 0, 
     limit: int = 10,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+    current_user: Principal = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db),
 ) -> Any:
     """
     Read current user's recommendation history.
+    
+    Pass ``cursor`` (empty for the first page) to get a page envelope with
+    ``next_cursor``. Without it, ``skip``/``limit`` apply. With
+    ``fields=summary`` nested models use the LLMModelSummary projection.
     """
-    recommendations = db.query(Recommendation).filter(
-        Recommendation.user_id == current_user.id
-    ).order_by(Recommendation.created_at.desc()).offset(skip).limit(limit).all()
+    summary = wants_summary(fields)
+    schema = RecommendationSummaryResponse if summary else RecommendationResponse
+    query = user_recommendations(current_user.id, summary=summary)
     
-    return recommendations
+    # Apply keyset pagination on (created_at, id), newest first
+    if cursor is not None:
+        if cursor:
+            created_at, recommendation_id = decode_cursor(cursor, (datetime, int))
+            query = query.where(
+                tuple_(Recommendation.created_at, Recommendation.id) < tuple_(created_at, recommendation_id)
+            )
+        recommendations = (await db.scalars(query.limit(limit + 1))).all()
+        next_cursor = None
+        if len(recommendations) > limit:
+            recommendations = recommendations[:limit]
+            last = recommendations[-1]
+            next_cursor = encode_cursor([last.created_at, last.id])
+        page = CursorPage[schema](items=recommendations, next_cursor=next_cursor)
+        return RawJSONResponse(page.model_dump_json())
+    
+    recommendations = (await db.scalars(query.offset(skip).limit(limit))).all()
+    
+    return RawJSONResponse(encode_list(schema, recommendations))
+
+@router.get("/export")
+def export_recommendations(
+    export_format: str = Query("ndjson", alias="format", pattern=EXPORT_FORMAT_PATTERN),
+    current_user: Principal = Depends(get_current_user),
+) -> Any:
+    """
+    Stream the current user's recommendation history as NDJSON or CSV, one
+    row per recommended model, oldest first.
+    """
+    return export_response(recommendation_export(current_user.id), export_format, "recommendations")
 
-@router.get("/{recommendation_id}", response_model=RecommendationResponse)
-def read_recommendation(
+@router.get("/{recommendation_id}", response_model=Union[RecommendationResponse, RecommendationSummaryResponse])
+async def read_recommendation(
     recommendation_id: int,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    fields: Optional[str] = None,
+    current_user: Principal = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db),
 ) -> Any:
     """
-    Get a specific recommendation by id.
+    Get a specific recommendation by id. With ``fields=summary`` nested
+    models use the LLMModelSummary projection.
     """
-    recommendation = db.query(Recommendation).filter(
-        Recommendation.id == recommendation_id,
-        Recommendation.user_id == current_user.id
+    summary = wants_summary(fields)
+    schema = RecommendationSummaryResponse if summary else RecommendationResponse
+    recommendation = (
+        await db.scalars(user_recommendation(current_user.id, recommendation_id, summary=summary))
     ).first()
     
     if not recommendation:
@@ -160,12 +426,12 @@ def read_recommendation(
             detail="Recommendation not found",
         )
     
-    return recommendation
+    return RawJSONResponse(schema.model_validate(recommendation).model_dump_json())
 
-@router.delete("/{recommendation_id}", status_code=status.HTTP_204_NO_CONTENT)
+@router.delete("/{recommendation_id}", status_code=status.HTTP_204_NO_CONTENT, response_model=None)
 def delete_recommendation(
     recommendation_id: int,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     db: Session = Depends(get_db),
 ) -> Any:
     """
@@ -194,123 +460,9 @@ def delete_recommendation(
     return None
 
 # Helper function to match models to requirements
-def get_matching_models(requirements: Dict, db: Session) -> List[Dict]:
+def get_matching_models(requirements: Dict, db: Session, strict: bool = False) -> List[Dict]:
     """
     Match LLM models to user requirements and return sorted matches with scores.
+    In strict mode, models failing a hard constraint are filtered out in SQL.
     """
-    models = db.query(LLMModel).all()
-    results = []
-    
-    for model in models:
-        score = 0
-        reasoning_points = []
-        
-        # Task type matching
-        if "task_type" in requirements:
-            task_type = requirements["task_type"]
-            if task_type == "text_generation" and "text generation" in model.strengths.lower():
-                score += 20
-                reasoning_points.append("Excellent for text generation tasks")
-            elif task_type == "code_generation" and "code" in model.strengths.lower():
-                score += 20
-                reasoning_points.append("Specialized in code generation")
-            elif task_type == "translation" and "translation" in model.strengths.lower():
-                score += 20
-                reasoning_points.append("Strong multilingual translation capabilities")
-            elif task_type == "summarization" and "summarization" in model.strengths.lower():
-                score += 20
-                reasoning_points.append("Effective at text summarization")
-            elif task_type == "qa" and ("qa" in model.strengths.lower() or "question answering" in model.strengths.lower()):
-                score += 20
-                reasoning_points.append("Optimized for question answering")
-            elif task_type == "chat" and "conversational" in model.strengths.lower():
-                score += 20
-                reasoning_points.append("Designed for conversational interactions")
-        
-        # Size preference matching
-        if "size_preference" in requirements:
-            size_pref = requirements["size_preference"]
-            if size_pref == "small" and model.parameters and model.parameters <= 5:
-                score += 15
-                reasoning_points.append("Small model size as preferred")
-            elif size_pref == "medium" and model.parameters and 5 < model.parameters <= 20:
-                score += 15
-                reasoning_points.append("Medium model size as preferred")
-            elif size_pref == "large" and model.parameters and 20 < model.parameters <= 100:
-                score += 15
-                reasoning_points.append("Large model size as preferred")
-            elif size_pref == "xlarge" and model.parameters and model.parameters > 100:
-                score += 15
-                reasoning_points.append("Extra large model as preferred")
-        
-        # License preference matching
-        if "license_preference" in requirements:
-            license_pref = requirements["license_preference"]
-            if license_pref == "any" or license_pref == model.license_type:
-                score += 15
-                reasoning_points.append(f"License type ({model.license_type}) matches preference")
-        
-        # Budget constraint matching
-        if "budget_constraint" in requirements and model.pricing_info:
-            budget = requirements["budget_constraint"]
-            if budget == "free" and "free" in model.pricing_info.lower():
-                score += 15
-                reasoning_points.append("Available for free as required")
-            elif budget == "low" and "low" in model.pricing_info.lower():
-                score += 15
-                reasoning_points.append("Low cost option")
-            elif budget == "medium" and "medium" in model.pricing_info.lower():
-                score += 15
-                reasoning_points.append("Medium cost tier")
-            elif budget == "high" and "enterprise" in model.pricing_info.lower():
-                score += 15
-                reasoning_points.append("Enterprise-grade offering")
-            elif budget == "any":
-                score += 10
-                reasoning_points.append("Matches any budget constraint")
-        
-        # Language support matching
-        if "language_support" in requirements and model.supported_languages:
-            lang_support = requirements["language_support"]
-            if lang_support == "english" and "english" in [lang.lower() for lang in model.supported_languages]:
-                score += 15
-                reasoning_points.append("Supports English as required")
-            elif lang_support == "multilingual" and len(model.supported_languages) > 5:
-                score += 15
-                reasoning_points.append("Strong multilingual support")
-            elif lang_support == "specific" and "specific_languages" in requirements:
-                specific_langs = requirements["specific_languages"]
-                supported = all(lang.lower() in [l.lower() for l in model.supported_languages] for lang in specific_langs)
-                if supported:
-                    score += 15
-                    reasoning_points.append("Supports all the specific languages required")
-        
-        # Deployment preference matching
-        if "deployment" in requirements:
-            deployment = requirements["deployment"]
-            if deployment == "cloud" and "api" in model.hardware_requirements.lower():
-                score += 15
-                reasoning_points.append("Available as cloud API")
-            elif deployment == "local" and "local" in model.hardware_requirements.lower():
-                score += 15
-                reasoning_points.append("Suitable for local deployment")
-            elif deployment == "hybrid":
-                score += 10
-                reasoning_points.append("Can be used in hybrid deployment")
-        
-        # Add basic points for all models
-        score += 5
-        
-        # Only include models with a minimum score
-        if score >= 30:
-            results.append({
-                "model_id": model.id,
-                "score": score,
-                "reasoning": ". ".join(reasoning_points) + "."
-            })
-    
-    # Sort by score (highest first)
-    results.sort(key=lambda x: x["score"], reverse=True)
-    
-    # Return top 5 results
-    return results[:5]
+    return match_models(requirements, db, strict=strict)
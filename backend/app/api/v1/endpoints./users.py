@@ -1,203 +1,176 @@
 from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from typing import Any, List, Optional
+from typing import Any, List, Optional, Union
 
-from app.api.deps import get_db, get_current_user, get_current_admin_user
-from app.models.models import LLMModel, SavedModel, User
-from app.schemas.schemas import (
-    LLMModelCreate,
-    LLMModelResponse,
-    LLMModelUpdate,
-    SavedModelCreate,
-    SavedModelResponse,
+from app.api.deps import (
+    Principal,
+    get_async_db,
+    get_current_admin_user,
+    get_current_user,
+    get_current_user_async,
+    get_db,
+    invalidate_principal,
 )
+from app.models.models import User
+from app.core.fieldsets import wants_summary
+from app.core.pagination import decode_cursor, encode_cursor
+from app.core.serialization import RawJSONResponse, encode_list
+from app.schemas.schemas import CursorPage, UserResponse, SavedModelResponse, SavedModelSummaryResponse
+from app.core.hashing import password_hasher
+from app.db.queries import user_saved_models
 
 router = APIRouter()
 
-@router.get("/", response_model=List[LLMModelResponse])
-def read_models(
-    skip: int = 0,
-    limit: int = 100,
-    provider: Optional[str] = None,
-    min_parameters: Optional[float] = None,
-    max_parameters: Optional[float] = None,
-    license_type: Optional[str] = None,
-    db: Session = Depends(get_db),
-) -> Any:
+@router.get("/me", response_model=UserResponse)
+def read_current_user(current_user: Principal = Depends(get_current_user)) -> Any:
     """
-    Retrieve LLM models with optional filtering.
+    Get current user.
     """
-    query = db.query(LLMModel)
-    
-    # Apply filters
-    if provider:
-        query = query.filter(LLMModel.provider == provider)
-    if min_parameters:
-        query = query.filter(LLMModel.parameters >= min_parameters)
-    if max_parameters:
-        query = query.filter(LLMModel.parameters <= max_parameters)
-    if license_type:
-        query = query.filter(LLMModel.license_type == license_type)
-    
-    # Apply pagination
-    models = query.offset(skip).limit(limit).all()
-    return models
+    return current_user
 
-@router.get("/{model_id}", response_model=LLMModelResponse)
-def read_model(model_id: int, db: Session = Depends(get_db)) -> Any:
+@router.get("/me/saved-models", response_model=Union[List[SavedModelResponse], List[SavedModelSummaryResponse]])
+def read_current_user_saved_models(
+    fields: Optional[str] = None,
+    current_user: Principal = Depends(get_current_user),
+    db: Session = Depends(get_db),
+) -> Any:
     """
-    Get a specific LLM model by id.
+    Get current user's saved models. With ``fields=summary`` models use the
+    LLMModelSummary projection.
     """
-    model = db.query(LLMModel).filter(LLMModel.id == model_id).first()
-    if not model:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Model not found",
-        )
-    return model
+    summary = wants_summary(fields)
+    schema = SavedModelSummaryResponse if summary else SavedModelResponse
+    saved_models = db.scalars(user_saved_models(current_user.id, summary=summary)).all()
+    return RawJSONResponse(encode_list(schema, saved_models))
 
-@router.post("/", response_model=LLMModelResponse, status_code=status.HTTP_201_CREATED)
-def create_model(
-    model_in: LLMModelCreate,
-    current_user: User = Depends(get_current_admin_user),
-    db: Session = Depends(get_db),
+@router.put("/me/password", response_model=UserResponse)
+async def update_user_password(
+    current_password: str,
+    new_password: str,
+    current_user: Principal = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db),
 ) -> Any:
     """
-    Create a new LLM model. Admin only.
+    Update current user password.
     """
-    # Check if model with same name and version already exists
-    existing_model = db.query(LLMModel).filter(
-        LLMModel.name == model_in.name,
-        LLMModel.provider == model_in.provider,
-        LLMModel.version == model_in.version
-    ).first()
+    user = await db.get(User, current_user.id)
     
-    if existing_model:
+    # Verify current password
+    if not await password_hasher.verify(current_password, user.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Model {model_in.name} {model_in.version} by {model_in.provider} already exists",
+            detail="Incorrect password",
         )
     
-    # Create new model
-    model = LLMModel(**model_in.model_dump())
-    db.add(model)
-    db.commit()
-    db.refresh(model)
+    # Update password
+    user.hashed_password = await password_hasher.hash(new_password)
+    db.add(user)
+    await db.commit()
+    await db.refresh(user)
+    invalidate_principal(user.id)
     
-    return model
+    return user
 
-@router.put("/{model_id}", response_model=LLMModelResponse)
-def update_model(
-    model_id: int,
-    model_in: LLMModelUpdate,
-    current_user: User = Depends(get_current_admin_user),
+@router.get("/", response_model=Union[CursorPage[UserResponse], List[UserResponse]])
+def read_users(
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    current_user: Principal = Depends(get_current_admin_user),
     db: Session = Depends(get_db),
 ) -> Any:
     """
-    Update an LLM model. Admin only.
-    """
-    model = db.query(LLMModel).filter(LLMModel.id == model_id).first()
-    if not model:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Model not found",
-        )
-    
-    # Update model attributes
-    for key, value in model_in.model_dump(exclude_unset=True).items():
-        setattr(model, key, value)
-    
-    db.add(model)
-    db.commit()
-    db.refresh(model)
+    Retrieve users. Admin only.
     
-    return model
+    Pass ``cursor`` (empty for the first page) to get a page envelope with
+    ``next_cursor``, ordered by id. Without it, ``skip``/``limit`` apply.
+    """
+    query = db.query(User).order_by(User.id)
+    
+    # Apply keyset pagination on id
+    if cursor is not None:
+        if cursor:
+            after_id, = decode_cursor(cursor, (int,))
+            query = query.filter(User.id > after_id)
+        users = query.limit(limit + 1).all()
+        next_cursor = None
+        if len(users) > limit:
+            users = users[:limit]
+            next_cursor = encode_cursor([users[-1].id])
+        return CursorPage[UserResponse](items=users, next_cursor=next_cursor)
+    
+    users = query.offset(skip).limit(limit).all()
+    return users
 
-@router.delete("/{model_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_model(
-    model_id: int,
-    current_user: User = Depends(get_current_admin_user),
+@router.get("/{user_id}", response_model=UserResponse)
+def read_user(
+    user_id: int,
+    current_user: Principal = Depends(get_current_admin_user),
     db: Session = Depends(get_db),
 ) -> Any:
     """
-    Delete an LLM model. Admin only.
+    Get a specific user by id. Admin only.
     """
-    model = db.query(LLMModel).filter(LLMModel.id == model_id).first()
-    if not model:
+    user = db.query(User).filter(User.id == user_id).first()
+    if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
-            detail="Model not found",
+            detail="User not found",
         )
-    
-    db.delete(model)
-    db.commit()
-    
-    return None
+    return user
 
-@router.post("/save", response_model=SavedModelResponse, status_code=status.HTTP_201_CREATED)
-def save_model(
-    saved_model_in: SavedModelCreate,
-    current_user: User = Depends(get_current_user),
+@router.put("/{user_id}/activate", response_model=UserResponse)
+def activate_user(
+    user_id: int,
+    current_user: Principal = Depends(get_current_admin_user),
     db: Session = Depends(get_db),
 ) -> Any:
     """
-    Save an LLM model to user's collection.
+    Activate a user. Admin only.
     """
-    # Check if model exists
-    model = db.query(LLMModel).filter(LLMModel.id == saved_model_in.model_id).first()
-    if not model:
+    user = db.query(User).filter(User.id == user_id).first()
+    if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
-            detail="Model not found",
+            detail="User not found",
         )
     
-    # Check if model already saved by user
-    existing_saved = db.query(SavedModel).filter(
-        SavedModel.user_id == current_user.id,
-        SavedModel.model_id == saved_model_in.model_id
-    ).first()
-    
-    if existing_saved:
-        # Update notes if model already saved
-        existing_saved.notes = saved_model_in.notes
-        db.add(existing_saved)
-        db.commit()
-        db.refresh(existing_saved)
-        return existing_saved
-    
-    # Create new saved model
-    saved_model = SavedModel(
-        user_id=current_user.id,
-        model_id=saved_model_in.model_id,
-        notes=saved_model_in.notes
-    )
-    db.add(saved_model)
+    user.is_active = True
+    db.add(user)
     db.commit()
-    db.refresh(saved_model)
+    db.refresh(user)
+    invalidate_principal(user.id)
     
-    return saved_model
+    return user
 
-@router.delete("/save/{model_id}", status_code=status.HTTP_204_NO_CONTENT)
-def unsave_model(
-    model_id: int,
-    current_user: User = Depends(get_current_user),
+@router.put("/{user_id}/deactivate", response_model=UserResponse)
+def deactivate_user(
+    user_id: int,
+    current_user: Principal = Depends(get_current_admin_user),
     db: Session = Depends(get_db),
 ) -> Any:
     """
-    Remove an LLM model from user's saved collection.
+    Deactivate a user. Admin only.
     """
-    saved_model = db.query(SavedModel).filter(
-        SavedModel.user_id == current_user.id,
-        SavedModel.model_id == model_id
-    ).first()
-    
-    if not saved_model:
+    user = db.query(User).filter(User.id == user_id).first()
+    if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
-            detail="Model not found in your saved collection",
+            detail="User not found",
+        )
+    
+    # Prevent deactivating self
+    if user.id == current_user.id:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Cannot deactivate yourself",
         )
     
-    db.delete(saved_model)
+    user.is_active = False
+    db.add(user)
     db.commit()
+    db.refresh(user)
+    invalidate_principal(user.id)
     
-    return None
+    return user
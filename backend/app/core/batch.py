@@ -0,0 +1,283 @@
+"""
+Batch scoring of many requirement profiles against one catalog snapshot.
+
+Distinct profiles are scored in chunks across a long-lived process pool;
+identical profiles within a batch are scored once. Results are persisted
+with bulk inserts as each chunk completes, so callers can stream them back.
+"""
+import json
+import multiprocessing
+import os
+import threading
+import uuid
+import weakref
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Any, AsyncIterable, AsyncIterator, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+import anyio
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+
+from app.core.catalog import catalog_cache
+from app.core.config import settings
+from app.core.recommender import requirements_key
+from app.core.scoring import CompiledCatalog, score_catalog
+from app.db.bulk import bulk_create_recommendations
+
+# (input index, requirements dict or parse error message)
+Profile = Tuple[int, Union[Dict[str, Any], str]]
+
+# The last catalog a worker process was sent, with its token
+_worker_catalog: Optional[Tuple[str, CompiledCatalog]] = None
+
+
+def _score_chunk(
+    token: str, profiles: List[Dict[str, Any]], catalog: Optional[CompiledCatalog] = None
+) -> Optional[List[List[Dict]]]:
+    global _worker_catalog
+    if catalog is not None:
+        _worker_catalog = (token, catalog)
+    elif _worker_catalog is None or _worker_catalog[0] != token:
+        return None  # the caller resends the chunk with the catalog
+    return [score_catalog(_worker_catalog[1], requirements) for requirements in profiles]
+
+
+class ScoringPool:
+    """
+    Process pool for batch scoring, created on first use (sized by that
+    caller) and kept for the life of the process. Workers keep the last
+    catalog they were sent, so a catalog is pickled about once per worker
+    rather than per batch.
+    """
+
+    def __init__(self):
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._tokens: Dict[int, str] = {}
+        self.workers = 0
+
+    def get(self, max_workers: int) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                # spawn: forking a threaded server process is unsafe
+                self._executor = ProcessPoolExecutor(
+                    max_workers=max_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+                self.workers = max_workers
+            return self._executor
+
+    def token(self, catalog: CompiledCatalog) -> str:
+        """
+        A token naming catalog in the workers, dropped when catalog is.
+        """
+        key = id(catalog)
+        with self._lock:
+            token = self._tokens.get(key)
+            if token is None:
+                token = self._tokens[key] = uuid.uuid4().hex
+                weakref.finalize(catalog, self._tokens.pop, key, None)
+            return token
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+scoring_pool = ScoringPool()
+
+
+def parse_profile(value: Any) -> Union[Dict[str, Any], str]:
+    """
+    Validate one decoded profile, returning it or an error message.
+    """
+    if not isinstance(value, dict):
+        return "Requirements must be a JSON object"
+    return value
+
+
+def iter_ndjson(lines: Iterable[Union[str, bytes]], start: int = 0) -> Iterator[Profile]:
+    """
+    Decode an NDJSON stream of requirement dicts, skipping blank lines and
+    numbering profiles from start.
+    """
+    index = start
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield index, parse_profile(json.loads(line))
+        except ValueError as exc:
+            yield index, f"Invalid JSON: {exc}"
+        index += 1
+
+
+async def aiter_ndjson(chunks: AsyncIterable[bytes]) -> AsyncIterator[Profile]:
+    """
+    Decode an NDJSON byte stream of requirement dicts as it arrives.
+    """
+    index = 0
+    buffer = b""
+    async for chunk in chunks:
+        *lines, buffer = (buffer + chunk).split(b"\n")
+        for profile in iter_ndjson(lines, index):
+            index = profile[0] + 1
+            yield profile
+    for profile in iter_ndjson([buffer], index):
+        yield profile
+
+
+def load_profiles(text: str) -> List[Profile]:
+    """
+    Decode either a JSON array or an NDJSON document of requirement dicts.
+    Raises ValueError for a malformed JSON array.
+    """
+    if text.lstrip().startswith("["):
+        try:
+            values = json.loads(text)
+        except ValueError as exc:
+            raise ValueError(f"Invalid JSON array: {exc}")
+        return [(index, parse_profile(value)) for index, value in enumerate(values)]
+    return list(iter_ndjson(text.splitlines()))
+
+
+def score_profiles(
+    catalog: CompiledCatalog,
+    profiles: Sequence[Dict[str, Any]],
+    chunk_size: int,
+    max_workers: int,
+) -> Iterator[List[Tuple[int, List[Dict]]]]:
+    """
+    Score profiles in chunks, yielding ``(position, results)`` pairs for each
+    chunk as it completes. Chunks may complete out of order.
+    """
+    groups: Dict[str, List[int]] = {}
+    for position, requirements in enumerate(profiles):
+        groups.setdefault(requirements_key(requirements, 0), []).append(position)
+    distinct = list(groups.values())
+    chunks = [distinct[i:i + chunk_size] for i in range(0, len(distinct), chunk_size)]
+
+    def expand(chunk: List[List[int]], scored: List[List[Dict]]) -> List[Tuple[int, List[Dict]]]:
+        pairs = [(position, results) for positions, results in zip(chunk, scored) for position in positions]
+        return sorted(pairs, key=lambda pair: pair[0])
+
+    if len(chunks) <= 1 or max_workers <= 1:
+        for chunk in chunks:
+            yield expand(chunk, [score_catalog(catalog, profiles[positions[0]]) for positions in chunk])
+        return
+
+    pool = scoring_pool.get(max_workers)
+    token = scoring_pool.token(catalog)
+    futures = {}
+
+    def submit(chunk: List[List[int]], send_catalog: bool) -> None:
+        future = pool.submit(
+            _score_chunk,
+            token,
+            [profiles[positions[0]] for positions in chunk],
+            catalog if send_catalog else None,
+        )
+        futures[future] = chunk
+
+    # The first chunks carry the catalog, in case the workers lack it
+    for i, chunk in enumerate(chunks):
+        submit(chunk, i < scoring_pool.workers)
+    try:
+        while futures:
+            done, _ = wait(futures, return_when=FIRST_COMPLETED)
+            for future in done:
+                chunk = futures.pop(future)
+                scored = future.result()
+                if scored is None:
+                    submit(chunk, True)
+                else:
+                    yield expand(chunk, scored)
+    finally:
+        for future in futures:
+            future.cancel()
+
+
+def run_batch(
+    db: Session,
+    user_id: Optional[int],
+    profiles: Sequence[Profile],
+    chunk_size: Optional[int] = None,
+    max_workers: Optional[int] = None,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Score and persist a batch of profiles, yielding one result record per
+    profile. Each completed chunk is committed in its own transaction.
+    """
+    chunk_size = chunk_size or settings.BATCH_CHUNK_SIZE
+    max_workers = max_workers or settings.BATCH_MAX_WORKERS or os.cpu_count() or 1
+
+    valid = []
+    for index, requirements in profiles:
+        if isinstance(requirements, str):
+            yield {"index": index, "error": requirements}
+        else:
+            valid.append((index, requirements))
+    if not valid:
+        return
+
+    snapshot = catalog_cache.get(db)
+    requirements_list = [requirements for _, requirements in valid]
+    for chunk in score_profiles(snapshot.compiled, requirements_list, chunk_size, max_workers):
+        entries = [(requirements_list[position], results) for position, results in chunk]
+        recommendation_ids = bulk_create_recommendations(db, user_id, entries)
+        db.commit()
+        for (position, results), recommendation_id in zip(chunk, recommendation_ids):
+            yield {
+                "index": valid[position][0],
+                "recommendation_id": recommendation_id,
+                "items": results,
+            }
+
+
+async def run_batch_stream(
+    db: Session,
+    user_id: Optional[int],
+    profiles: AsyncIterable[Profile],
+    chunk_size: Optional[int] = None,
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    run_batch over profiles that arrive over time (e.g. a request body).
+    Profiles are scored and persisted on a worker thread a window at a time
+    (one chunk per scoring process), so only one window is held in memory.
+    """
+    chunk_size = chunk_size or settings.BATCH_CHUNK_SIZE
+    window_size = chunk_size * (settings.BATCH_MAX_WORKERS or os.cpu_count() or 1)
+    window: List[Profile] = []
+
+    async def flush() -> List[Dict[str, Any]]:
+        return await run_in_threadpool(lambda: list(run_batch(db, user_id, window, chunk_size)))
+
+    async for profile in profiles:
+        window.append(profile)
+        if len(window) >= window_size:
+            for record in await flush():
+                yield record
+            window = []
+    if window:
+        for record in await flush():
+            yield record
+
+
+class DuplexStreamingResponse(StreamingResponse):
+    """
+    A streaming response whose content still reads the request body. Both
+    would consume the same receive channel, so disconnects are only watched
+    for once body_read is set.
+    """
+
+    def __init__(self, content: Any, body_read: anyio.Event, **kwargs: Any):
+        super().__init__(content, **kwargs)
+        self.body_read = body_read
+
+    async def listen_for_disconnect(self, receive: Any) -> None:
+        await self.body_read.wait()
+        await super().listen_for_disconnect(receive)
@@ -0,0 +1,282 @@
+"""
+Versioned, immutable in-memory snapshot of the LLM model catalog.
+
+The catalog changes rarely, so reads are served from a snapshot that is
+rebuilt only when a write bumps the shared generation counter. On a single
+host the counter lives in a small file, so every worker process can detect a
+stale snapshot with a single ``pread`` instead of a database round trip.
+Deployments spanning several hosts keep it in Redis instead.
+"""
+import fcntl
+import logging
+import os
+import struct
+import threading
+import time
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Callable, Dict, List, Mapping, Optional, Tuple
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.http_cache import make_etag
+from app.core.scoring import CompiledCatalog, compile_catalog
+from app.core.singleflight import SingleFlight
+from app.models.models import LLMModel
+from app.schemas.schemas import LLMModelResponse, LLMModelSummary
+
+logger = logging.getLogger(__name__)
+
+_COUNTER = struct.Struct("<Q")
+
+
+class GenerationCounter:
+    """
+    Monotonic catalog generation shared by all processes through a file.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._fd: Optional[int] = None
+        self._pid: Optional[int] = None
+
+    def _fileno(self) -> int:
+        # Reopen after fork so processes don't share a lock description
+        if self._fd is None or self._pid != os.getpid():
+            self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+            self._pid = os.getpid()
+        return self._fd
+
+    def read(self) -> int:
+        data = os.pread(self._fileno(), _COUNTER.size, 0)
+        if len(data) < _COUNTER.size:
+            return 0
+        return _COUNTER.unpack(data)[0]
+
+    def bump(self) -> int:
+        fd = self._fileno()
+        fcntl.flock(fd, fcntl.LOCK_EX)
+        try:
+            generation = self.read() + 1
+            os.pwrite(fd, _COUNTER.pack(generation), 0)
+        finally:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+        return generation
+
+
+class RedisGenerationCounter:
+    """
+    Catalog generation shared by every host through a Redis key. Each read
+    costs one Redis round trip. Needs the optional ``redis`` package.
+    """
+
+    def __init__(self, url: str, key: str = "catalog:generation"):
+        try:
+            import redis
+        except ImportError as exc:
+            raise RuntimeError("The redis package is required for CATALOG_GENERATION_BACKEND=redis") from exc
+        self.key = key
+        self._client = redis.Redis.from_url(url)
+
+    def read(self) -> int:
+        value = self._client.get(self.key)
+        return int(value) if value is not None else 0
+
+    def bump(self) -> int:
+        return int(self._client.incr(self.key))
+
+
+def create_generation_counter(name: str, path: str = "", redis_url: Optional[str] = None):
+    if name == "file":
+        if not path:
+            raise RuntimeError(
+                "CATALOG_GENERATION_FILE must be set to a path shared by every worker "
+                "(or use CATALOG_GENERATION_BACKEND=redis)"
+            )
+        return GenerationCounter(path)
+    if name == "redis":
+        return RedisGenerationCounter(redis_url)
+    raise ValueError(f"Unknown catalog generation backend: {name}")
+
+
+@dataclass(frozen=True)
+class CatalogSnapshot:
+    """
+    Immutable view of the llm_models table at a given generation.
+    Rows are shared between requests and must be treated as read-only.
+
+    Each row is also kept as encoded JSON, in full and summary form, ready to
+    be joined into responses. ETags hash the full rows (which include
+    updated_at) rather than the host-local generation, so every worker and
+    host agrees on them.
+    """
+    generation: int
+    models: Tuple[LLMModelResponse, ...]
+    by_id: Mapping[int, LLMModelResponse]
+    compiled: CompiledCatalog
+    built_at: float
+    json_rows: Mapping[int, bytes]
+    summary_rows: Mapping[int, bytes]
+    etag: str
+    etags: Mapping[int, str]
+
+    @classmethod
+    def build(cls, rows: List[LLMModel], generation: int) -> "CatalogSnapshot":
+        models = tuple(LLMModelResponse.model_validate(row) for row in rows)
+        json_rows = {model.id: model.model_dump_json().encode() for model in models}
+        summary_rows = {
+            model.id: LLMModelSummary.model_validate(model, from_attributes=True).model_dump_json().encode()
+            for model in models
+        }
+        etags = {model_id: make_etag(row) for model_id, row in json_rows.items()}
+        return cls(
+            generation=generation,
+            models=models,
+            by_id=MappingProxyType({model.id: model for model in models}),
+            compiled=compile_catalog(models),
+            built_at=time.time(),
+            json_rows=MappingProxyType(json_rows),
+            summary_rows=MappingProxyType(summary_rows),
+            etag=make_etag(*etags.values()),
+            etags=MappingProxyType(etags),
+        )
+
+
+class CatalogCache:
+    """
+    Holds the current catalog snapshot and swaps it atomically on rebuild.
+    """
+
+    def __init__(self, counter):
+        self.counter = counter
+        self._snapshot: Optional[CatalogSnapshot] = None
+        # Serializes sync rebuilds (threadpool only: never held across an await)
+        self._lock = threading.Lock()
+        self._swap_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._flights = SingleFlight()
+        self._listeners: List[Callable[[CatalogSnapshot], None]] = []
+        self.hits = 0
+        self.misses = 0
+        self.rebuilds = 0
+        self.last_rebuild_seconds = 0.0
+        self.total_rebuild_seconds = 0.0
+
+    def get(self, db: Session) -> CatalogSnapshot:
+        """
+        Return the current snapshot, rebuilding it from db if it is stale.
+        """
+        snapshot = self._snapshot
+        if snapshot is not None and snapshot.generation == self.counter.read():
+            self._count(hit=True)
+            return snapshot
+        self._count(hit=False)
+        return self.rebuild(db)
+
+    async def get_async(self, db: AsyncSession) -> CatalogSnapshot:
+        """
+        Async variant of get for endpoints using an AsyncSession. The query is
+        awaited on the event loop and the snapshot is built on the threadpool;
+        concurrent rebuilds of a generation share one run.
+        """
+        snapshot = self._snapshot
+        generation = self.counter.read()
+        if snapshot is not None and snapshot.generation == generation:
+            self._count(hit=True)
+            return snapshot
+        self._count(hit=False)
+        return await self._flights.do_async(generation, lambda: self._rebuild_async(db, generation))
+
+    def _count(self, hit: bool) -> None:
+        # Reads run on many threadpool threads at once
+        with self._stats_lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    async def _rebuild_async(self, db: AsyncSession, generation: int) -> CatalogSnapshot:
+        started = time.perf_counter()
+        # A session of its own: the shared rebuild can outlive the request
+        async with AsyncSession(bind=db.bind) as own:
+            rows = (await own.scalars(select(LLMModel).order_by(LLMModel.id))).all()
+        return await run_in_threadpool(self._install, rows, generation, started)
+
+    def rebuild(self, db: Session) -> CatalogSnapshot:
+        """
+        Load the catalog from db into a new snapshot and swap it in.
+        """
+        with self._lock:
+            # Read the generation before querying so a concurrent write is
+            # either included in this snapshot or triggers another rebuild.
+            generation = self.counter.read()
+            snapshot = self._snapshot
+            if snapshot is not None and snapshot.generation == generation:
+                return snapshot
+
+            started = time.perf_counter()
+            rows = db.query(LLMModel).order_by(LLMModel.id).all()
+            return self._install(rows, generation, started)
+
+    def _install(self, rows: List[LLMModel], generation: int, started: float) -> CatalogSnapshot:
+        """
+        Build a snapshot from rows, swap it in unless a newer one already is,
+        and notify the listeners. Runs off the event loop.
+        """
+        snapshot = CatalogSnapshot.build(rows, generation)
+        elapsed = time.perf_counter() - started
+        with self._swap_lock:
+            current = self._snapshot
+            if current is not None and current.generation >= generation:
+                return current
+            self._snapshot = snapshot
+            self.rebuilds += 1
+            self.last_rebuild_seconds = elapsed
+            self.total_rebuild_seconds += elapsed
+
+        logger.info(
+            "Catalog snapshot generation %d built with %d models in %.1f ms",
+            generation, len(snapshot.models), elapsed * 1000,
+        )
+        for listener in list(self._listeners):
+            listener(snapshot)
+        return snapshot
+
+    def invalidate(self) -> int:
+        """
+        Mark every worker's snapshot as stale. Call after committing a write.
+        """
+        return self.counter.bump()
+
+    def subscribe(self, listener: Callable[[CatalogSnapshot], None]) -> None:
+        """
+        Register a callback invoked with each newly built snapshot.
+        """
+        self._listeners.append(listener)
+
+    def stats(self) -> Dict:
+        snapshot = self._snapshot
+        with self._stats_lock:
+            hits, misses = self.hits, self.misses
+        return {
+            "generation": snapshot.generation if snapshot else None,
+            "shared_generation": self.counter.read(),
+            "models": len(snapshot.models) if snapshot else 0,
+            "built_at": snapshot.built_at if snapshot else None,
+            "hits": hits,
+            "misses": misses,
+            "rebuilds": self.rebuilds,
+            "last_rebuild_ms": round(self.last_rebuild_seconds * 1000, 3),
+            "total_rebuild_ms": round(self.total_rebuild_seconds * 1000, 3),
+        }
+
+
+catalog_cache = CatalogCache(create_generation_counter(
+    settings.CATALOG_GENERATION_BACKEND,
+    settings.CATALOG_GENERATION_FILE,
+    settings.CATALOG_GENERATION_REDIS_URL,
+))
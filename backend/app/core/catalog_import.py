@@ -0,0 +1,207 @@
+"""
+Bulk catalog imports from NDJSON or CSV.
+
+Rows are decoded and validated one at a time as the input is read, and
+valid rows are upserted in batches with INSERT ... ON CONFLICT on the model
+identity (name, provider, version). A row that fails validation, or that the
+database rejects, is reported by line number without aborting its batch.
+Benchmark ranks, the catalog snapshot and everything derived from it are
+refreshed once, after the last batch.
+"""
+import csv
+import json
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple, Union
+
+from pydantic import ValidationError
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.orm import Session
+
+from app.core.catalog import catalog_cache
+from app.core.config import settings
+from app.core.export import unescape_csv_text
+from app.db.benchmarks import replace_benchmark_rows, rerank
+from app.db.bulk import upsert_models
+from app.schemas.schemas import LLMModelCreate
+
+IMPORT_FORMATS = ("ndjson", "csv")
+IMPORT_FORMAT_PATTERN = "^(" + "|".join(IMPORT_FORMATS) + ")$"
+
+# Columns of a catalog export that are assigned by the database
+IGNORED_COLUMNS = ("id", "created_at", "updated_at")
+# CSV columns holding JSON text
+JSON_COLUMNS = ("performance_benchmarks", "supported_languages")
+
+# Per-row errors listed in a result; the rest are only counted
+MAX_REPORTED_ERRORS = 1000
+
+# (line number, decoded row or error message)
+Row = Tuple[int, Union[Dict[str, Any], str]]
+
+
+def iter_ndjson_rows(lines: Iterable[Union[str, bytes]]) -> Iterator[Row]:
+    """
+    Decode an NDJSON stream of model objects, skipping blank lines.
+    """
+    for line_number, line in enumerate(lines, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            value = json.loads(line)
+        except ValueError as exc:
+            yield line_number, f"Invalid JSON: {exc}"
+            continue
+        if not isinstance(value, dict):
+            yield line_number, "Row must be a JSON object"
+        else:
+            yield line_number, value
+
+
+def iter_csv_rows(lines: Iterable[str]) -> Iterator[Row]:
+    """
+    Decode a CSV stream with a header row, as written by the catalog export.
+    Empty cells are missing values, JSON columns hold JSON text and text
+    escaped against formula injection is restored.
+    """
+    reader = csv.DictReader(lines)
+    try:
+        for record in reader:
+            if None in record:
+                yield reader.line_num, "Too many fields"
+                continue
+            row: Dict[str, Any] = {}
+            error = None
+            for column, value in record.items():
+                if column in IGNORED_COLUMNS or value is None or value == "":
+                    continue
+                if column in JSON_COLUMNS:
+                    try:
+                        value = json.loads(value)
+                    except ValueError as exc:
+                        error = f"Invalid JSON in {column}: {exc}"
+                        break
+                else:
+                    value = unescape_csv_text(value)
+                row[column] = value
+            yield reader.line_num, error or row
+    except csv.Error as exc:
+        yield reader.line_num, f"Invalid CSV: {exc}"
+
+
+def validate_row(value: Dict[str, Any]) -> Union[Dict[str, Any], str]:
+    """
+    The column values of one model, or an error message.
+    """
+    value = {key: item for key, item in value.items() if key not in IGNORED_COLUMNS}
+    try:
+        return LLMModelCreate.model_validate(value).model_dump()
+    except ValidationError as exc:
+        return "; ".join(
+            f"{'.'.join(str(part) for part in error['loc']) or 'row'}: {error['msg']}"
+            for error in exc.errors()
+        )
+
+
+def _identity(row: Dict[str, Any]) -> Tuple[str, str, str]:
+    return row["name"], row["provider"], row["version"] or ""
+
+
+def _upsert(db: Session, rows: List[Dict[str, Any]]) -> Set[str]:
+    with db.begin_nested():
+        return replace_benchmark_rows(db, upsert_models(db, rows))
+
+
+class CatalogImport:
+    """
+    Accumulates one import: upserts batches of validated rows, then
+    refreshes the derived catalog state in finish().
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+        self.processed = 0
+        self.upserted = 0
+        self.error_count = 0
+        self.errors: List[Dict[str, Any]] = []
+        self.benchmarks: Set[str] = set()
+
+    def error(self, line: int, message: str) -> None:
+        self.error_count += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({"line": line, "error": message})
+
+    def write_batch(self, batch: List[Tuple[int, Dict[str, Any]]]) -> None:
+        """
+        Upsert one batch and commit it. If the database rejects the batch, its
+        rows are retried one by one so only the offending rows fail.
+        """
+        # Within a batch the last row for an identity wins: ON CONFLICT cannot
+        # touch the same row twice in one statement
+        latest: Dict[Tuple[str, str, str], Tuple[int, Dict[str, Any]]] = {}
+        for line, row in batch:
+            latest.pop(_identity(row), None)
+            latest[_identity(row)] = (line, row)
+        entries = list(latest.values())
+
+        try:
+            self.benchmarks |= _upsert(self.db, [row for _, row in entries])
+            self.upserted += len(entries)
+        except DBAPIError:
+            for line, row in entries:
+                try:
+                    self.benchmarks |= _upsert(self.db, [row])
+                    self.upserted += 1
+                except DBAPIError as exc:
+                    self.error(line, f"Rejected by the database: {exc.orig}")
+        self.db.commit()
+
+    def finish(self) -> Dict[str, Any]:
+        """
+        Re-rank the affected benchmarks and reload the catalog, once.
+        """
+        if self.upserted:
+            rerank(self.db, self.benchmarks)
+            self.db.commit()
+            catalog_cache.invalidate()
+        return {
+            "processed": self.processed,
+            "upserted": self.upserted,
+            "error_count": self.error_count,
+            "errors": self.errors,
+        }
+
+
+def run_import(db: Session, rows: Iterable[Row], batch_size: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Validate and upsert decoded rows in batches. Returns the number of rows
+    processed and upserted and the per-row errors.
+    """
+    batch_size = batch_size or settings.IMPORT_BATCH_SIZE
+    job = CatalogImport(db)
+    batch: List[Tuple[int, Dict[str, Any]]] = []
+    for line, value in rows:
+        job.processed += 1
+        row = value if isinstance(value, str) else validate_row(value)
+        if isinstance(row, str):
+            job.error(line, row)
+            continue
+        batch.append((line, row))
+        if len(batch) >= batch_size:
+            job.write_batch(batch)
+            batch = []
+    if batch:
+        job.write_batch(batch)
+    return job.finish()
+
+
+def import_stream(
+    db: Session,
+    lines: Iterable[str],
+    import_format: str,
+    batch_size: Optional[int] = None,
+) -> Dict[str, Any]:
+    """
+    Import an NDJSON or CSV text stream into the catalog.
+    """
+    rows = iter_csv_rows(lines) if import_format == "csv" else iter_ndjson_rows(lines)
+    return run_import(db, rows, batch_size)
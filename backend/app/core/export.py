@@ -0,0 +1,116 @@
+"""
+Streaming NDJSON and CSV exports of query results.
+
+Rows are read through a server-side cursor (``yield_per``) and encoded one
+partition at a time, so memory stays flat however many rows are exported.
+Each export in progress holds one pooled database connection until it ends
+or the client disconnects, so concurrent exports count against the pool.
+"""
+import csv
+import io
+from datetime import datetime
+from typing import Any, Iterator, List, Sequence
+
+import orjson
+from fastapi.responses import StreamingResponse
+from starlette.background import BackgroundTask
+from sqlalchemy import Select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.session import SessionLocal
+
+# Export format -> media type
+EXPORT_FORMATS = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+EXPORT_FORMAT_PATTERN = "^(" + "|".join(EXPORT_FORMATS) + ")$"
+
+
+# Spreadsheets evaluate text cells starting with these as formulas
+FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+
+def escape_csv_text(value: str) -> str:
+    """
+    Prefix text that a spreadsheet would run as a formula with a quote. Text
+    already starting with quotes before such a character gets one more, so
+    unescape_csv_text restores every value exactly.
+    """
+    if value.lstrip("'").startswith(FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+
+def unescape_csv_text(value: str) -> str:
+    if value.startswith("'") and value.lstrip("'").startswith(FORMULA_PREFIXES):
+        return value[1:]
+    return value
+
+
+def _csv_value(value: Any) -> Any:
+    if value is None:
+        return ""
+    if isinstance(value, (dict, list)):
+        return orjson.dumps(value).decode()
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, str):
+        return escape_csv_text(value)
+    return value
+
+
+def encode_ndjson(columns: Sequence[str], rows: Sequence[Sequence[Any]]) -> bytes:
+    return b"".join(orjson.dumps(dict(zip(columns, row))) + b"\n" for row in rows)
+
+
+def encode_csv(rows: Sequence[Sequence[Any]]) -> bytes:
+    """
+    CSV lines for rows; JSON columns are embedded as JSON text and formula-like
+    text is escaped.
+    """
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows([_csv_value(value) for value in row] for row in rows)
+    return buffer.getvalue().encode()
+
+
+def stream_export(
+    db: Session,
+    query: Select,
+    export_format: str,
+    batch_size: int = settings.EXPORT_BATCH_SIZE,
+) -> Iterator[bytes]:
+    """
+    Encoded chunks of query's rows, one per batch, CSV starting with a header.
+    """
+    result = db.execute(query.execution_options(yield_per=batch_size))
+    columns: List[str] = list(result.keys())
+    if export_format == "csv":
+        yield encode_csv([columns])
+    for rows in result.partitions():
+        yield encode_ndjson(columns, rows) if export_format == "ndjson" else encode_csv(rows)
+
+
+def _stream_with_session(query: Select, export_format: str) -> Iterator[bytes]:
+    # Use a dedicated session whose lifetime matches the stream
+    db = SessionLocal()
+    try:
+        yield from stream_export(db, query, export_format)
+    finally:
+        db.close()
+
+
+def export_response(query: Select, export_format: str, name: str) -> StreamingResponse:
+    """
+    Stream query's rows as a name.ndjson or name.csv download.
+    """
+    chunks = _stream_with_session(query, export_format)
+    # Runs after the stream ends or the client disconnects, returning the
+    # connection to the pool right away instead of when chunks is collected
+    return StreamingResponse(
+        chunks,
+        media_type=EXPORT_FORMATS[export_format],
+        headers={"Content-Disposition": f'attachment; filename="{name}.{export_format}"'},
+        background=BackgroundTask(chunks.close),
+    )
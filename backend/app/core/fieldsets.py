@@ -0,0 +1,52 @@
+"""
+Sparse fieldsets for LLM model representations.
+
+``fields`` is a comma separated list of LLMModelResponse field names. The
+alias ``summary`` stands for the LLMModelSummary fields, and ``id`` is
+always included.
+"""
+from typing import FrozenSet, Optional
+
+from fastapi import HTTPException, status
+
+from app.schemas.schemas import LLMModelResponse, LLMModelSummary
+
+MODEL_FIELDS = frozenset(LLMModelResponse.model_fields)
+SUMMARY_FIELDS = frozenset(LLMModelSummary.model_fields)
+SUMMARY = "summary"
+
+
+def parse_fields(fields: Optional[str]) -> Optional[FrozenSet[str]]:
+    """
+    Return the requested field names, or None for the full representation.
+    """
+    if fields is None:
+        return None
+    requested = set()
+    for name in fields.split(","):
+        name = name.strip()
+        if name == SUMMARY:
+            requested |= SUMMARY_FIELDS
+        elif name:
+            requested.add(name)
+    unknown = requested - MODEL_FIELDS
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown fields: {', '.join(sorted(unknown))}",
+        )
+    return frozenset(requested | {"id"})
+
+
+def wants_summary(fields: Optional[str]) -> bool:
+    """
+    For responses nesting models, which support only the summary projection.
+    """
+    if fields is None:
+        return False
+    if fields.strip() != SUMMARY:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Only fields=summary is supported for nested models",
+        )
+    return True
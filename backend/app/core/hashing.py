@@ -0,0 +1,116 @@
+"""
+Bounded executor for bcrypt password hashing.
+
+bcrypt is deliberately slow. Running it on the request threadpool lets a login
+storm starve every other sync endpoint, so hashing goes to a small dedicated
+process pool. At most HASH_QUEUE_SIZE operations may be pending at once;
+beyond that new requests are rejected at once instead of queueing without
+bound.
+"""
+import asyncio
+import multiprocessing
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from app.core import security
+from app.core.config import settings
+
+
+class PasswordHasherBusy(Exception):
+    """
+    Raised when the hashing queue is full.
+    """
+
+
+class PasswordHasher:
+    """
+    Runs password hashing and verification on a dedicated executor.
+    """
+
+    def __init__(self, max_workers: int, max_pending: int):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self._executor: Optional[Executor] = None
+        self._lock = threading.Lock()
+        self.pending = 0
+        self.completed = 0
+        self.rejected = 0
+        self.rehashed = 0
+
+    def _get_executor(self) -> Executor:
+        with self._lock:
+            if self._executor is None:
+                if self.max_workers > 0:
+                    # spawn: forking a threaded server process is unsafe
+                    self._executor = ProcessPoolExecutor(
+                        max_workers=self.max_workers,
+                        mp_context=multiprocessing.get_context("spawn"),
+                    )
+                else:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=1, thread_name_prefix="password-hasher"
+                    )
+            return self._executor
+
+    async def _run(self, fn: Callable, *args: Any) -> Any:
+        with self._lock:
+            if self.pending >= self.max_pending:
+                self.rejected += 1
+                raise PasswordHasherBusy("Password hashing queue is full")
+            self.pending += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._get_executor(), fn, *args)
+        finally:
+            with self._lock:
+                self.pending -= 1
+                self.completed += 1
+
+    async def hash(self, password: str) -> str:
+        return await self._run(security.get_password_hash, password)
+
+    async def verify(self, password: str, hashed_password: str) -> bool:
+        return await self._run(security.verify_password, password, hashed_password)
+
+    async def verify_and_update(
+        self, password: str, hashed_password: str
+    ) -> Tuple[bool, Optional[str]]:
+        """
+        Verify a password, returning a new hash if the stored one was made
+        with a different bcrypt cost.
+        """
+        verified, new_hash = await self._run(
+            security.verify_and_update_password, password, hashed_password
+        )
+        if new_hash is not None:
+            self.rehashed += 1
+        return verified, new_hash
+
+    def start(self) -> None:
+        """
+        Create the executor ahead of the first login.
+        """
+        self._get_executor()
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def stats(self) -> Dict:
+        return {
+            "workers": self.max_workers,
+            "executor": "process" if self.max_workers > 0 else "thread",
+            "bcrypt_rounds": settings.BCRYPT_ROUNDS,
+            "queue_depth": self.pending,
+            "waiting": max(self.pending - max(self.max_workers, 1), 0),
+            "max_pending": self.max_pending,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "rehashed": self.rehashed,
+        }
+
+
+password_hasher = PasswordHasher(settings.HASH_WORKERS, settings.HASH_QUEUE_SIZE)
@@ -0,0 +1,44 @@
+"""
+HTTP validators and caching headers for rarely-changing GET responses.
+"""
+import hashlib
+from typing import Any
+
+from fastapi import Request, Response, status
+
+
+def make_etag(*parts: Any) -> str:
+    """
+    Strong ETag over the given parts.
+    """
+    digest = hashlib.sha256(repr(parts).encode()).hexdigest()[:32]
+    return f'"{digest}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """
+    Whether the request's If-None-Match header matches etag. If-None-Match
+    uses weak comparison, so a W/ prefix added by a proxy still matches.
+    """
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    for candidate in header.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == etag:
+            return True
+    return False
+
+
+def set_cache_headers(response: Response, etag: str, cache_control: str) -> None:
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = cache_control
+
+
+def not_modified(etag: str, cache_control: str) -> Response:
+    """
+    Empty 304 response carrying the same validators as a 200 would.
+    """
+    response = Response(status_code=status.HTTP_304_NOT_MODIFIED)
+    set_cache_headers(response, etag, cache_control)
+    return response
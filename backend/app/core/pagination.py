@@ -0,0 +1,57 @@
+"""
+Opaque cursors for keyset pagination.
+
+A cursor encodes the sort key of the last row of a page. The next page is
+fetched with a ``WHERE key > cursor`` predicate instead of an OFFSET, so its
+cost does not grow with depth and concurrent inserts cannot shift rows.
+"""
+import base64
+import json
+from datetime import datetime
+from typing import Any, List, Sequence
+
+from fastapi import HTTPException, status
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """
+    Encode a sort key (ints, strings and datetimes) as an opaque cursor.
+    """
+    payload = [
+        {"dt": value.isoformat()} if isinstance(value, datetime) else value
+        for value in values
+    ]
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, types: Sequence[type]) -> List[Any]:
+    """
+    Decode a cursor produced by encode_cursor into a sort key with one value
+    of each type (int, float, str or datetime). Raises a 400 error for
+    malformed cursors.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        payload = json.loads(raw)
+        if not isinstance(payload, list) or len(payload) != len(types):
+            raise ValueError("wrong cursor size")
+        return [_decode_value(value, value_type) for value, value_type in zip(payload, types)]
+    except (ValueError, TypeError, KeyError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor",
+        )
+
+
+def _decode_value(value: Any, value_type: type) -> Any:
+    if value_type is datetime:
+        return datetime.fromisoformat(value["dt"])
+    # bool is an int subclass, but never a sort key
+    if isinstance(value, bool):
+        raise TypeError("unexpected boolean in cursor")
+    if value_type is float and isinstance(value, (int, float)):
+        return float(value)
+    if not isinstance(value, value_type):
+        raise TypeError(f"expected {value_type.__name__} in cursor")
+    return value
@@ -0,0 +1,273 @@
+"""
+Pareto frontier (skyline) of the catalog for multi-objective model selection.
+
+Objectives are benchmark scores from performance_benchmarks (higher is
+better), parameters and a cost tier parsed from pricing_info (lower is
+better). Objective values are compiled once per catalog snapshot into NumPy
+columns, and each column's ranks once per objective. The skyline presorts
+candidates by rank sum and filters them in blocks, so dominance tests are
+vectorized over the whole remaining catalog.
+"""
+import re
+import threading
+from dataclasses import dataclass, field
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+from fastapi import HTTPException, status
+
+from app.core.catalog import CatalogSnapshot, catalog_cache
+
+PARAMETERS = "parameters"
+COST = "cost"
+
+# Cost tiers parsed from pricing_info, checked in order
+COST_TIERS = (
+    (0, re.compile(r"\bfree\b")),
+    (1, re.compile(r"\b(low|lower|cheap|cheaper)\b")),
+    (3, re.compile(r"\b(high|higher|premium|enterprise)\b")),
+    (2, re.compile(r"\b(medium|moderate|pay[- ]per[- ]token|tiers?)\b")),
+)
+MAX_COST_TIER = 3
+
+# Largest block of candidate rows compared against all remaining rows
+BLOCK_SIZE = 128
+
+
+def cost_tier(pricing_info: Optional[str]) -> Optional[int]:
+    """
+    0 (free) to 3 (high or enterprise pricing), or None if unknown.
+    """
+    pricing = (pricing_info or "").lower()
+    for tier, pattern in COST_TIERS:
+        if pattern.search(pricing):
+            return tier
+    return None
+
+
+def dense_ranks(values: np.ndarray) -> np.ndarray:
+    """
+    0-based dense ranks of values, ascending; equal values share a rank.
+    """
+    return np.unique(values, return_inverse=True)[1].astype(np.int32)
+
+
+@dataclass(frozen=True)
+class ObjectiveColumns:
+    """
+    Objective values of one snapshot in catalog order; NaN where unknown.
+    """
+    snapshot: CatalogSnapshot
+    parameters: np.ndarray
+    cost: np.ndarray
+    benchmarks: Dict[str, np.ndarray]
+    _ranks: Dict[str, np.ndarray] = field(default_factory=dict, repr=False)
+
+    def column(self, name: str) -> Optional[np.ndarray]:
+        if name == PARAMETERS:
+            return self.parameters
+        if name == COST:
+            return self.cost
+        return self.benchmarks.get(name)
+
+    def ranks(self, name: str) -> np.ndarray:
+        """
+        Dense ascending ranks of a column over the whole catalog (arbitrary
+        where the value is unknown), computed once per snapshot. Ranks of any
+        subset of rows order and tie exactly like their values.
+        """
+        ranks = self._ranks.get(name)
+        if ranks is None:
+            values = self.column(name)
+            known = ~np.isnan(values)
+            ranks = np.zeros(len(values), dtype=np.int32)
+            ranks[known] = dense_ranks(values[known])
+            self._ranks[name] = ranks
+        return ranks
+
+    @staticmethod
+    def default_direction(name: str) -> str:
+        return "min" if name in (PARAMETERS, COST) else "max"
+
+
+def compile_objectives(snapshot: CatalogSnapshot) -> ObjectiveColumns:
+    models = snapshot.models
+    n = len(models)
+    parameters = np.full(n, np.nan)
+    cost = np.full(n, np.nan)
+    benchmarks: Dict[str, np.ndarray] = {}
+    for i, model in enumerate(models):
+        if model.parameters is not None:
+            parameters[i] = model.parameters
+        tier = cost_tier(model.pricing_info)
+        if tier is not None:
+            cost[i] = tier
+        for name, score in (model.performance_benchmarks or {}).items():
+            if isinstance(score, (int, float)) and not isinstance(score, bool):
+                if name not in benchmarks:
+                    benchmarks[name] = np.full(n, np.nan)
+                benchmarks[name][i] = score
+    return ObjectiveColumns(snapshot=snapshot, parameters=parameters, cost=cost, benchmarks=benchmarks)
+
+
+def _dominated(winners: np.ndarray, winner_sums: np.ndarray, others: np.ndarray, other_sums: np.ndarray) -> np.ndarray:
+    """
+    For each column of others (d, m), whether some column of winners (d, k)
+    dominates it. With integer ranks, "no worse everywhere and better
+    somewhere" is "no worse everywhere and a smaller rank sum".
+    """
+    dominated = winner_sums[:, None] < other_sums[None, :]
+    no_worse = np.empty_like(dominated)
+    for j in range(winners.shape[0]):
+        np.less_equal(winners[j][:, None], others[j][None, :], out=no_worse)
+        dominated &= no_worse
+    return dominated.any(axis=0)
+
+
+def skyline(ranks: np.ndarray, block_size: int = BLOCK_SIZE) -> np.ndarray:
+    """
+    Indices of the non-dominated rows of ranks (n, d), non-negative integers
+    where lower is better in every column. Duplicate rows do not dominate
+    each other.
+    """
+    n = len(ranks)
+    if n == 0:
+        return np.empty(0, dtype=np.intp)
+
+    # Dimension-major, so that each comparison reads contiguous memory
+    columns = np.ascontiguousarray(ranks.T, dtype=np.int32)
+    sums = columns.sum(axis=0, dtype=np.int64)
+    # A row always sorts after every row that dominates it (smaller sum)
+    remaining = np.argsort(sums, kind="stable")
+
+    front = []
+    size = 1
+    while remaining.size:
+        # Rows of the head can only be dominated by earlier rows of the head:
+        # anything dominated by a removed row was removed with it
+        head = remaining[:size]
+        head_columns = np.take(columns, head, axis=1)
+        winners = head[~_dominated(head_columns, sums[head], head_columns, sums[head])]
+        front.append(winners)
+        rest = remaining[size:]
+        if rest.size:
+            rest = rest[~_dominated(
+                np.take(columns, winners, axis=1), sums[winners],
+                np.take(columns, rest, axis=1), sums[rest],
+            )]
+        remaining = rest
+        # The first rows prune the most; grow the block as pruning slows
+        size = min(size * 2, block_size)
+    return np.concatenate(front)
+
+
+def resolve_objectives(
+    columns: ObjectiveColumns,
+    objectives: Sequence[Tuple[str, Optional[str]]],
+) -> List[Tuple[str, str]]:
+    """
+    Fill in default directions. Raises a 400 error for unknown or repeated
+    objectives.
+    """
+    resolved = []
+    for name, direction in objectives:
+        if columns.column(name) is None:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Unknown objective: {name}",
+            )
+        if any(name == seen for seen, _ in resolved):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Duplicate objective: {name}",
+            )
+        resolved.append((name, direction or columns.default_direction(name)))
+    return resolved
+
+
+def candidate_mask(
+    columns: ObjectiveColumns,
+    license_types: Optional[Sequence[Optional[str]]] = None,
+    min_parameters: Optional[float] = None,
+    max_parameters: Optional[float] = None,
+    max_cost_tier: Optional[int] = None,
+    min_scores: Optional[Mapping[str, float]] = None,
+) -> np.ndarray:
+    """
+    Boolean mask of the models meeting the hard constraints. Models with an
+    unknown value for a constrained attribute do not meet it.
+    """
+    mask = np.ones(len(columns.parameters), dtype=bool)
+    if license_types is not None:
+        compiled = columns.snapshot.compiled
+        mask &= np.isin(compiled.license_code, [compiled.license_code_for(value) for value in license_types])
+    with np.errstate(invalid="ignore"):
+        if min_parameters is not None:
+            mask &= columns.parameters >= min_parameters
+        if max_parameters is not None:
+            mask &= columns.parameters <= max_parameters
+        if max_cost_tier is not None:
+            mask &= columns.cost <= max_cost_tier
+        for name, minimum in (min_scores or {}).items():
+            scores = columns.benchmarks.get(name)
+            if scores is None:
+                return np.zeros_like(mask)
+            mask &= scores >= minimum
+    return mask
+
+
+def pareto_front(
+    columns: ObjectiveColumns,
+    objectives: Sequence[Tuple[str, str]],
+    candidates: np.ndarray,
+) -> Tuple[int, np.ndarray, np.ndarray]:
+    """
+    Frontier of the candidate rows (a boolean mask) for (name, "min"/"max")
+    objectives. Rows missing any objective value are not candidates.
+    Returns the number of candidates, the catalog positions of the frontier
+    (best first on the first objective) and their objective values.
+    """
+    values = np.column_stack([columns.column(name) for name, _ in objectives])
+    positions = np.flatnonzero(candidates & ~np.isnan(values).any(axis=1))
+
+    ranks = np.empty((len(positions), len(objectives)), dtype=np.int32)
+    for j, (name, direction) in enumerate(objectives):
+        column_ranks = columns.ranks(name)[positions]
+        ranks[:, j] = column_ranks if direction == "min" else column_ranks.max(initial=0) - column_ranks
+    front = positions[skyline(ranks)]
+
+    first = values[front, 0] if objectives[0][1] == "min" else -values[front, 0]
+    front = front[np.lexsort((front, first))]
+    return len(positions), front, values[front]
+
+
+class ObjectiveCache:
+    """
+    Compiles the objective columns lazily, once per catalog generation.
+    """
+
+    def __init__(self):
+        self._columns: Optional[ObjectiveColumns] = None
+        self._lock = threading.Lock()
+        self.builds = 0
+
+    def get(self, snapshot: CatalogSnapshot) -> ObjectiveColumns:
+        columns = self._columns
+        if columns is not None and columns.snapshot is snapshot:
+            return columns
+        with self._lock:
+            columns = self._columns
+            if columns is None or columns.snapshot is not snapshot:
+                columns = compile_objectives(snapshot)
+                self._columns = columns
+                self.builds += 1
+        return columns
+
+    def clear(self) -> None:
+        self._columns = None
+
+
+objective_cache = ObjectiveCache()
+
+# Release the old columns as soon as a new catalog generation is loaded
+catalog_cache.subscribe(lambda snapshot: objective_cache.clear())
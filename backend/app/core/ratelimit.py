@@ -0,0 +1,207 @@
+"""
+Token-bucket rate limiting.
+
+Each key owns a bucket of ``capacity`` tokens refilled continuously at
+``refill_per_second``. A request spends one token and is rejected when the
+bucket is empty. Buckets live in process memory by default; the Redis backend
+shares them between workers and hosts.
+"""
+import math
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Optional, Tuple
+
+from app.core.config import settings
+
+# (allowed, seconds until a token is available)
+Decision = Tuple[bool, float]
+
+
+class MemoryBackend:
+    """
+    Buckets in a bounded in-process LRU. Only limits the current worker.
+    """
+
+    def __init__(self, maxsize: int = 100000, clock: Callable[[], float] = time.monotonic):
+        self.maxsize = maxsize
+        self._clock = clock
+        self._buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    async def consume(self, key: str, capacity: int, refill_per_second: float) -> Decision:
+        now = self._clock()
+        with self._lock:
+            tokens, updated = self._buckets.get(key, (capacity, now))
+            tokens = min(capacity, tokens + (now - updated) * refill_per_second)
+            allowed = tokens >= 1
+            if allowed:
+                tokens -= 1
+            self._buckets[key] = (tokens, now)
+            self._buckets.move_to_end(key)
+            while len(self._buckets) > self.maxsize:
+                self._buckets.popitem(last=False)
+        retry_after = 0.0 if allowed else (1 - tokens) / refill_per_second
+        return allowed, retry_after
+
+    async def refund(self, key: str, capacity: int) -> None:
+        with self._lock:
+            if key in self._buckets:
+                tokens, updated = self._buckets[key]
+                self._buckets[key] = (min(capacity, tokens + 1), updated)
+
+    async def reset(self, key: str) -> None:
+        with self._lock:
+            self._buckets.pop(key, None)
+
+
+# Atomic refill-and-spend, using the Redis server clock so workers agree on time
+_REDIS_CONSUME = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'updated')
+local tokens = tonumber(state[1]) or capacity
+local updated = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - updated) * rate)
+local allowed = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+    allowed = 1
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'updated', tostring(now))
+redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) + 1)
+return {allowed, tostring(tokens)}
+"""
+
+# Give back one token, never above capacity
+_REDIS_REFUND = """
+local tokens = tonumber(redis.call('HGET', KEYS[1], 'tokens'))
+if tokens then
+    redis.call('HSET', KEYS[1], 'tokens', tostring(math.min(tonumber(ARGV[1]), tokens + 1)))
+end
+"""
+
+
+class RedisBackend:
+    """
+    Buckets stored in Redis hashes, shared by every worker. Needs the
+    optional ``redis`` package.
+    """
+
+    def __init__(self, url: str, prefix: str = "ratelimit:"):
+        try:
+            from redis import asyncio as aioredis
+        except ImportError as exc:
+            raise RuntimeError("The redis package is required for RATE_LIMIT_BACKEND=redis") from exc
+        self.prefix = prefix
+        self._client = aioredis.from_url(url)
+        self._consume = self._client.register_script(_REDIS_CONSUME)
+        self._refund = self._client.register_script(_REDIS_REFUND)
+
+    async def consume(self, key: str, capacity: int, refill_per_second: float) -> Decision:
+        allowed, tokens = await self._consume(
+            keys=[self.prefix + key], args=[capacity, refill_per_second]
+        )
+        if allowed:
+            return True, 0.0
+        return False, (1 - float(tokens)) / refill_per_second
+
+    async def refund(self, key: str, capacity: int) -> None:
+        await self._refund(keys=[self.prefix + key], args=[capacity])
+
+    async def reset(self, key: str) -> None:
+        await self._client.delete(self.prefix + key)
+
+
+class RateLimiter:
+    """
+    A named token-bucket policy on top of a backend.
+    """
+
+    def __init__(self, backend, name: str, capacity: int, refill_per_minute: float):
+        self.backend = backend
+        self.name = name
+        self.capacity = capacity
+        self.refill_per_second = refill_per_minute / 60
+        self.allowed = 0
+        self.rejected = 0
+
+    async def hit(self, key: str) -> Decision:
+        """
+        Spend a token for key, returning whether the request may proceed.
+        """
+        allowed, retry_after = await self.backend.consume(
+            f"{self.name}:{key}", self.capacity, self.refill_per_second
+        )
+        if allowed:
+            self.allowed += 1
+        else:
+            self.rejected += 1
+        return allowed, retry_after
+
+    async def refund(self, key: str) -> None:
+        """
+        Give back the token spent by a request that turned out not to count.
+        """
+        await self.backend.refund(f"{self.name}:{key}", self.capacity)
+
+    async def reset(self, key: str) -> None:
+        await self.backend.reset(f"{self.name}:{key}")
+
+    def stats(self) -> Dict:
+        return {
+            "capacity": self.capacity,
+            "refill_per_minute": self.refill_per_second * 60,
+            "allowed": self.allowed,
+            "rejected": self.rejected,
+        }
+
+
+def retry_after_header(retry_after: float) -> Dict[str, str]:
+    return {"Retry-After": str(max(1, math.ceil(retry_after)))}
+
+
+def client_address(request) -> str:
+    """
+    The client IP of a request. Behind TRUSTED_PROXY_HOPS proxies that append
+    to FORWARDED_FOR_HEADER, the address seen by the outermost proxy; entries
+    left of it are client-supplied and ignored.
+    """
+    if settings.FORWARDED_FOR_HEADER and settings.TRUSTED_PROXY_HOPS > 0:
+        hops = [
+            hop.strip()
+            for value in request.headers.getlist(settings.FORWARDED_FOR_HEADER)
+            for hop in value.split(",")
+            if hop.strip()
+        ]
+        if len(hops) >= settings.TRUSTED_PROXY_HOPS:
+            return hops[-settings.TRUSTED_PROXY_HOPS]
+    return request.client.host if request.client else "unknown"
+
+
+def create_backend(name: str, redis_url: Optional[str] = None):
+    if name == "memory":
+        return MemoryBackend()
+    if name == "redis":
+        return RedisBackend(redis_url)
+    raise ValueError(f"Unknown rate limit backend: {name}")
+
+
+rate_limit_backend = create_backend(settings.RATE_LIMIT_BACKEND, settings.RATE_LIMIT_REDIS_URL)
+
+# Failed login attempts per account identifier, across all clients, and per
+# client IP. The account bucket stops spraying one account from many IPs.
+login_account_limiter = RateLimiter(
+    rate_limit_backend,
+    "login-account",
+    settings.LOGIN_ACCOUNT_BURST,
+    settings.LOGIN_ACCOUNT_PER_MINUTE,
+)
+login_ip_limiter = RateLimiter(
+    rate_limit_backend,
+    "login-ip",
+    settings.LOGIN_IP_BURST,
+    settings.LOGIN_IP_PER_MINUTE,
+)
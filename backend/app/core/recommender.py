@@ -0,0 +1,206 @@
+"""
+Recommendation computation on top of the catalog snapshot.
+
+Results are memoized by a canonical hash of the requirements, the scoring
+profile and the catalog generation, so repeated questionnaire answers skip
+scoring; identical requests arriving together share one scoring run. Named
+scoring profiles are compiled once per worker and cached.
+"""
+import hashlib
+import json
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+from fastapi import HTTPException, status
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.cache import LRUCache
+from app.core.catalog import CatalogSnapshot, catalog_cache
+from app.core.config import settings
+from app.core.scoring import DEFAULT_PROFILE, CompiledProfile, compile_profile, score_catalog
+from app.core.singleflight import SingleFlight
+from app.db.strict import strict_candidates
+from app.models.models import ScoringProfile
+
+# Requirement keys that influence scoring
+SCORED_KEYS = (
+    "task_type",
+    "size_preference",
+    "license_preference",
+    "budget_constraint",
+    "language_support",
+    "deployment",
+)
+
+recommendation_cache = LRUCache(
+    maxsize=settings.RECOMMENDATION_CACHE_SIZE,
+    ttl=settings.RECOMMENDATION_CACHE_TTL_SECONDS,
+)
+
+# Drop memoized results as soon as a new catalog generation is loaded
+catalog_cache.subscribe(lambda snapshot: recommendation_cache.clear())
+
+# In-flight scoring runs by requirements_key, shared by identical requests
+recommendation_flights = SingleFlight()
+
+# Compiled scoring profiles by name; the TTL bounds cross-worker staleness
+scoring_profile_cache = LRUCache(
+    maxsize=settings.SCORING_PROFILE_CACHE_SIZE,
+    ttl=settings.SCORING_PROFILE_CACHE_TTL_SECONDS,
+)
+
+
+def canonical_requirements(requirements: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Reduce requirements to the parts that affect scoring, in a normal form.
+    """
+    canonical = {key: requirements[key] for key in SCORED_KEYS if key in requirements}
+    if canonical.get("language_support") == "specific" and "specific_languages" in requirements:
+        languages = requirements["specific_languages"]
+        # Language matching is case-insensitive and ignores order and duplicates
+        if isinstance(languages, (list, tuple, str)) and all(isinstance(l, str) for l in languages):
+            languages = sorted({lang.lower() for lang in languages})
+        canonical["specific_languages"] = languages
+    return canonical
+
+
+def requirements_key(
+    requirements: Dict[str, Any],
+    generation: int,
+    profile: CompiledProfile = DEFAULT_PROFILE,
+    strict: bool = False,
+) -> str:
+    """
+    Hash the canonical requirements together with a catalog generation, the
+    scoring profile and the matching mode.
+    """
+    payload = json.dumps(
+        [generation, canonical_requirements(requirements), profile.key(), strict],
+        sort_keys=True,
+        separators=(",", ":"),
+        default=repr,
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def _score(
+    snapshot: CatalogSnapshot,
+    requirements: Dict[str, Any],
+    profile: CompiledProfile,
+    rows: Optional[np.ndarray],
+    key: str,
+) -> Tuple[Dict, ...]:
+    results = tuple(score_catalog(
+        snapshot.compiled, requirements, profile.top_k, profile.min_score, profile.weights, rows
+    ))
+    recommendation_cache.set(key, results)
+    return results
+
+
+def match_models(
+    requirements: Dict[str, Any],
+    db: Optional[Session] = None,
+    snapshot: Optional[CatalogSnapshot] = None,
+    profile: CompiledProfile = DEFAULT_PROFILE,
+    strict: bool = False,
+) -> List[Dict]:
+    """
+    Return the top matching models for requirements, from cache when possible.
+    Pass snapshot to score against a snapshot the caller already holds;
+    otherwise the current snapshot is loaded through db. Identical concurrent
+    calls share one scoring run.
+    
+    In strict mode, models failing a hard constraint (license, size, specific
+    languages) are filtered out in SQL through db and never scored.
+    """
+    snapshot = snapshot or catalog_cache.get(db)
+    key = requirements_key(requirements, snapshot.generation, profile, strict)
+    results = recommendation_cache.get(key)
+    if results is None:
+        results = recommendation_flights.do(key, lambda: _score(
+            snapshot, requirements, profile, strict_rows(db, snapshot, requirements) if strict else None, key
+        ))
+    return [dict(result) for result in results]
+
+
+async def match_models_async(
+    requirements: Dict[str, Any],
+    db: AsyncSession,
+    snapshot: CatalogSnapshot,
+    profile: CompiledProfile = DEFAULT_PROFILE,
+    strict: bool = False,
+) -> List[Dict]:
+    """
+    match_models for async callers. Scoring runs on the threadpool, and
+    identical concurrent calls (sync or async) share one run.
+    """
+    key = requirements_key(requirements, snapshot.generation, profile, strict)
+    results = recommendation_cache.get(key)
+    if results is None:
+        async def compute() -> Tuple[Dict, ...]:
+            rows = None
+            if strict:
+                query = strict_candidates(requirements, db.bind.dialect.name)
+                if query is not None:
+                    # The shared run can outlive the leader's request, and
+                    # with it the request's session
+                    async with AsyncSession(bind=db.bind) as own:
+                        rows = candidate_rows(snapshot, (await own.scalars(query)).all())
+            return await run_in_threadpool(_score, snapshot, requirements, profile, rows, key)
+
+        results = await recommendation_flights.do_async(key, compute)
+    return [dict(result) for result in results]
+
+
+def candidate_rows(snapshot: CatalogSnapshot, model_ids: Sequence[int]) -> np.ndarray:
+    """
+    Catalog positions of model_ids; models newer than the snapshot are left out.
+    """
+    return np.flatnonzero(np.isin(snapshot.compiled.model_ids, model_ids))
+
+
+def strict_rows(db: Session, snapshot: CatalogSnapshot, requirements: Dict[str, Any]) -> Optional[np.ndarray]:
+    """
+    Catalog positions of the models meeting the hard constraints of
+    requirements, or None if there are none.
+    """
+    query = strict_candidates(requirements, db.get_bind().dialect.name)
+    if query is None:
+        return None
+    return candidate_rows(snapshot, db.scalars(query).all())
+
+
+def build_profile(
+    weights: Optional[Mapping[str, float]] = None,
+    min_score: Optional[float] = None,
+    top_k: Optional[int] = None,
+    base: CompiledProfile = DEFAULT_PROFILE,
+) -> CompiledProfile:
+    """
+    compile_profile, raising a 400 error for invalid weights.
+    """
+    try:
+        return compile_profile(weights, min_score, top_k, base=base)
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc))
+
+
+async def load_profile(db: AsyncSession, name: str) -> CompiledProfile:
+    """
+    Return the compiled scoring profile called name. Raises a 404 error if
+    there is none.
+    """
+    profile = scoring_profile_cache.get(name)
+    if profile is None:
+        row = (await db.scalars(select(ScoringProfile).where(ScoringProfile.name == name))).first()
+        if row is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Scoring profile not found",
+            )
+        profile = build_profile(row.weights, row.min_score, row.top_k)
+        scoring_profile_cache.set(name, profile)
+    return profile
@@ -0,0 +1,486 @@
+"""
+Compiled, vectorized scoring engine for LLM model recommendations.
+
+The catalog is compiled once into NumPy feature columns so that a
+requirements dict can be scored against every model in a single pass.
+The rules mirror the original per-model if/elif chain exactly: same
+points, same reasoning sentences, same ordering of ties.
+
+Every (criterion, answer) pair is also precompiled into a 0/1 match column,
+so scoring with any weights is one matrix-vector product of the match matrix
+and a weight vector holding the weights of the requested answers.
+"""
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
+
+import numpy as np
+
+# Points awarded per criterion
+TASK_POINTS = 20
+MATCH_POINTS = 15
+PARTIAL_POINTS = 10
+BASELINE_POINTS = 5
+MIN_SCORE = 30
+TOP_K = 5
+
+# Weighted criteria in weight-vector order; the baseline goes to every model
+CRITERIA = (
+    "task_type",
+    "size_preference",
+    "license_preference",
+    "budget_constraint",
+    "language_support",
+    "deployment",
+)
+WEIGHT_KEYS = CRITERIA + ("baseline",)
+WEIGHT_INDEX = {key: i for i, key in enumerate(WEIGHT_KEYS)}
+DEFAULT_WEIGHTS = {
+    "task_type": TASK_POINTS,
+    "size_preference": MATCH_POINTS,
+    "license_preference": MATCH_POINTS,
+    "budget_constraint": MATCH_POINTS,
+    "language_support": MATCH_POINTS,
+    "deployment": MATCH_POINTS,
+    "baseline": BASELINE_POINTS,
+}
+MAX_WEIGHT = 1000
+MAX_TOP_K = 100
+
+# Scores are compared and reported in units of 1 / SCORE_SCALE
+SCORE_SCALE = 10000
+
+# Task type -> (bit, keywords searched in strengths, reasoning)
+TASK_RULES = {
+    "text_generation": (0, ("text generation",), "Excellent for text generation tasks"),
+    "code_generation": (1, ("code",), "Specialized in code generation"),
+    "translation": (2, ("translation",), "Strong multilingual translation capabilities"),
+    "summarization": (3, ("summarization",), "Effective at text summarization"),
+    "qa": (4, ("qa", "question answering"), "Optimized for question answering"),
+    "chat": (5, ("conversational",), "Designed for conversational interactions"),
+}
+
+# Parameter buckets (0 means unknown or zero parameters)
+SIZE_NONE, SIZE_SMALL, SIZE_MEDIUM, SIZE_LARGE, SIZE_XLARGE = range(5)
+SIZE_RULES = {
+    "small": (SIZE_SMALL, "Small model size as preferred"),
+    "medium": (SIZE_MEDIUM, "Medium model size as preferred"),
+    "large": (SIZE_LARGE, "Large model size as preferred"),
+    "xlarge": (SIZE_XLARGE, "Extra large model as preferred"),
+}
+
+# Budget flags derived from pricing_info
+BUDGET_HAS_PRICING = 1 << 0
+BUDGET_FREE = 1 << 1
+BUDGET_LOW = 1 << 2
+BUDGET_MEDIUM = 1 << 3
+BUDGET_ENTERPRISE = 1 << 4
+BUDGET_KEYWORDS = (
+    ("free", BUDGET_FREE),
+    ("low", BUDGET_LOW),
+    ("medium", BUDGET_MEDIUM),
+    ("enterprise", BUDGET_ENTERPRISE),
+)
+BUDGET_RULES = {
+    "free": (BUDGET_FREE, "Available for free as required"),
+    "low": (BUDGET_LOW, "Low cost option"),
+    "medium": (BUDGET_MEDIUM, "Medium cost tier"),
+    "high": (BUDGET_ENTERPRISE, "Enterprise-grade offering"),
+}
+
+# Deployment flags derived from hardware_requirements
+DEPLOY_API = 1 << 0
+DEPLOY_LOCAL = 1 << 1
+DEPLOY_RULES = {
+    "cloud": (DEPLOY_API, "Available as cloud API"),
+    "local": (DEPLOY_LOCAL, "Suitable for local deployment"),
+}
+
+# Match column of the answers every model matches ("any" license, hybrid)
+ALWAYS = ("*", None)
+
+
+@dataclass(frozen=True)
+class CompiledCatalog:
+    """
+    Column-oriented, precompiled view of the LLM model catalog.
+    """
+    model_ids: np.ndarray        # int64, catalog order
+    task_mask: np.ndarray        # uint8 bitmask of TASK_RULES bits
+    size_bucket: np.ndarray      # int8 SIZE_* code
+    license_code: np.ndarray     # int32 index into license_labels
+    license_labels: Tuple[Any, ...]
+    budget_flags: np.ndarray     # uint8 BUDGET_* flags
+    deploy_flags: np.ndarray     # uint8 DEPLOY_* flags
+    lang_bits: np.ndarray        # uint64 (n, words) language bitset
+    lang_count: np.ndarray       # int32 number of supported languages
+    lang_index: Dict[str, int]   # lowercased language -> bit position
+    match_matrix: np.ndarray     # float32 (n, columns), 1 where a model matches
+    match_columns: Dict[Tuple[str, Any], int]  # (criterion, answer) -> column
+
+    def __len__(self) -> int:
+        return len(self.model_ids)
+
+    def license_code_for(self, value: Any) -> int:
+        """Return the license code for a value, or -1 if no model has it."""
+        try:
+            return self.license_labels.index(value)
+        except ValueError:
+            return -1
+
+    def language_mask(self, languages: Iterable[Any]) -> Optional[np.ndarray]:
+        """
+        Return the bitset row for the given languages, or None if any of them
+        is not supported by a single model in the catalog.
+        """
+        mask = np.zeros(self.lang_bits.shape[1], dtype=np.uint64)
+        for lang in languages:
+            bit = self.lang_index.get(lang.lower())
+            if bit is None:
+                return None
+            mask[bit // 64] |= np.uint64(1) << np.uint64(bit % 64)
+        return mask
+
+
+def _size_bucket(parameters: Optional[float]) -> int:
+    if not parameters:
+        return SIZE_NONE
+    if parameters <= 5:
+        return SIZE_SMALL
+    if parameters <= 20:
+        return SIZE_MEDIUM
+    if parameters <= 100:
+        return SIZE_LARGE
+    return SIZE_XLARGE
+
+
+def compile_catalog(models: Iterable[Any]) -> CompiledCatalog:
+    """
+    Compile LLM model rows (ORM objects or anything with the same attributes)
+    into NumPy feature columns.
+    """
+    models = list(models)
+    n = len(models)
+
+    model_ids = np.empty(n, dtype=np.int64)
+    task_mask = np.zeros(n, dtype=np.uint8)
+    size_bucket = np.zeros(n, dtype=np.int8)
+    license_code = np.empty(n, dtype=np.int32)
+    budget_flags = np.zeros(n, dtype=np.uint8)
+    deploy_flags = np.zeros(n, dtype=np.uint8)
+    lang_count = np.zeros(n, dtype=np.int32)
+
+    license_labels: List[Any] = []
+    license_lookup: Dict[Any, int] = {}
+    lang_index: Dict[str, int] = {}
+    lang_sets: List[List[int]] = []
+
+    for i, model in enumerate(models):
+        model_ids[i] = model.id
+
+        strengths = (model.strengths or "").lower()
+        for bit, keywords, _ in TASK_RULES.values():
+            if any(keyword in strengths for keyword in keywords):
+                task_mask[i] |= 1 << bit
+
+        size_bucket[i] = _size_bucket(model.parameters)
+
+        if model.license_type not in license_lookup:
+            license_lookup[model.license_type] = len(license_labels)
+            license_labels.append(model.license_type)
+        license_code[i] = license_lookup[model.license_type]
+
+        if model.pricing_info:
+            pricing = model.pricing_info.lower()
+            flags = BUDGET_HAS_PRICING
+            for keyword, flag in BUDGET_KEYWORDS:
+                if keyword in pricing:
+                    flags |= flag
+            budget_flags[i] = flags
+
+        hardware = (model.hardware_requirements or "").lower()
+        deploy_flags[i] = (DEPLOY_API if "api" in hardware else 0) | (
+            DEPLOY_LOCAL if "local" in hardware else 0
+        )
+
+        bits = []
+        languages = model.supported_languages or []
+        lang_count[i] = len(languages)
+        for lang in languages:
+            bits.append(lang_index.setdefault(lang.lower(), len(lang_index)))
+        lang_sets.append(bits)
+
+    words = max(1, (len(lang_index) + 63) // 64)
+    lang_bits = np.zeros((n, words), dtype=np.uint64)
+    for i, bits in enumerate(lang_sets):
+        for bit in bits:
+            lang_bits[i, bit // 64] |= np.uint64(1) << np.uint64(bit % 64)
+
+    # Match columns of every fixed answer; specific languages are matched per request
+    columns: Dict[Tuple[str, Any], np.ndarray] = {ALWAYS: np.ones(n, dtype=bool)}
+    for name, (bit, _, _) in TASK_RULES.items():
+        columns["task_type", name] = (task_mask & (1 << bit)) != 0
+    for name, (bucket, _) in SIZE_RULES.items():
+        columns["size_preference", name] = size_bucket == bucket
+    for code, label in enumerate(license_labels):
+        columns["license_preference", label] = license_code == code
+    for name, (flag, _) in BUDGET_RULES.items():
+        columns["budget_constraint", name] = (budget_flags & flag) != 0
+    columns["budget_constraint", "any"] = (budget_flags & BUDGET_HAS_PRICING) != 0
+    english = lang_index.get("english")
+    has_english = np.zeros(n, dtype=bool)
+    if english is not None:
+        has_english = (lang_bits[:, english // 64] & (np.uint64(1) << np.uint64(english % 64))) != 0
+    columns["language_support", "english"] = has_english
+    columns["language_support", "multilingual"] = lang_count > 5
+    for name, (flag, _) in DEPLOY_RULES.items():
+        columns["deployment", name] = (deploy_flags & flag) != 0
+
+    match_matrix = np.zeros((n, len(columns)), dtype=np.float32)
+    for j, match in enumerate(columns.values()):
+        match_matrix[:, j] = match
+
+    return CompiledCatalog(
+        model_ids=model_ids,
+        task_mask=task_mask,
+        size_bucket=size_bucket,
+        license_code=license_code,
+        license_labels=tuple(license_labels),
+        budget_flags=budget_flags,
+        deploy_flags=deploy_flags,
+        lang_bits=lang_bits,
+        lang_count=lang_count,
+        lang_index=lang_index,
+        match_matrix=match_matrix,
+        match_columns={key: j for j, key in enumerate(columns)},
+    )
+
+
+def compile_weights(
+    overrides: Optional[Mapping[str, float]] = None,
+    base: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    """
+    Weight vector in WEIGHT_KEYS order: base (the default points if None)
+    with overrides applied. Raises ValueError for unknown criteria and
+    weights outside 0..MAX_WEIGHT.
+    """
+    if base is None:
+        weights = np.array([DEFAULT_WEIGHTS[key] for key in WEIGHT_KEYS], dtype=np.float64)
+    else:
+        weights = base.copy()
+    for key, weight in (overrides or {}).items():
+        if key not in WEIGHT_INDEX:
+            raise ValueError(f"Unknown scoring criterion: {key}")
+        if not 0 <= weight <= MAX_WEIGHT:
+            raise ValueError(f"Weight of {key} must be between 0 and {MAX_WEIGHT}")
+        weights[WEIGHT_INDEX[key]] = weight
+    weights.setflags(write=False)
+    return weights
+
+
+@dataclass(frozen=True)
+class CompiledProfile:
+    """
+    Weights, minimum score and result count of a scoring profile.
+    """
+    weights: np.ndarray = field(default_factory=compile_weights)
+    min_score: float = MIN_SCORE
+    top_k: int = TOP_K
+
+    def key(self) -> List:
+        return [self.weights.tolist(), self.min_score, self.top_k]
+
+
+DEFAULT_PROFILE = CompiledProfile()
+
+
+def compile_profile(
+    weights: Optional[Mapping[str, float]] = None,
+    min_score: Optional[float] = None,
+    top_k: Optional[int] = None,
+    base: CompiledProfile = DEFAULT_PROFILE,
+) -> CompiledProfile:
+    """
+    Layer overrides on top of base; None keeps the base value. Raises
+    ValueError for invalid weights or top_k.
+    """
+    if top_k is not None and not 1 <= top_k <= MAX_TOP_K:
+        raise ValueError(f"top_k must be between 1 and {MAX_TOP_K}")
+    return CompiledProfile(
+        weights=compile_weights(weights, base.weights) if weights else base.weights,
+        min_score=base.min_score if min_score is None else min_score,
+        top_k=base.top_k if top_k is None else top_k,
+    )
+
+
+# A criterion evaluation: (criterion, partial, match column index or None,
+# boolean match column, reasoning). Partial matches earn PARTIAL_POINTS out of
+# MATCH_POINTS of the criterion's weight. Reasoning is None for the license
+# rule, whose text depends on the model.
+Criterion = Tuple[str, bool, Optional[int], np.ndarray, Optional[str]]
+
+
+def _column(
+    catalog: CompiledCatalog,
+    criterion: str,
+    key: Tuple[str, Any],
+    reason: Optional[str],
+    partial: bool = False,
+) -> Optional[Criterion]:
+    column = _lookup(catalog.match_columns, key)
+    if column is None:  # no model has this answer
+        return None
+    return (criterion, partial, column, catalog.match_matrix[:, column], reason)
+
+
+def evaluate_criteria(catalog: CompiledCatalog, requirements: Dict) -> List[Criterion]:
+    """
+    Evaluate each requirement against the whole catalog, in rule order.
+    """
+    criteria: List[Optional[Criterion]] = []
+
+    if "task_type" in requirements:
+        task_type = requirements["task_type"]
+        rule = _lookup(TASK_RULES, task_type)
+        if rule:
+            criteria.append(_column(catalog, "task_type", ("task_type", task_type), rule[2]))
+
+    if "size_preference" in requirements:
+        size_pref = requirements["size_preference"]
+        rule = _lookup(SIZE_RULES, size_pref)
+        if rule:
+            criteria.append(_column(catalog, "size_preference", ("size_preference", size_pref), rule[1]))
+
+    if "license_preference" in requirements:
+        license_pref = requirements["license_preference"]
+        key = ALWAYS if license_pref == "any" else ("license_preference", license_pref)
+        criteria.append(_column(catalog, "license_preference", key, None))
+
+    if "budget_constraint" in requirements:
+        budget = requirements["budget_constraint"]
+        rule = _lookup(BUDGET_RULES, budget)
+        if rule:
+            criteria.append(_column(catalog, "budget_constraint", ("budget_constraint", budget), rule[1]))
+        elif budget == "any":
+            criteria.append(_column(
+                catalog, "budget_constraint", ("budget_constraint", "any"),
+                "Matches any budget constraint", partial=True,
+            ))
+
+    if "language_support" in requirements:
+        lang_support = requirements["language_support"]
+        if lang_support == "english":
+            criteria.append(_column(
+                catalog, "language_support", ("language_support", "english"), "Supports English as required",
+            ))
+        elif lang_support == "multilingual":
+            criteria.append(_column(
+                catalog, "language_support", ("language_support", "multilingual"), "Strong multilingual support",
+            ))
+        elif lang_support == "specific" and "specific_languages" in requirements:
+            match = _languages_match(catalog, requirements["specific_languages"]) & (catalog.lang_count > 0)
+            criteria.append(
+                ("language_support", False, None, match, "Supports all the specific languages required")
+            )
+
+    if "deployment" in requirements:
+        deployment = requirements["deployment"]
+        rule = _lookup(DEPLOY_RULES, deployment)
+        if rule:
+            criteria.append(_column(catalog, "deployment", ("deployment", deployment), rule[1]))
+        elif deployment == "hybrid":
+            criteria.append(_column(catalog, "deployment", ALWAYS, "Can be used in hybrid deployment", partial=True))
+
+    return [criterion for criterion in criteria if criterion is not None]
+
+
+def score_catalog(
+    catalog: CompiledCatalog,
+    requirements: Dict,
+    limit: int = TOP_K,
+    min_score: float = MIN_SCORE,
+    weights: Optional[np.ndarray] = None,
+    rows: Optional[np.ndarray] = None,
+) -> List[Dict]:
+    """
+    Score the whole catalog against requirements and return the top matches
+    as ``{"model_id", "score", "reasoning"}`` dicts, highest score first.
+    weights is a compile_weights() vector; the default points if None.
+    Scores are ints when whole, which they always are with integer weights.
+    rows restricts scoring to those catalog positions.
+    """
+    n = len(catalog)
+    if n == 0 or limit <= 0:
+        return []
+    if weights is None:
+        weights = DEFAULT_PROFILE.weights
+    if rows is None:
+        positions = np.arange(n)
+        matrix = catalog.match_matrix
+    else:
+        positions = np.asarray(rows, dtype=np.intp)
+        matrix = catalog.match_matrix[positions]
+
+    criteria = evaluate_criteria(catalog, requirements)
+
+    # Put the weight of each requested answer on its match column and score
+    # the catalog in one product; only per-request columns are added apart
+    column_weights = np.zeros(matrix.shape[1], dtype=np.float32)
+    scores = np.full(len(positions), weights[WEIGHT_INDEX["baseline"]], dtype=np.float64)
+    for criterion, partial, column, match, _ in criteria:
+        weight = weights[WEIGHT_INDEX[criterion]]
+        if partial:
+            weight = weight * PARTIAL_POINTS / MATCH_POINTS
+        if column is None:
+            scores += (match if rows is None else match[positions]) * weight
+        else:
+            column_weights[column] += weight
+    scores += matrix @ column_weights
+
+    # Fixed-point scores, so that equal reported scores tie exactly
+    scores = np.rint(scores * SCORE_SCALE).astype(np.int64)
+    passing = np.flatnonzero(scores >= round(min_score * SCORE_SCALE))
+    if passing.size == 0:
+        return []
+    candidates = positions[passing]
+    scores = scores[passing]
+
+    # Break ties by catalog position, like a stable sort would
+    keys = scores * n + (n - 1 - candidates)
+    if candidates.size > limit:
+        top = np.argpartition(-keys, limit - 1)[:limit]
+    else:
+        top = np.arange(candidates.size)
+    top = top[np.argsort(-keys[top])]
+
+    results = []
+    for j in top:
+        i = candidates[j]
+        reasoning_points = []
+        for _, _, _, match, reason in criteria:
+            if match[i]:
+                if reason is None:
+                    license_type = catalog.license_labels[catalog.license_code[i]]
+                    reason = f"License type ({license_type}) matches preference"
+                reasoning_points.append(reason)
+        score = int(scores[j])
+        results.append({
+            "model_id": int(catalog.model_ids[i]),
+            "score": score // SCORE_SCALE if score % SCORE_SCALE == 0 else score / SCORE_SCALE,
+            "reasoning": ". ".join(reasoning_points) + ".",
+        })
+    return results
+
+
+def _lookup(rules: Dict, value: Any) -> Optional[Tuple]:
+    try:
+        return rules.get(value)
+    except TypeError:  # unhashable requirement value never matches
+        return None
+
+
+def _languages_match(catalog: CompiledCatalog, languages: Iterable[Any]) -> np.ndarray:
+    mask = catalog.language_mask(languages)
+    if mask is None:
+        return np.zeros(len(catalog), dtype=bool)
+    return np.all((catalog.lang_bits & mask) == mask, axis=1)
@@ -0,0 +1,242 @@
+"""
+In-process full-text search over the catalog snapshot.
+
+Used when the database has no full-text index (SQLite in development) and as
+the typo-tolerant fallback on Postgres. Text fields are tokenized into an
+inverted index of NumPy posting arrays and ranked with BM25F (per-field
+weights). Query terms missing from the vocabulary are expanded to similar
+vocabulary terms by trigram similarity.
+"""
+import html
+import math
+import re
+import threading
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Set, Tuple
+
+import numpy as np
+
+from app.core.catalog import CatalogSnapshot, catalog_cache
+
+# Searchable fields and their BM25F weights
+FIELD_WEIGHTS = {
+    "name": 3.0,
+    "strengths": 2.0,
+    "description": 1.0,
+    "weaknesses": 0.5,
+}
+
+# BM25 parameters
+K1 = 1.2
+B = 0.75
+
+# Trigram expansion of unknown query terms
+MIN_SIMILARITY = 0.4
+MAX_EXPANSIONS = 3
+
+SNIPPET_CHARS = 160
+STOPWORDS = frozenset(
+    "a an and are as at be by for from has have in is it its of on or that the to was with".split()
+)
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+_WORD = re.compile(r"[A-Za-z0-9]+")
+
+
+def normalize(token: str) -> Optional[str]:
+    """
+    Normalize a lowercased token, or return None for stopwords.
+    """
+    if token in STOPWORDS:
+        return None
+    # Fold simple plurals ("models" -> "model") but not "ss" endings
+    if len(token) > 3 and token.endswith("s") and not token.endswith("ss"):
+        token = token[:-1]
+    return token
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    terms = []
+    for token in _TOKEN.findall((text or "").lower()):
+        term = normalize(token)
+        if term:
+            terms.append(term)
+    return terms
+
+
+def trigrams(term: str) -> Set[str]:
+    padded = f"  {term} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+@dataclass(frozen=True)
+class SearchHit:
+    model_id: int
+    score: float
+    highlights: Dict[str, str]
+
+
+class ModelSearchIndex:
+    """
+    BM25F inverted index over one catalog snapshot.
+    """
+
+    def __init__(self, snapshot: CatalogSnapshot):
+        self.snapshot = snapshot
+        models = snapshot.models
+        n = len(models)
+        self.model_ids = np.array([model.id for model in models], dtype=np.int64)
+
+        weighted_tf: Dict[str, Dict[int, float]] = defaultdict(dict)
+        doc_len = np.zeros(n, dtype=np.float32)
+        for doc, model in enumerate(models):
+            for field, weight in FIELD_WEIGHTS.items():
+                terms = tokenize(getattr(model, field))
+                doc_len[doc] += weight * len(terms)
+                for term in terms:
+                    postings = weighted_tf[term]
+                    postings[doc] = postings.get(doc, 0.0) + weight
+
+        self.doc_len = doc_len
+        self.avg_doc_len = float(doc_len.mean()) if n else 0.0
+        self.postings: Dict[str, Tuple[np.ndarray, np.ndarray]] = {
+            term: (
+                np.fromiter(postings.keys(), dtype=np.int32, count=len(postings)),
+                np.fromiter(postings.values(), dtype=np.float32, count=len(postings)),
+            )
+            for term, postings in weighted_tf.items()
+        }
+
+        self._trigram_terms: Dict[str, List[str]] = defaultdict(list)
+        for term in self.postings:
+            for gram in trigrams(term):
+                self._trigram_terms[gram].append(term)
+
+    def __len__(self) -> int:
+        return len(self.model_ids)
+
+    def expand(self, term: str) -> List[Tuple[str, float]]:
+        """
+        Return (vocabulary term, weight) pairs for a query term: the term
+        itself if indexed, else its closest terms by trigram similarity.
+        """
+        if term in self.postings:
+            return [(term, 1.0)]
+        grams = trigrams(term)
+        shared: Dict[str, int] = defaultdict(int)
+        for gram in grams:
+            for candidate in self._trigram_terms.get(gram, ()):
+                shared[candidate] += 1
+        similar = []
+        for candidate, count in shared.items():
+            similarity = count / (len(grams) + len(trigrams(candidate)) - count)
+            if similarity >= MIN_SIMILARITY:
+                similar.append((candidate, similarity))
+        similar.sort(key=lambda item: (-item[1], item[0]))
+        return similar[:MAX_EXPANSIONS]
+
+    def search(self, query: str, limit: int = 20, offset: int = 0) -> Tuple[int, List[SearchHit]]:
+        """
+        Rank the catalog for query. Returns the number of matching models and
+        the requested page of hits, best first.
+        """
+        n = len(self)
+        if n == 0:
+            return 0, []
+
+        scores = np.zeros(n, dtype=np.float32)
+        norm = K1 * (1 - B + B * self.doc_len / max(self.avg_doc_len, 1e-9))
+        matched_terms: Set[str] = set()
+        for query_term in dict.fromkeys(tokenize(query)):
+            for term, weight in self.expand(query_term):
+                docs, tf = self.postings[term]
+                idf = math.log(1 + (n - len(docs) + 0.5) / (len(docs) + 0.5))
+                scores[docs] += weight * idf * tf * (K1 + 1) / (tf + norm[docs])
+                matched_terms.add(term)
+
+        candidates = np.flatnonzero(scores > 0)
+        total = int(candidates.size)
+        end = offset + limit
+        if total == 0 or offset >= total or limit <= 0:
+            return total, []
+
+        # Highest score first, ties in catalog order
+        if total > end:
+            top = candidates[np.argpartition(-scores[candidates], end - 1)[:end]]
+        else:
+            top = candidates
+        top = top[np.lexsort((top, -scores[top]))][offset:end]
+
+        hits = []
+        for doc in top:
+            model = self.snapshot.models[doc]
+            hits.append(SearchHit(
+                model_id=int(self.model_ids[doc]),
+                score=round(float(scores[doc]), 4),
+                highlights=highlight(model, matched_terms),
+            ))
+        return total, hits
+
+
+def highlight(model, terms: Set[str]) -> Dict[str, str]:
+    """
+    Snippets of each field containing a matched term, with matches wrapped
+    in <mark> tags. The text itself is HTML-escaped.
+    """
+    highlights = {}
+    for field in FIELD_WEIGHTS:
+        text = getattr(model, field) or ""
+        spans = [m.span() for m in _WORD.finditer(text) if normalize(m.group().lower()) in terms]
+        if not spans:
+            continue
+        start = max(0, spans[0][0] - SNIPPET_CHARS // 4)
+        if start > 0:
+            # Start the snippet on a word boundary
+            space = text.find(" ", start, spans[0][0])
+            start = space + 1 if space >= 0 else spans[0][0]
+        end = min(len(text), start + SNIPPET_CHARS)
+        parts = ["…" if start > 0 else ""]
+        cursor = start
+        for span_start, span_end in spans:
+            if span_start < cursor or span_end > end:
+                continue
+            parts.append(html.escape(text[cursor:span_start]))
+            parts.append(f"<mark>{html.escape(text[span_start:span_end])}</mark>")
+            cursor = span_end
+        parts.append(html.escape(text[cursor:end]))
+        parts.append("…" if end < len(text) else "")
+        highlights[field] = "".join(parts)
+    return highlights
+
+
+class SearchIndexCache:
+    """
+    Builds the search index lazily, once per catalog generation.
+    """
+
+    def __init__(self):
+        self._index: Optional[ModelSearchIndex] = None
+        self._lock = threading.Lock()
+        self.builds = 0
+
+    def get(self, snapshot: CatalogSnapshot) -> ModelSearchIndex:
+        index = self._index
+        if index is not None and index.snapshot is snapshot:
+            return index
+        with self._lock:
+            index = self._index
+            if index is None or index.snapshot is not snapshot:
+                index = ModelSearchIndex(snapshot)
+                self._index = index
+                self.builds += 1
+        return index
+
+    def clear(self) -> None:
+        self._index = None
+
+
+search_index_cache = SearchIndexCache()
+
+# Release the old index as soon as a new catalog generation is loaded
+catalog_cache.subscribe(lambda snapshot: search_index_cache.clear())
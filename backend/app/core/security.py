@@ -1,11 +1,18 @@
 from datetime import datetime, timedelta
-from typing import Optional, Union, Any
+from typing import Optional, Tuple, Union, Any
 from jose import jwt
 from passlib.context import CryptContext
 from app.core.config import settings
 
-# Password hashing context
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Password hashing context. Pinning min/max rounds to the configured cost makes
+# verify_and_update return a new hash whenever BCRYPT_ROUNDS changes.
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__default_rounds=settings.BCRYPT_ROUNDS,
+    bcrypt__min_rounds=settings.BCRYPT_ROUNDS,
+    bcrypt__max_rounds=settings.BCRYPT_ROUNDS,
+)
 
 def create_access_token(subject: Union[str, Any], expires_delta: Optional[timedelta] = None) -> str:
     """
@@ -31,3 +38,10 @@ def get_password_hash(password: str) -> str:
     Hash a password
     """
     return pwd_context.hash(password)
+
+def verify_and_update_password(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """
+    Verify a password and return a replacement hash if the stored one uses
+    outdated parameters
+    """
+    return pwd_context.verify_and_update(plain_password, hashed_password)
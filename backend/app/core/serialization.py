@@ -0,0 +1,44 @@
+"""
+Lean JSON response path for data the server built and validated itself.
+
+Catalog rows are serialized once per snapshot; responses are assembled by
+joining those bytes, so list endpoints neither revalidate nor re-encode rows.
+"""
+from functools import lru_cache
+from typing import Any, Iterable, List, Optional, Type
+
+import orjson
+from fastapi import Response
+from pydantic import TypeAdapter
+
+
+class RawJSONResponse(Response):
+    """
+    Response whose content is already-encoded JSON bytes.
+    """
+    media_type = "application/json"
+
+
+@lru_cache(maxsize=None)
+def _list_adapter(schema: Type) -> TypeAdapter:
+    return TypeAdapter(List[schema])
+
+
+def encode_list(schema: Type, items: Iterable[Any]) -> bytes:
+    """
+    Validate ORM rows against schema and encode them as a JSON array, for
+    responses whose schema is chosen at request time.
+    """
+    adapter = _list_adapter(schema)
+    return adapter.dump_json(adapter.validate_python(list(items), from_attributes=True))
+
+
+def json_array(items: Iterable[bytes]) -> bytes:
+    return b"[" + b",".join(items) + b"]"
+
+
+def cursor_page(items: Iterable[bytes], next_cursor: Optional[str]) -> bytes:
+    """
+    Encode a CursorPage envelope around pre-encoded items.
+    """
+    return b'{"items":' + json_array(items) + b',"next_cursor":' + orjson.dumps(next_cursor) + b"}"
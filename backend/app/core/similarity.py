@@ -0,0 +1,372 @@
+"""
+Local semantic similarity index for "models like this one".
+
+Model texts are embedded offline with a signed feature-hashing vectorizer
+(unigrams and bigrams, sublinear term frequency, L2-normalized), so no model
+download, network or GPU is needed. Embeddings live in a float32 matrix file
+that every worker on the host memory-maps, and nearest neighbours are found
+by exact brute-force cosine similarity.
+
+The matrix is stored dimension-major (one contiguous column of all models per
+dimension). Hashed vectors are sparse, so a query only reads the columns of
+its non-zero dimensions instead of streaming the whole matrix.
+
+Each catalog generation gets its own directory of files, written under a
+temporary name and renamed into place whole. Building a generation starts
+from the previous one and only re-embeds rows whose text changed. After a
+catalog change the new generation is built on a background thread while
+requests keep using the previous one.
+"""
+import hashlib
+import logging
+import math
+import os
+import re
+import shutil
+import tempfile
+import threading
+import zlib
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from app.core.catalog import CatalogSnapshot, catalog_cache
+from app.core.config import settings
+from app.core.search import tokenize
+
+logger = logging.getLogger(__name__)
+
+# Embedded fields and their weights
+FIELD_WEIGHTS = {
+    "description": 1.0,
+    "strengths": 1.5,
+    "weaknesses": 0.5,
+}
+
+# Generation directories, and files of the older flat layout
+_GENERATION_DIR = re.compile(r"g(\d+)-d(\d+)$")
+_GENERATION_ENTRY = re.compile(r"g(\d+)-d\d+(?:$|\.)")
+
+
+def _features(text: Optional[str]) -> List[str]:
+    terms = tokenize(text)
+    return terms + [f"{a} {b}" for a, b in zip(terms, terms[1:])]
+
+
+def embed(weighted_texts: Iterable[Tuple[Optional[str], float]], dimensions: int) -> np.ndarray:
+    """
+    Embed texts into one unit vector. Hashing uses crc32, which unlike hash()
+    is stable across processes.
+    """
+    counts: Dict[str, float] = defaultdict(float)
+    for text, weight in weighted_texts:
+        for feature in _features(text):
+            counts[feature] += weight
+    vector = np.zeros(dimensions, dtype=np.float32)
+    for feature, count in counts.items():
+        h = zlib.crc32(feature.encode())
+        sign = 1.0 if h & 0x80000000 else -1.0
+        vector[h % dimensions] += sign * (1.0 + math.log(count))
+    norm = np.linalg.norm(vector)
+    if norm > 0:
+        vector /= norm
+    return vector
+
+
+def embed_model(model, dimensions: int) -> np.ndarray:
+    return embed(((getattr(model, field), weight) for field, weight in FIELD_WEIGHTS.items()), dimensions)
+
+
+def embed_query(text: str, dimensions: int) -> np.ndarray:
+    return embed([(text, 1.0)], dimensions)
+
+
+def text_fingerprint(model) -> int:
+    """
+    64-bit digest of the embedded fields, to detect rows that need re-embedding.
+    """
+    text = "\x1f".join(getattr(model, field) or "" for field in FIELD_WEIGHTS)
+    return int.from_bytes(hashlib.blake2b(text.encode(), digest_size=8).digest(), "little")
+
+
+class SimilarityIndex:
+    """
+    Memory-mapped embeddings for one catalog generation. columns has shape
+    (dimensions, models).
+    """
+
+    def __init__(self, generation: int, model_ids: np.ndarray, fingerprints: np.ndarray, columns: np.ndarray):
+        self.generation = generation
+        self.model_ids = model_ids
+        self.fingerprints = fingerprints
+        self.columns = columns
+        self.position = {int(model_id): i for i, model_id in enumerate(model_ids)}
+        self.reused = 0
+        self.embedded = 0
+
+    def __len__(self) -> int:
+        return len(self.model_ids)
+
+    @property
+    def dimensions(self) -> int:
+        return self.columns.shape[0]
+
+    def vector(self, model_id: int) -> Optional[np.ndarray]:
+        position = self.position.get(model_id)
+        if position is None:
+            return None
+        return np.array(self.columns[:, position])
+
+    def nearest(self, vector: np.ndarray, limit: int, exclude: Optional[int] = None) -> List[Tuple[int, float]]:
+        """
+        Return up to limit (model id, cosine similarity) pairs, most similar
+        first. Models with no text in common (similarity <= 0) are left out.
+        """
+        if len(self) == 0 or limit <= 0:
+            return []
+        dims = np.flatnonzero(vector)
+        if dims.size == 0:
+            return []
+        scores = vector[dims] @ self.columns[dims]
+        if exclude is not None and exclude in self.position:
+            scores[self.position[exclude]] = -np.inf
+        k = min(limit, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.lexsort((top, -scores[top]))]
+        return [
+            (int(self.model_ids[i]), round(float(scores[i]), 4))
+            for i in top
+            if scores[i] > 0
+        ]
+
+    def similar(self, model_id: int, limit: int) -> List[Tuple[int, float]]:
+        """
+        Models most similar to model_id, excluding itself.
+        """
+        vector = self.vector(model_id)
+        if vector is None:
+            return []
+        return self.nearest(vector, limit, exclude=model_id)
+
+
+def _generation_dir(directory: str, generation: int, dimensions: int) -> str:
+    return os.path.join(directory, f"g{generation}-d{dimensions}")
+
+
+def _load(directory: str, generation: int, dimensions: int) -> Optional[SimilarityIndex]:
+    path = _generation_dir(directory, generation, dimensions)
+    # Directories are renamed into place complete, so an existing one is whole
+    try:
+        model_ids = np.load(os.path.join(path, "ids.npy"))
+        fingerprints = np.load(os.path.join(path, "fingerprints.npy"))
+        columns = np.memmap(
+            os.path.join(path, "vectors"), dtype=np.float32, mode="r", shape=(dimensions, len(model_ids))
+        )
+    except FileNotFoundError:
+        return None
+    return SimilarityIndex(generation, model_ids, fingerprints, columns)
+
+
+def _matches(index: Optional[SimilarityIndex], model_ids: np.ndarray, fingerprints: np.ndarray) -> bool:
+    return (
+        index is not None
+        and np.array_equal(index.model_ids, model_ids)
+        and np.array_equal(index.fingerprints, fingerprints)
+    )
+
+
+def _write(directory: str, index: SimilarityIndex) -> SimilarityIndex:
+    final = _generation_dir(directory, index.generation, index.dimensions)
+    staging = tempfile.mkdtemp(prefix=f".{os.path.basename(final)}.", suffix=".tmp", dir=directory)
+    try:
+        np.save(os.path.join(staging, "ids.npy"), index.model_ids)
+        np.save(os.path.join(staging, "fingerprints.npy"), index.fingerprints)
+        with open(os.path.join(staging, "vectors"), "wb") as f:
+            f.write(np.ascontiguousarray(index.columns, dtype=np.float32).tobytes())
+        try:
+            os.rename(staging, final)
+        except OSError:
+            # Another worker renamed its set into place first. Replace it only
+            # if it differs; workers that mapped it keep their mapping.
+            if not _matches(_load(directory, index.generation, index.dimensions), index.model_ids, index.fingerprints):
+                retired = staging + ".old"
+                os.rename(final, retired)
+                os.rename(staging, final)
+                shutil.rmtree(retired, ignore_errors=True)
+    finally:
+        shutil.rmtree(staging, ignore_errors=True)
+    loaded = _load(directory, index.generation, index.dimensions)
+    loaded.reused, loaded.embedded = index.reused, index.embedded
+    return loaded
+
+
+def _latest_before(directory: str, generation: int, dimensions: int) -> Optional[SimilarityIndex]:
+    generations = []
+    for name in os.listdir(directory):
+        match = _GENERATION_DIR.match(name)
+        if match and int(match.group(2)) == dimensions and int(match.group(1)) < generation:
+            generations.append(int(match.group(1)))
+    return _load(directory, max(generations), dimensions) if generations else None
+
+
+def _remove_older(directory: str, generation: int) -> None:
+    # Keep the previous generation around for workers still switching over
+    for name in os.listdir(directory):
+        match = _GENERATION_ENTRY.match(name)
+        if match and int(match.group(1)) < generation - 1:
+            path = os.path.join(directory, name)
+            if os.path.isdir(path):
+                shutil.rmtree(path, ignore_errors=True)
+            else:
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+
+
+def build_index(
+    snapshot: CatalogSnapshot,
+    directory: str,
+    dimensions: int,
+    previous: Optional[SimilarityIndex] = None,
+) -> SimilarityIndex:
+    """
+    Return the index for snapshot's generation, mapping the files another
+    worker already wrote or building them from the previous generation.
+    """
+    os.makedirs(directory, exist_ok=True)
+    model_ids = np.array([model.id for model in snapshot.models], dtype=np.int64)
+    fingerprints = np.array([text_fingerprint(model) for model in snapshot.models], dtype=np.uint64)
+
+    existing = _load(directory, snapshot.generation, dimensions)
+    if _matches(existing, model_ids, fingerprints):
+        return existing
+
+    if previous is None or previous.dimensions != dimensions:
+        previous = _latest_before(directory, snapshot.generation, dimensions)
+
+    columns = np.empty((dimensions, len(model_ids)), dtype=np.float32)
+    index = SimilarityIndex(snapshot.generation, model_ids, fingerprints, columns)
+
+    # Copy the columns of rows whose text is unchanged, embed the rest
+    reuse_new: List[int] = []
+    reuse_old: List[int] = []
+    for i, model in enumerate(snapshot.models):
+        old = previous.position.get(model.id) if previous is not None else None
+        if old is not None and previous.fingerprints[old] == fingerprints[i]:
+            reuse_new.append(i)
+            reuse_old.append(old)
+        else:
+            columns[:, i] = embed_model(model, dimensions)
+            index.embedded += 1
+    if reuse_new:
+        columns[:, reuse_new] = previous.columns[:, reuse_old]
+        index.reused = len(reuse_new)
+
+    index = _write(directory, index)
+    _remove_older(directory, snapshot.generation)
+    logger.info(
+        "Similarity index generation %d: %d rows reused, %d embedded",
+        snapshot.generation, index.reused, index.embedded,
+    )
+    return index
+
+
+class SimilarityIndexCache:
+    """
+    Holds the index for the current catalog generation. Once an index has
+    been used, catalog changes rebuild it on a background thread and
+    requests are served from the previous generation until it is ready.
+    """
+
+    def __init__(self, directory: str, dimensions: int):
+        self.directory = directory
+        self.dimensions = dimensions
+        self._index: Optional[SimilarityIndex] = None
+        self._lock = threading.Lock()
+        self._pending: Optional[CatalogSnapshot] = None
+        self._worker: Optional[threading.Thread] = None
+        self._worker_lock = threading.Lock()
+        self.builds = 0
+
+    @staticmethod
+    def _is_current(index: Optional[SimilarityIndex], snapshot: CatalogSnapshot) -> bool:
+        return index is not None and index.generation == snapshot.generation and len(index) == len(snapshot.models)
+
+    def get(self, snapshot: CatalogSnapshot) -> SimilarityIndex:
+        """
+        The index for snapshot, or while it is being built, the previous one.
+        Only the first build of a worker happens on the calling thread.
+        """
+        index = self._index
+        if self._is_current(index, snapshot):
+            return index
+        if index is not None:
+            self.refresh(snapshot)
+            return index
+        return self._build(snapshot)
+
+    def refresh(self, snapshot: CatalogSnapshot) -> None:
+        """
+        Build the index for snapshot in the background. While a build runs,
+        only the latest snapshot requested is built next.
+        """
+        with self._worker_lock:
+            self._pending = snapshot
+            if self._worker is None:
+                self._worker = threading.Thread(target=self._run, name="similarity-index", daemon=True)
+                self._worker.start()
+
+    def wait(self, timeout: Optional[float] = None) -> None:
+        """
+        Wait for a background build to finish.
+        """
+        worker = self._worker
+        if worker is not None:
+            worker.join(timeout)
+
+    def _run(self) -> None:
+        while True:
+            with self._worker_lock:
+                snapshot, self._pending = self._pending, None
+                if snapshot is None:
+                    self._worker = None
+                    return
+            try:
+                self._build(snapshot)
+            except Exception:
+                logger.exception("Could not build similarity index generation %d", snapshot.generation)
+
+    def _build(self, snapshot: CatalogSnapshot) -> SimilarityIndex:
+        with self._lock:
+            index = self._index
+            if not self._is_current(index, snapshot):
+                index = build_index(snapshot, self.directory, self.dimensions, previous=index)
+                self._index = index
+                self.builds += 1
+        return index
+
+    def on_catalog_change(self, snapshot: CatalogSnapshot) -> None:
+        """
+        Catalog listener. Workers that never served similarity requests
+        don't build indexes.
+        """
+        if self._index is not None:
+            self.refresh(snapshot)
+
+    def stats(self) -> Dict:
+        index = self._index
+        return {
+            "generation": index.generation if index else None,
+            "models": len(index) if index else 0,
+            "dimensions": self.dimensions,
+            "builds": self.builds,
+            "rebuilding": self._worker is not None,
+            "last_reused": index.reused if index else 0,
+            "last_embedded": index.embedded if index else 0,
+        }
+
+
+similarity_index_cache = SimilarityIndexCache(settings.SIMILARITY_INDEX_DIR, settings.SIMILARITY_DIMENSIONS)
+catalog_cache.subscribe(similarity_index_cache.on_catalog_change)
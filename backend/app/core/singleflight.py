@@ -0,0 +1,97 @@
+"""
+Single-flight execution: concurrent calls with the same key share one run.
+
+The first caller for a key runs the computation; callers arriving while it
+is in flight wait for its result (or exception) instead of repeating the
+work. Sync callers (threadpool endpoints) block on the shared future and
+async callers await it, and either kind can lead for the other.
+"""
+import asyncio
+import threading
+from concurrent.futures import Future
+from typing import Awaitable, Callable, Dict, Hashable, Set, Tuple, TypeVar
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """
+    Deduplicates in-flight calls by key. Results are not kept once a call
+    completes; pair it with a cache for that.
+    """
+
+    def __init__(self):
+        self._calls: Dict[Hashable, Future] = {}
+        self._lock = threading.Lock()
+        # Strong references to running async calls
+        self._tasks: Set["asyncio.Task"] = set()
+        self.executed = 0
+        self.coalesced = 0
+
+    def _join(self, key: Hashable) -> Tuple[Future, bool]:
+        """
+        Return the in-flight future for key and whether the caller leads it.
+        """
+        with self._lock:
+            future = self._calls.get(key)
+            if future is not None:
+                self.coalesced += 1
+                return future, False
+            future = Future()
+            # A running future cannot be cancelled by a waiter
+            future.set_running_or_notify_cancel()
+            self._calls[key] = future
+            self.executed += 1
+            return future, True
+
+    def _finish(self, key: Hashable, future: Future) -> None:
+        with self._lock:
+            if self._calls.get(key) is future:
+                del self._calls[key]
+
+    def do(self, key: Hashable, fn: Callable[[], T]) -> T:
+        """
+        Run fn, or wait for the identical call already in flight.
+        """
+        future, leader = self._join(key)
+        if not leader:
+            return future.result()
+        try:
+            result = fn()
+        except BaseException as exc:
+            self._finish(key, future)
+            future.set_exception(exc)
+            raise
+        self._finish(key, future)
+        future.set_result(result)
+        return result
+
+    async def do_async(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        """
+        Await fn(), or the identical call already in flight. The call runs as
+        a detached task that every caller, the leader included, awaits through
+        a shield, so cancelling any caller does not cancel the shared call.
+        """
+        future, leader = self._join(key)
+        if leader:
+            task = asyncio.ensure_future(fn())
+            self._tasks.add(task)
+            task.add_done_callback(lambda task: self._settle(key, future, task))
+        return await asyncio.shield(asyncio.wrap_future(future))
+
+    def _settle(self, key: Hashable, future: Future, task: "asyncio.Task") -> None:
+        self._tasks.discard(task)
+        self._finish(key, future)
+        if task.cancelled():
+            future.set_exception(asyncio.CancelledError())
+        elif task.exception() is not None:
+            future.set_exception(task.exception())
+        else:
+            future.set_result(task.result())
+
+    def stats(self) -> Dict:
+        return {
+            "in_flight": len(self._calls),
+            "executed": self.executed,
+            "coalesced": self.coalesced,
+        }
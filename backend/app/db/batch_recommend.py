@@ -0,0 +1,51 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+import argparse
+import json
+from typing import Optional
+
+from sqlalchemy.orm import Session
+from app.core.batch import load_profiles, run_batch
+from app.db.session import SessionLocal
+from app.models.models import User
+
+def resolve_user_id(db: Session, email: Optional[str]) -> Optional[int]:
+    """Look up the user that will own the generated recommendations"""
+    if email is None:
+        return None
+    user = db.query(User).filter(User.email == email).first()
+    if not user:
+        raise SystemExit(f"User {email} not found")
+    return user.id
+
+def main() -> None:
+    """Score a JSON list or NDJSON file of requirement profiles and store the results"""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument("input", help="JSON array or NDJSON file of requirement dicts ('-' for stdin)")
+    parser.add_argument("--user-email", help="Owner of the recommendations (default: none)")
+    parser.add_argument("--chunk-size", type=int, default=None, help="Profiles per scoring chunk")
+    parser.add_argument("--workers", type=int, default=None, help="Scoring processes (default: one per CPU)")
+    args = parser.parse_args()
+    
+    try:
+        if args.input == "-":
+            text = sys.stdin.read()
+        else:
+            with open(args.input) as f:
+                text = f.read()
+        profiles = load_profiles(text)
+    except (OSError, ValueError) as exc:
+        raise SystemExit(f"Could not read {args.input}: {exc}")
+    
+    db = SessionLocal()
+    try:
+        user_id = resolve_user_id(db, args.user_email)
+        for record in run_batch(db, user_id, profiles, args.chunk_size, args.workers):
+            sys.stdout.write(json.dumps(record) + "\n")
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    main()
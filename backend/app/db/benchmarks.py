@@ -0,0 +1,147 @@
+"""
+Normalized benchmark scores, kept in sync with LLMModel.performance_benchmarks.
+
+Each numeric entry of a model's JSON blob is stored as a model_benchmarks row.
+Ranks and percentiles within a benchmark are recomputed in the database
+whenever its scores change, so a leaderboard page is a range scan of
+ix_model_benchmarks_benchmark_score with no JSON parsing.
+"""
+import math
+from typing import Any, Dict, Iterable, Optional, Set, Tuple
+
+from sqlalchemy import Float, Numeric, Select, and_, case, cast, delete, func, insert, or_, select, update
+from sqlalchemy.orm import Session
+
+from app.db.queries import SUMMARY_COLUMNS
+from app.models.models import LLMModel, ModelBenchmark
+
+
+def benchmark_scores(performance_benchmarks: Any) -> Dict[str, float]:
+    """
+    Extract the numeric scores of a performance_benchmarks blob. Other
+    entries (notes, nested objects) are not ranked.
+    """
+    if not isinstance(performance_benchmarks, dict):
+        return {}
+    return {
+        str(name): float(value)
+        for name, value in performance_benchmarks.items()
+        if isinstance(value, (int, float)) and not isinstance(value, bool) and math.isfinite(value)
+    }
+
+
+def rerank(db: Session, benchmarks: Iterable[str]) -> None:
+    """
+    Recompute ranks and percentiles of the given benchmarks with one UPDATE
+    per benchmark, ranked by window functions in the database. Tied scores
+    share the best rank; percentile is 100 for first place and 0 for last,
+    rounded to two decimals. Only rows whose rank or percentile changes are
+    written.
+    """
+    for benchmark in sorted(set(benchmarks)):
+        ranked = (
+            select(
+                ModelBenchmark.model_id,
+                func.rank().over(order_by=ModelBenchmark.score.desc()).label("rank"),
+                func.count().over().label("total"),
+            )
+            .where(ModelBenchmark.benchmark == benchmark)
+            .subquery()
+        )
+        percentile = case(
+            (
+                ranked.c.total > 1,
+                cast(func.round(cast(100.0 * (ranked.c.total - ranked.c.rank) / (ranked.c.total - 1), Numeric), 2), Float),
+            ),
+            else_=100.0,
+        )
+        db.execute(
+            update(ModelBenchmark)
+            .where(ModelBenchmark.benchmark == benchmark, ModelBenchmark.model_id == ranked.c.model_id)
+            .where(or_(ModelBenchmark.rank != ranked.c.rank, ModelBenchmark.percentile != percentile))
+            .values(rank=ranked.c.rank, percentile=percentile)
+            .execution_options(synchronize_session=False)
+        )
+
+
+def replace_benchmark_rows(db: Session, entries: Iterable[Tuple[int, Any]]) -> Set[str]:
+    """
+    Replace the benchmark rows of (model id, performance_benchmarks) entries
+    without re-ranking. Returns the benchmarks they had or have, which the
+    caller must rerank.
+    """
+    entries = list(entries)
+    model_ids = [model_id for model_id, _ in entries]
+    if not model_ids:
+        return set()
+
+    affected = set(db.scalars(
+        select(ModelBenchmark.benchmark).where(ModelBenchmark.model_id.in_(model_ids)).distinct()
+    ))
+    db.execute(delete(ModelBenchmark).where(ModelBenchmark.model_id.in_(model_ids)))
+
+    rows = [
+        {"model_id": model_id, "benchmark": benchmark, "score": score, "rank": 0, "percentile": 0.0}
+        for model_id, performance_benchmarks in entries
+        for benchmark, score in benchmark_scores(performance_benchmarks).items()
+    ]
+    if rows:
+        db.execute(insert(ModelBenchmark), rows)
+    affected.update(row["benchmark"] for row in rows)
+    return affected
+
+
+def sync_model_benchmarks(db: Session, models: Iterable[LLMModel]) -> Set[str]:
+    """
+    Replace the benchmark rows of models (which must have ids, i.e. be
+    flushed) from their JSON and re-rank every benchmark they had or have.
+    Returns the affected benchmarks. The caller owns the transaction.
+    """
+    models = list(models)
+    affected = replace_benchmark_rows(db, [(model.id, model.performance_benchmarks) for model in models])
+
+    # The rows were changed behind the ORM's back
+    for model in models:
+        db.expire(model, ["benchmarks"])
+
+    rerank(db, affected)
+    return affected
+
+
+def remove_model_benchmarks(db: Session, model_id: int) -> Set[str]:
+    """
+    Delete a model's benchmark rows and re-rank the benchmarks it was on.
+    """
+    affected = set(db.scalars(
+        delete(ModelBenchmark).where(ModelBenchmark.model_id == model_id).returning(ModelBenchmark.benchmark)
+    ))
+    rerank(db, affected)
+    return affected
+
+
+def leaderboard(
+    benchmark: str,
+    min_score: Optional[float] = None,
+    after: Optional[Tuple[float, int]] = None,
+    limit: int = 50,
+) -> Select:
+    """
+    One leaderboard page, best first, with the summary columns of each model.
+    after is the (score, model_id) of the last row of the previous page.
+    """
+    query = (
+        select(ModelBenchmark.score, ModelBenchmark.rank, ModelBenchmark.percentile, *SUMMARY_COLUMNS)
+        .join(LLMModel, LLMModel.id == ModelBenchmark.model_id)
+        .where(ModelBenchmark.benchmark == benchmark)
+        .order_by(ModelBenchmark.score.desc(), ModelBenchmark.model_id)
+        .limit(limit)
+    )
+    if min_score is not None:
+        query = query.where(ModelBenchmark.score >= min_score)
+    if after is not None:
+        score, model_id = after
+        query = query.where(or_(
+            ModelBenchmark.score < score,
+            and_(ModelBenchmark.score == score, ModelBenchmark.model_id > model_id),
+        ))
+    return query
@@ -0,0 +1,191 @@
+"""
+Bulk persistence helpers for recommendation history and the catalog.
+"""
+import csv
+import io
+import json
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import JSON, DateTime, Table, func, insert, literal_column, text
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from app.models.models import LLMModel, Recommendation, RecommendationItem
+
+# NULL marker of COPY rows, so that empty strings stay empty strings
+COPY_NULL = "\\N"
+
+# Conflict target of catalog upserts, the uq_llm_models_identity index
+MODEL_IDENTITY = (LLMModel.name, LLMModel.provider, func.coalesce(LLMModel.version, literal_column("''")))
+
+
+def bulk_create_recommendations(
+    db: Session,
+    user_id: Optional[int],
+    entries: Sequence[Tuple[Dict[str, Any], List[Dict]]],
+) -> List[int]:
+    """
+    Insert one recommendation per (requirements, scored results) entry, plus
+    its items, using two multi-row INSERTs. Returns the new recommendation ids
+    in entry order. The caller owns the transaction.
+    """
+    if not entries:
+        return []
+
+    recommendation_ids = db.scalars(
+        insert(Recommendation).returning(Recommendation.id, sort_by_parameter_order=True),
+        [{"user_id": user_id, "requirements": requirements} for requirements, _ in entries],
+    ).all()
+
+    items = [
+        {
+            "recommendation_id": recommendation_id,
+            "model_id": result["model_id"],
+            "score": result["score"],
+            "reasoning": result["reasoning"],
+        }
+        for recommendation_id, (_, results) in zip(recommendation_ids, entries)
+        for result in results
+    ]
+    if items:
+        db.execute(insert(RecommendationItem), items)
+
+    return list(recommendation_ids)
+
+
+def insert_recommendation(
+    db: Session,
+    user_id: Optional[int],
+    requirements: Dict[str, Any],
+    results: List[Dict],
+) -> Tuple[int, datetime, List[int]]:
+    """
+    Insert a recommendation and its items with ``INSERT ... RETURNING``.
+    Returns the recommendation id, its created_at and the item ids in result
+    order. The caller owns the transaction.
+    """
+    recommendation_id, created_at = db.execute(
+        insert(Recommendation)
+        .values(user_id=user_id, requirements=requirements)
+        .returning(Recommendation.id, Recommendation.created_at)
+    ).one()
+
+    item_ids: List[int] = []
+    if results:
+        item_ids = list(db.scalars(
+            insert(RecommendationItem).returning(RecommendationItem.id, sort_by_parameter_order=True),
+            [
+                {
+                    "recommendation_id": recommendation_id,
+                    "model_id": result["model_id"],
+                    "score": result["score"],
+                    "reasoning": result["reasoning"],
+                }
+                for result in results
+            ],
+        ).all())
+
+    return recommendation_id, created_at, item_ids
+
+
+def upsert_models(db: Session, rows: Sequence[Dict[str, Any]]) -> List[Tuple[int, Any]]:
+    """
+    Insert or update catalog rows (LLMModelCreate dumps, with distinct
+    identities) in one INSERT ... ON CONFLICT on (name, provider, version).
+    Returns (id, performance_benchmarks) of every row. The caller owns the
+    transaction.
+    """
+    if not rows:
+        return []
+
+    dialect = postgresql if db.get_bind().dialect.name == "postgresql" else sqlite
+    statement = dialect.insert(LLMModel).values(list(rows))
+    updates = {
+        key: statement.excluded[key]
+        for key in rows[0]
+        if key not in ("name", "provider", "version")
+    }
+    updates["updated_at"] = func.now()
+    statement = statement.on_conflict_do_update(index_elements=MODEL_IDENTITY, set_=updates)
+    return db.execute(statement.returning(LLMModel.id, LLMModel.performance_benchmarks)).all()
+
+
+def _sqlite_datetime(value: datetime) -> str:
+    return value.strftime("%Y-%m-%d %H:%M:%S.%f")
+
+
+def _encoders(table: Table, columns: Sequence[str], dialect: str) -> List[Optional[Callable[[Any], Any]]]:
+    """
+    Per column, the function turning a Python value into what the driver
+    stores (None where the driver takes the value as is).
+    """
+    encoders: List[Optional[Callable[[Any], Any]]] = []
+    for name in columns:
+        column_type = table.c[name].type
+        if isinstance(column_type, JSON):
+            encoders.append(json.dumps)
+        elif isinstance(column_type, DateTime):
+            encoders.append(datetime.isoformat if dialect == "postgresql" else _sqlite_datetime)
+        else:
+            encoders.append(None)
+    return encoders
+
+
+def _encode(rows: Iterable[Sequence[Any]], encoders: Sequence[Optional[Callable[[Any], Any]]]) -> Iterable[Sequence[Any]]:
+    if not any(encoders):
+        return rows
+    return (
+        tuple(value if encoder is None or value is None else encoder(value) for value, encoder in zip(row, encoders))
+        for row in rows
+    )
+
+
+def copy_rows(db: Session, table: Table, columns: Sequence[str], rows: Iterable[Sequence[Any]]) -> int:
+    """
+    Append rows (tuples in columns order, JSON columns as dicts or lists) to
+    table with COPY on Postgres and an executemany INSERT on SQLite. Rows
+    with explicit ids do not advance Postgres sequences; see reset_sequence.
+    Returns the number of rows. The caller owns the transaction.
+    """
+    dialect = db.get_bind().dialect.name
+    rows = _encode(rows, _encoders(table, columns, dialect))
+
+    if dialect == "postgresql":
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        count = 0
+        for row in rows:
+            writer.writerow([COPY_NULL if value is None else value for value in row])
+            count += 1
+        buffer.seek(0)
+        cursor = db.connection().connection.cursor()
+        try:
+            cursor.copy_expert(
+                f"COPY {table.name} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv, NULL '{COPY_NULL}')",
+                buffer,
+            )
+        finally:
+            cursor.close()
+        return count
+
+    # Raw driver executemany (SQLite's qmark style), skipping SQLAlchemy's
+    # per-row bind processing
+    parameters = list(rows)
+    if parameters:
+        db.connection().exec_driver_sql(
+            f"INSERT INTO {table.name} ({', '.join(columns)}) VALUES ({', '.join('?' for _ in columns)})",
+            parameters,
+        )
+    return len(parameters)
+
+
+def reset_sequence(db: Session, table: Table) -> None:
+    """
+    Move a Postgres id sequence past the ids copied into table.
+    """
+    if db.get_bind().dialect.name == "postgresql":
+        db.execute(text(
+            f"SELECT setval(pg_get_serial_sequence('{table.name}', 'id'), "
+            f"(SELECT coalesce(max(id), 0) + 1 FROM {table.name}), false)"
+        ))
@@ -0,0 +1,53 @@
+"""
+Queries behind the streaming exports, one flat row per exported record.
+
+Recommendation exports have one row per recommendation item, so that CSV
+and NDJSON carry the same columns; a recommendation without items gets one
+row with empty item columns.
+"""
+from typing import Optional
+
+from sqlalchemy import Select, select
+
+from app.models.models import LLMModel, Recommendation, RecommendationItem
+
+# Every column of llm_models, in table order
+MODEL_EXPORT_COLUMNS = tuple(LLMModel.__table__.columns)
+
+RECOMMENDATION_EXPORT_COLUMNS = (
+    Recommendation.id.label("recommendation_id"),
+    Recommendation.user_id,
+    Recommendation.created_at,
+    Recommendation.requirements,
+    RecommendationItem.id.label("item_id"),
+    RecommendationItem.model_id,
+    LLMModel.name.label("model_name"),
+    LLMModel.provider.label("model_provider"),
+    RecommendationItem.score,
+    RecommendationItem.reasoning,
+)
+
+
+def model_export() -> Select:
+    """
+    The whole catalog in id order.
+    """
+    return select(*MODEL_EXPORT_COLUMNS).order_by(LLMModel.id)
+
+
+def recommendation_export(user_id: Optional[int] = None) -> Select:
+    """
+    Recommendation items of one user (oldest first, along the history index)
+    or of every user (in id order).
+    """
+    query = (
+        select(*RECOMMENDATION_EXPORT_COLUMNS)
+        .select_from(Recommendation)
+        .outerjoin(RecommendationItem, RecommendationItem.recommendation_id == Recommendation.id)
+        .outerjoin(LLMModel, LLMModel.id == RecommendationItem.model_id)
+    )
+    if user_id is None:
+        return query.order_by(Recommendation.id, RecommendationItem.id)
+    return query.where(Recommendation.user_id == user_id).order_by(
+        Recommendation.created_at, Recommendation.id, RecommendationItem.id
+    )
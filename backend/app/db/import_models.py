@@ -0,0 +1,37 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+import argparse
+import io
+import json
+
+from app.core.catalog_import import IMPORT_FORMATS, import_stream
+from app.db.session import SessionLocal
+
+def main() -> None:
+    """Upsert catalog models from an NDJSON or CSV file and print a summary"""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument("input", help="NDJSON or CSV file of models ('-' for stdin)")
+    parser.add_argument("--format", choices=IMPORT_FORMATS, help="Input format (default: from the file extension)")
+    parser.add_argument("--batch-size", type=int, default=None, help="Rows per upsert statement")
+    args = parser.parse_args()
+
+    import_format = args.format or ("csv" if args.input.lower().endswith(".csv") else "ndjson")
+    if args.input == "-":
+        lines = io.TextIOWrapper(sys.stdin.buffer, encoding="utf-8-sig", errors="replace", newline="")
+    else:
+        lines = open(args.input, encoding="utf-8-sig", errors="replace", newline="")
+
+    db = SessionLocal()
+    try:
+        result = import_stream(db, lines, import_format, args.batch_size)
+    finally:
+        db.close()
+        lines.close()
+    sys.stdout.write(json.dumps(result, indent=2) + "\n")
+    if result["error_count"]:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+"""
+Connection pool configuration, instrumentation and warm-up.
+
+The pool classes below time every checkout, so per-worker pools can be sized
+from observed wait times instead of guesses.
+"""
+import asyncio
+import threading
+import time
+from typing import Any, Dict
+
+from sqlalchemy import exc
+from sqlalchemy.engine import URL, Engine
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+from app.core.config import settings
+
+
+class PoolMetrics:
+    """
+    Checkout counters and wait times for one pool.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+
+    def record(self, waited: float, timed_out: bool = False) -> None:
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+            else:
+                self.checkouts += 1
+            self.wait_seconds_total += waited
+            self.wait_seconds_max = max(self.wait_seconds_max, waited)
+
+
+class _TimedCheckout:
+    """
+    Mixin timing how long each checkout waits for a connection (including
+    opening a new one when the pool has room).
+    """
+
+    def __init__(self, *args: Any, max_overflow: int = 10, **kwargs: Any) -> None:
+        super().__init__(*args, max_overflow=max_overflow, **kwargs)
+        # QueuePool only keeps this privately
+        self.max_overflow = max_overflow
+        self.metrics = PoolMetrics()
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except exc.TimeoutError:
+            self.metrics.record(time.perf_counter() - started, timed_out=True)
+            raise
+        self.metrics.record(time.perf_counter() - started)
+        return connection
+
+
+class InstrumentedQueuePool(_TimedCheckout, QueuePool):
+    pass
+
+
+class InstrumentedAsyncQueuePool(_TimedCheckout, AsyncAdaptedQueuePool):
+    pass
+
+
+def pool_options(url: URL, is_async: bool = False) -> Dict[str, Any]:
+    """
+    create_engine keyword arguments for the configured pool. In-memory SQLite
+    keeps SQLAlchemy's default single-connection pool.
+    """
+    if url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:"):
+        return {}
+    return {
+        "poolclass": InstrumentedAsyncQueuePool if is_async else InstrumentedQueuePool,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+
+
+def pool_stats(engine: Engine) -> Dict[str, Any]:
+    """
+    Current occupancy and checkout wait statistics of an engine's pool.
+    """
+    pool = engine.pool
+    stats: Dict[str, Any] = {"class": type(pool).__name__, "status": pool.status()}
+    if isinstance(pool, QueuePool):
+        stats.update(
+            size=pool.size(),
+            checked_in=pool.checkedin(),
+            checked_out=pool.checkedout(),
+            overflow=max(pool.overflow(), 0),
+            timeout_seconds=pool.timeout(),
+        )
+        if isinstance(pool, _TimedCheckout):
+            stats["max_overflow"] = pool.max_overflow
+    metrics = getattr(pool, "metrics", None)
+    if metrics is not None:
+        stats.update(
+            checkouts=metrics.checkouts,
+            timeouts=metrics.timeouts,
+            wait_ms_total=round(metrics.wait_seconds_total * 1000, 3),
+            wait_ms_avg=round(metrics.wait_seconds_total * 1000 / max(metrics.checkouts, 1), 3),
+            wait_ms_max=round(metrics.wait_seconds_max * 1000, 3),
+        )
+    return stats
+
+
+def warm_up(engine: Engine, connections: int) -> None:
+    """
+    Open connections up front so the first requests don't pay for them.
+    """
+    opened = []
+    try:
+        for _ in range(connections):
+            opened.append(engine.connect())
+    finally:
+        for connection in opened:
+            connection.close()
+
+
+async def warm_up_async(engine: AsyncEngine, connections: int) -> None:
+    """
+    Async variant of warm_up. If a connection fails, the ones that opened
+    are returned to the pool before the error is raised.
+    """
+    results = await asyncio.gather(
+        *(engine.connect().start() for _ in range(connections)), return_exceptions=True
+    )
+    opened = [result for result in results if not isinstance(result, BaseException)]
+    await asyncio.gather(*(connection.close() for connection in opened))
+    for result in results:
+        if isinstance(result, BaseException):
+            raise result
@@ -0,0 +1,63 @@
+"""
+Shared queries for endpoints whose responses nest LLM models.
+
+Relationships are loaded with ``selectinload`` chains so that serializing a
+page costs a fixed number of queries, whatever the page size. The statements
+run unchanged on sync (``db.scalars``) and async (``await db.scalars``)
+sessions. With ``summary=True`` the nested models load only the columns of
+LLMModelSummary.
+"""
+from sqlalchemy import Select, select
+from sqlalchemy.orm import selectinload
+
+from app.models.models import LLMModel, Recommendation, RecommendationItem, SavedModel
+
+# Columns of LLMModelSummary
+SUMMARY_COLUMNS = (
+    LLMModel.id,
+    LLMModel.name,
+    LLMModel.provider,
+    LLMModel.parameters,
+    LLMModel.license_type,
+)
+
+# Loader options matching RecommendationResponse and SavedModelResponse
+RECOMMENDATION_ITEMS = selectinload(Recommendation.items).selectinload(RecommendationItem.model)
+SAVED_MODEL = selectinload(SavedModel.model)
+
+# Loader options matching the summary response variants
+RECOMMENDATION_ITEMS_SUMMARY = (
+    selectinload(Recommendation.items)
+    .selectinload(RecommendationItem.model)
+    .load_only(*SUMMARY_COLUMNS)
+)
+SAVED_MODEL_SUMMARY = selectinload(SavedModel.model).load_only(*SUMMARY_COLUMNS)
+
+
+def user_recommendations(user_id: int, summary: bool = False) -> Select:
+    """
+    A user's recommendation history, newest first, with items and models.
+    """
+    items = RECOMMENDATION_ITEMS_SUMMARY if summary else RECOMMENDATION_ITEMS
+    return select(Recommendation).options(items).where(
+        Recommendation.user_id == user_id
+    ).order_by(Recommendation.created_at.desc(), Recommendation.id.desc())
+
+
+def user_recommendation(user_id: int, recommendation_id: int, summary: bool = False) -> Select:
+    """
+    One of a user's recommendations with items and models.
+    """
+    items = RECOMMENDATION_ITEMS_SUMMARY if summary else RECOMMENDATION_ITEMS
+    return select(Recommendation).options(items).where(
+        Recommendation.id == recommendation_id,
+        Recommendation.user_id == user_id,
+    )
+
+
+def user_saved_models(user_id: int, summary: bool = False) -> Select:
+    """
+    A user's saved models with the models loaded.
+    """
+    model = SAVED_MODEL_SUMMARY if summary else SAVED_MODEL
+    return select(SavedModel).options(model).where(SavedModel.user_id == user_id)
@@ -0,0 +1,74 @@
+"""
+Per-request SQL query counting.
+
+A counter is bound to the current context (request) and every statement the
+engine executes while it is active increments it. Worker threads started with
+a copy of the context share the same counter object.
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+
+class QueryCounter:
+    def __init__(self) -> None:
+        self.count = 0
+
+
+_current: ContextVar[Optional[QueryCounter]] = ContextVar("query_counter", default=None)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    counter = _current.get()
+    if counter is not None:
+        counter.count += 1
+
+
+def install(engine: Engine) -> None:
+    """
+    Count statements executed through engine.
+    """
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+
+
+@contextmanager
+def count_queries() -> Iterator[QueryCounter]:
+    """
+    Count the queries executed inside the block.
+    """
+    counter = QueryCounter()
+    token = _current.set(counter)
+    try:
+        yield counter
+    finally:
+        _current.reset(token)
+
+
+class QueryCountMiddleware:
+    """
+    Add an X-Query-Count header with the queries a request executed before its
+    response started. A plain ASGI middleware: receive is passed through
+    untouched, so endpoints can keep reading a streamed body while responding.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        with count_queries() as counter:
+            async def send_with_count(message: Message) -> None:
+                if message["type"] == "http.response.start":
+                    MutableHeaders(scope=message)["X-Query-Count"] = str(counter.count)
+                await send(message)
+
+            await self.app(scope, receive, send_with_count)
@@ -0,0 +1,100 @@
+"""
+Postgres full-text search over llm_models.
+
+Backed by the generated ``search_vector`` tsvector column and its GIN index
+(migration 003_model_search_tsvector). The column is not mapped on the ORM
+model because other databases don't have it, and a Postgres database built
+with ``create_all`` instead of the migrations doesn't either; callers check
+``search_vector_available`` first.
+"""
+import html
+import logging
+from typing import Dict
+
+from sqlalchemy import Select, func, literal_column, select, text
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.models import LLMModel
+
+logger = logging.getLogger(__name__)
+
+# Text search configuration used by the generated column
+SEARCH_CONFIG = "english"
+
+# Headlines mark matches with control characters, stripped from the source
+# text, so the text can be HTML-escaped before they become <mark> tags
+MARK_START = "\x02"
+MARK_STOP = "\x03"
+HEADLINE_OPTIONS = f'StartSel="{MARK_START}", StopSel="{MARK_STOP}", MaxWords=30, MinWords=10, MaxFragments=1'
+
+SEARCH_VECTOR = literal_column("llm_models.search_vector", type_=TSVECTOR)
+
+# Fields returned as highlights, in the same order as the in-process index
+HIGHLIGHT_FIELDS = {
+    "name": LLMModel.name,
+    "strengths": LLMModel.strengths,
+    "description": LLMModel.description,
+    "weaknesses": LLMModel.weaknesses,
+}
+
+
+def model_search(query: str, limit: int, offset: int = 0) -> Select:
+    """
+    Ranked matches for a web-style query (quoted phrases, OR, -exclusions):
+    model id, score, total number of matches and one headline per field.
+    """
+    tsquery = func.websearch_to_tsquery(SEARCH_CONFIG, query)
+    # Normalization 32 scales rank into [0, 1)
+    rank = func.ts_rank_cd(SEARCH_VECTOR, tsquery, 32)
+    headlines = [
+        func.ts_headline(SEARCH_CONFIG, _strip_marks(func.coalesce(column, "")), tsquery, HEADLINE_OPTIONS).label(field)
+        for field, column in HIGHLIGHT_FIELDS.items()
+    ]
+    return (
+        select(LLMModel.id, rank.label("score"), func.count().over().label("total"), *headlines)
+        .where(SEARCH_VECTOR.op("@@")(tsquery))
+        .order_by(rank.desc(), LLMModel.id)
+        .limit(limit)
+        .offset(offset)
+    )
+
+
+def model_search_count(query: str) -> Select:
+    """
+    Number of models matching a query, for pages past the last match.
+    """
+    tsquery = func.websearch_to_tsquery(SEARCH_CONFIG, query)
+    return select(func.count()).select_from(LLMModel).where(SEARCH_VECTOR.op("@@")(tsquery))
+
+
+def render_headline(headline: str) -> str:
+    """
+    HTML-escape a headline and turn its match markers into <mark> tags.
+    """
+    return html.escape(headline).replace(MARK_START, "<mark>").replace(MARK_STOP, "</mark>")
+
+
+# Whether the search_vector column exists, by database URL
+_available: Dict[str, bool] = {}
+
+
+async def search_vector_available(db: AsyncSession) -> bool:
+    """
+    Whether llm_models has the search_vector column, checked once per database.
+    """
+    key = str(db.bind.url)
+    if key not in _available:
+        found = await db.scalar(text(
+            "SELECT 1 FROM information_schema.columns "
+            "WHERE table_schema = current_schema() AND table_name = 'llm_models' "
+            "AND column_name = 'search_vector'"
+        ))
+        if not found:
+            logger.warning("llm_models.search_vector is missing (migration 003 not applied); using in-process search")
+        _available[key] = bool(found)
+    return _available[key]
+
+
+def _strip_marks(column):
+    return func.replace(func.replace(column, MARK_START, ""), MARK_STOP, "")
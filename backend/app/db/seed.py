@@ -2,8 +2,13 @@ import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+import argparse
+import time
+
 from sqlalchemy.orm import Session
+from app.db.benchmarks import sync_model_benchmarks
 from app.db.session import SessionLocal
+from app.db.synthetic import SyntheticConfig, load_synthetic
 from app.models.models import User, LLMModel
 from app.core.security import get_password_hash
 
@@ -234,17 +239,46 @@ def create_sample_models(db: Session) -> None:
         for model in models:
             db.add(model)
         
+        db.flush()
+        sync_model_benchmarks(db, models)
         db.commit()
         print(f"Added {len(models)} sample LLM models")
     else:
         print(f"Database already contains {model_count} models")
 
+def create_synthetic_data(db: Session, config: SyntheticConfig) -> None:
+    """Bulk-load a deterministic synthetic dataset"""
+    started = time.perf_counter()
+    counts = load_synthetic(db, config)
+    summary = ", ".join(f"{count} {name}" for name, count in counts.items())
+    print(f"Added synthetic data in {time.perf_counter() - started:.1f}s: {summary}")
+
 def main() -> None:
-    """Seed the database with initial data"""
+    """Seed the database with initial data, optionally with a synthetic dataset for load tests"""
+    defaults = SyntheticConfig()
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument("--synthetic", action="store_true", help="Also load a synthetic dataset")
+    parser.add_argument("--seed", type=int, default=defaults.seed, help="Random seed of the synthetic dataset")
+    parser.add_argument("--models", type=int, default=defaults.models, help="Synthetic models")
+    parser.add_argument("--users", type=int, default=defaults.users, help="Synthetic users")
+    parser.add_argument("--saved-per-user", type=float, default=defaults.saved_per_user, help="Mean saved models per user")
+    parser.add_argument("--recommendations", type=int, default=defaults.recommendations, help="Synthetic recommendations")
+    parser.add_argument("--items-per-recommendation", type=int, default=defaults.items_per_recommendation, help="Items per recommendation")
+    args = parser.parse_args()
+
     db = SessionLocal()
     try:
         create_admin_user(db)
         create_sample_models(db)
+        if args.synthetic:
+            create_synthetic_data(db, SyntheticConfig(
+                seed=args.seed,
+                models=args.models,
+                users=args.users,
+                saved_per_user=args.saved_per_user,
+                recommendations=args.recommendations,
+                items_per_recommendation=args.items_per_recommendation,
+            ))
         print("Database seeding completed")
     finally:
         db.close()
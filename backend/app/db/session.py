@@ -1,13 +1,49 @@
 from sqlalchemy import create_engine
+from sqlalchemy.engine import URL, make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.orm import declarative_base  # Use this instead of deprecated import
 from app.core.config import settings
+from app.db import query_counter
+from app.db.pool import pool_options
 
-# Create database engine
-engine = create_engine(settings.DATABASE_URL)
+# Async driver used for each database backend
+ASYNC_DRIVERS = {"postgresql": "asyncpg", "sqlite": "aiosqlite"}
 
-# Create session factory
+def sync_database_url(url: str) -> URL:
+    """
+    Return the blocking-driver variant of a database URL.
+    """
+    parsed = make_url(url)
+    if parsed.get_driver_name() == ASYNC_DRIVERS.get(parsed.get_backend_name()):
+        parsed = parsed.set(drivername=parsed.get_backend_name())
+    return parsed
+
+def async_database_url(url: str) -> URL:
+    """
+    Return the async-driver variant of a database URL.
+    """
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f"No async driver configured for {backend} URLs")
+    return parsed.set(drivername=f"{backend}+{ASYNC_DRIVERS[backend]}")
+
+# Create database engines. DATABASE_URL may name either driver, e.g.
+# postgresql:// or postgresql+asyncpg://, sqlite:// or sqlite+aiosqlite://
+_sync_url = sync_database_url(settings.DATABASE_URL)
+engine = create_engine(_sync_url, **pool_options(_sync_url))
+query_counter.install(engine)
+
+_async_url = async_database_url(settings.DATABASE_URL)
+async_engine = create_async_engine(_async_url, **pool_options(_async_url, is_async=True))
+query_counter.install(async_engine.sync_engine)
+
+# Create session factories
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine, autoflush=False, expire_on_commit=False, class_=AsyncSession
+)
 
 # Create base class for models
 Base = declarative_base()
@@ -19,3 +55,8 @@ def get_db():
         yield db
     finally:
         db.close()
+
+# Async database session dependency
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
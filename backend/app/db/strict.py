@@ -0,0 +1,82 @@
+"""
+Hard constraints of a requirements dict as SQL predicates, for strict matching.
+
+In strict mode a license preference other than "any", a size preference and
+specific languages exclude the models that do not meet them, rather than
+only scoring them lower. The predicates are served by the indexes of
+migration 006_strict_matching_indexes, so only surviving candidates are read
+from the database and scored.
+"""
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import Select, Text, cast, false, func, select
+from sqlalchemy.dialects.postgresql import JSONB
+
+from app.models.models import LLMModel
+
+# Size preference -> (exclusive lower, inclusive upper) bound on parameters,
+# matching the buckets of the scoring engine (zero counts as unknown)
+SIZE_RANGES = {
+    "small": (None, 5),
+    "medium": (5, 20),
+    "large": (20, 100),
+    "xlarge": (100, None),
+}
+
+# Case-insensitive view of supported_languages, the expression of the
+# ix_llm_models_supported_languages GIN index on Postgres
+LANGUAGES_LOWER = cast(func.lower(cast(LLMModel.supported_languages, Text)), JSONB)
+
+
+def _languages_predicates(languages: List[str], dialect: str) -> List:
+    if dialect == "postgresql":
+        return [LANGUAGES_LOWER.contains(languages)]
+    # Elsewhere, one EXISTS over the array elements per language
+    predicates = []
+    for lang in languages:
+        elements = func.json_each(LLMModel.supported_languages).table_valued("value")
+        predicates.append(select(elements.c.value).where(func.lower(elements.c.value) == lang).exists())
+    return predicates
+
+
+def strict_predicates(requirements: Dict[str, Any], dialect: str) -> List:
+    """
+    WHERE clauses for the hard constraints in requirements; empty if there
+    are none. A constraint no model can meet becomes FALSE.
+    """
+    predicates = []
+
+    license_pref = requirements.get("license_preference", "any")
+    if license_pref is None:
+        predicates.append(LLMModel.license_type.is_(None))
+    elif not isinstance(license_pref, str):
+        predicates.append(false())
+    elif license_pref != "any":
+        predicates.append(LLMModel.license_type == license_pref)
+
+    size_pref = requirements.get("size_preference")
+    if isinstance(size_pref, str) and size_pref in SIZE_RANGES:
+        lower, upper = SIZE_RANGES[size_pref]
+        predicates.append(LLMModel.parameters != 0 if lower is None else LLMModel.parameters > lower)
+        if upper is not None:
+            predicates.append(LLMModel.parameters <= upper)
+
+    if requirements.get("language_support") == "specific" and "specific_languages" in requirements:
+        languages = requirements["specific_languages"]
+        if not isinstance(languages, (list, tuple)) or not all(isinstance(lang, str) for lang in languages):
+            predicates.append(false())
+        elif languages:
+            predicates.extend(_languages_predicates(sorted({lang.lower() for lang in languages}), dialect))
+
+    return predicates
+
+
+def strict_candidates(requirements: Dict[str, Any], dialect: str) -> Optional[Select]:
+    """
+    Ids of the models meeting the hard constraints in requirements, or None
+    if there are no hard constraints.
+    """
+    predicates = strict_predicates(requirements, dialect)
+    if not predicates:
+        return None
+    return select(LLMModel.id).where(*predicates)
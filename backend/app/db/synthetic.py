@@ -0,0 +1,542 @@
+"""
+Deterministic synthetic datasets for load tests and benchmarks.
+
+Generates a catalog of models, users, saved models and recommendation
+histories with realistic shapes: long-tailed providers and model popularity,
+parameter counts clustered on common sizes, English-heavy language lists,
+benchmark scores correlated with size, and free text of varying length.
+
+Rows are generated in fixed chunks of GENERATION_CHUNK, each from its own
+random stream seeded by (seed, table, chunk), so the same seed and counts
+always give the same data when loaded into the same database state. Each
+chunk is bulk-loaded with copy_rows (COPY on Postgres, executemany on
+SQLite) and committed, so memory stays flat at any size; 100k models and
+10M recommendation items is the intended upper end.
+"""
+import math
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterator, List, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.core.catalog import catalog_cache
+from app.core.security import get_password_hash
+from app.db.benchmarks import rerank
+from app.db.bulk import copy_rows, reset_sequence
+from app.models.models import (
+    LLMModel,
+    ModelBenchmark,
+    Recommendation,
+    RecommendationItem,
+    SavedModel,
+    User,
+)
+
+GENERATION_CHUNK = 10000
+
+# Redraws of a repeated pick before drawing from the unused items only
+REDRAW_ROUNDS = 8
+
+# Histories end at a fixed instant so that datasets do not depend on the clock
+HISTORY_END = datetime(2025, 1, 1, tzinfo=timezone.utc)
+HISTORY_DAYS = 365
+
+SYNTHETIC_PASSWORD = "password"
+
+# Random stream per table
+MODELS, USERS, SAVED_MODELS, RECOMMENDATIONS = range(4)
+
+# (provider, weight, model families, share of open-source releases)
+PROVIDERS = (
+    ("Meta", 10, ("Llama", "Code Llama"), 0.95),
+    ("OpenAI", 8, ("GPT", "o"), 0.05),
+    ("Google", 8, ("Gemini", "Gemma", "PaLM"), 0.4),
+    ("Mistral AI", 7, ("Mistral", "Mixtral", "Codestral"), 0.6),
+    ("Anthropic", 6, ("Claude",), 0.0),
+    ("Alibaba", 6, ("Qwen", "Qwen-Coder"), 0.9),
+    ("Microsoft", 5, ("Phi", "Orca"), 0.9),
+    ("DeepSeek", 4, ("DeepSeek", "DeepSeek-Coder"), 0.9),
+    ("Cohere", 3, ("Command", "Aya"), 0.3),
+    ("AI21 Labs", 2, ("Jamba", "Jurassic"), 0.3),
+    ("TII", 2, ("Falcon",), 1.0),
+    ("EleutherAI", 2, ("Pythia", "GPT-NeoX"), 1.0),
+    ("NVIDIA", 2, ("Nemotron",), 0.7),
+    ("01.AI", 2, ("Yi",), 0.9),
+    ("Stability AI", 1, ("StableLM",), 0.9),
+    ("Databricks", 1, ("DBRX",), 1.0),
+    ("BigScience", 1, ("BLOOM",), 1.0),
+)
+# Share of models from the long tail of community fine-tuners
+COMMUNITY_SHARE = 0.4
+COMMUNITY_ORGS = 5000
+COMMUNITY_SUFFIXES = ("Instruct", "Chat", "Coder", "Uncensored", "DPO", "GGUF", "AWQ", "Merge")
+
+# Common parameter counts (billions) and their relative frequency
+COMMON_SIZES = (
+    (0.5, 2), (1.1, 3), (1.5, 3), (2, 3), (3, 5), (7, 20), (8, 14), (9, 4), (13, 10), (14, 6),
+    (22, 2), (27, 3), (32, 3), (34, 4), (40, 2), (46.7, 3), (70, 9), (72, 3), (110, 1),
+    (141, 1), (175, 1), (180, 1), (340, 1), (405, 1), (1500, 0.5),
+)
+
+# (language, relative frequency in supported_languages)
+LANGUAGES = (
+    ("Spanish", 60), ("French", 60), ("German", 58), ("Chinese", 50), ("Japanese", 42),
+    ("Portuguese", 42), ("Italian", 40), ("Russian", 35), ("Korean", 30), ("Arabic", 25),
+    ("Dutch", 22), ("Hindi", 20), ("Polish", 15), ("Turkish", 15), ("Vietnamese", 12),
+    ("Indonesian", 12), ("Swedish", 10), ("Czech", 8), ("Greek", 7), ("Hebrew", 7),
+    ("Thai", 7), ("Ukrainian", 7), ("Romanian", 6), ("Danish", 6), ("Finnish", 5),
+    ("Hungarian", 5), ("Norwegian", 5), ("Bengali", 4), ("Swahili", 3), ("Tamil", 3),
+)
+
+# (benchmark, share of models reporting it, score at quality 0, gain at quality 1, noise)
+BENCHMARKS = (
+    ("MMLU", 0.95, 25.0, 65.0, 4.0),
+    ("HellaSwag", 0.8, 45.0, 52.0, 3.0),
+    ("TruthfulQA", 0.7, 30.0, 50.0, 5.0),
+    ("GSM8K", 0.75, 2.0, 93.0, 7.0),
+    ("ARC", 0.6, 30.0, 65.0, 4.0),
+    ("HumanEval", 0.5, 0.0, 90.0, 8.0),
+    ("MBPP", 0.3, 5.0, 80.0, 8.0),
+    ("MT-Bench", 0.25, 20.0, 75.0, 6.0),
+)
+
+DESCRIPTION_SENTENCES = (
+    "General-purpose language model tuned to follow instructions.",
+    "Decoder-only transformer trained with grouped-query attention and a long context window.",
+    "Sparse mixture-of-experts architecture that activates a fraction of its weights per token.",
+    "Distilled from a larger teacher model to reduce inference cost.",
+    "Fine-tuned with reinforcement learning from human feedback for helpful dialogue.",
+    "Released with base and instruction-tuned checkpoints.",
+    "Optimized for low latency serving on commodity accelerators.",
+    "Supports tool use, structured outputs and function calling.",
+    "Trained with a curriculum that emphasizes reasoning and mathematics.",
+    "Quantization-friendly weights with published 4-bit and 8-bit variants.",
+)
+TRAINING_SENTENCES = (
+    "Trained on filtered web text, books and encyclopedic sources.",
+    "Pretraining data includes public code repositories.",
+    "Includes synthetic instruction data generated by larger models.",
+    "Multilingual corpus with a majority of English text.",
+    "Knowledge cutoff in late 2023.",
+    "Deduplicated with near-duplicate detection and quality classifiers.",
+)
+# Phrases carry the keywords the scoring engine matches on
+STRENGTH_PHRASES = (
+    "Strong code generation and debugging.",
+    "Natural, conversational chat.",
+    "Reliable summarization of long documents.",
+    "Accurate question answering over provided context.",
+    "High-quality translation between major languages.",
+    "Fluent text generation and creative writing.",
+    "Good reasoning for its size.",
+    "Efficient inference with a small memory footprint.",
+)
+WEAKNESS_PHRASES = (
+    "May hallucinate facts on niche topics.",
+    "Weaker at multi-step mathematics.",
+    "Limited context window compared to frontier models.",
+    "Knowledge cutoff limits awareness of recent events.",
+    "Requires fine-tuning for specialized domains.",
+    "Verbose answers without careful prompting.",
+)
+HARDWARE_OPTIONS = (
+    ("Available through API only.", 0.3),
+    ("Available through API. Local deployment requires multiple high-end GPUs.", 0.2),
+    ("Runs locally on a single consumer GPU with 24GB of VRAM.", 0.25),
+    ("Runs locally on laptops and edge devices when quantized.", 0.15),
+    ("Self-hosted local deployment on a GPU server; also available through a cloud API.", 0.1),
+)
+PRICING_OPTIONS = (
+    ("Free for research and commercial use.", 0.3),
+    ("Free weights; hosted inference with low cost per token.", 0.15),
+    ("Low cost per token with volume discounts.", 0.15),
+    ("Pay-per-token pricing at a medium cost tier.", 0.15),
+    ("Pay-per-token pricing with enterprise plans available.", 0.15),
+    ("Premium pricing; enterprise licensing required.", 0.05),
+    (None, 0.05),
+)
+NOTES = (
+    "Shortlist for the support bot.",
+    "Benchmark against our current model.",
+    "Cheap enough for batch jobs.",
+    "Check license terms with legal.",
+    "Try a quantized build locally.",
+)
+REASONING_SENTENCES = (
+    "Excellent for text generation tasks",
+    "Specialized in code generation",
+    "Designed for conversational interactions",
+    "Effective at text summarization",
+    "Medium model size as preferred",
+    "Open source license as preferred",
+    "Low cost option",
+    "Supports English as required",
+    "Suitable for local deployment",
+    "Available as cloud API",
+)
+
+# Requirement answers and their frequencies, per question
+REQUIREMENT_ANSWERS = (
+    ("task_type", (("chat", 30), ("code_generation", 25), ("qa", 15), ("summarization", 12),
+                   ("text_generation", 10), ("translation", 8))),
+    ("size_preference", (("small", 25), ("medium", 35), ("large", 30), ("xlarge", 10))),
+    ("license_preference", (("any", 50), ("open_source", 35), ("commercial", 15))),
+    ("budget_constraint", (("free", 30), ("low", 35), ("medium", 25), ("high", 10))),
+    ("language_support", (("english", 60), ("multilingual", 30), ("specific", 10))),
+    ("deployment", (("cloud", 45), ("local", 35), ("hybrid", 20))),
+)
+
+MODEL_COLUMNS = (
+    "id", "name", "provider", "version", "parameters", "description", "training_data",
+    "performance_benchmarks", "hardware_requirements", "pricing_info", "strengths", "weaknesses",
+    "supported_languages", "license_type", "created_at",
+)
+BENCHMARK_COLUMNS = ("model_id", "benchmark", "score", "rank", "percentile")
+USER_COLUMNS = ("id", "email", "username", "hashed_password", "is_active", "is_admin", "created_at")
+SAVED_MODEL_COLUMNS = ("id", "user_id", "model_id", "notes", "created_at")
+RECOMMENDATION_COLUMNS = ("id", "user_id", "requirements", "created_at")
+ITEM_COLUMNS = ("id", "recommendation_id", "model_id", "score", "reasoning")
+
+
+@dataclass(frozen=True)
+class SyntheticConfig:
+    seed: int = 0
+    models: int = 1000
+    users: int = 100
+    saved_per_user: float = 3.0
+    recommendations: int = 10000
+    items_per_recommendation: int = 5
+
+
+def _rng(seed: int, stream: int, chunk: int) -> np.random.Generator:
+    return np.random.default_rng([seed, stream, chunk])
+
+
+def _chunks(count: int) -> Iterator[Tuple[int, int, int]]:
+    """
+    (chunk number, first index, size) of each generation chunk.
+    """
+    for chunk, start in enumerate(range(0, count, GENERATION_CHUNK)):
+        yield chunk, start, min(GENERATION_CHUNK, count - start)
+
+
+def _weights(pairs: Sequence[Tuple[Any, float]]) -> Tuple[List[Any], np.ndarray]:
+    values = [value for value, _ in pairs]
+    weights = np.array([weight for _, weight in pairs], dtype=float)
+    return values, weights / weights.sum()
+
+
+def _popularity(n: int, exponent: float = 1.1, offset: float = 5.0) -> np.ndarray:
+    """
+    Cumulative Zipf-like weights of n items, most popular first.
+    """
+    weights = 1.0 / (np.arange(n) + offset) ** exponent
+    cdf = np.cumsum(weights)
+    return cdf / cdf[-1]
+
+
+def _sample(rng: np.random.Generator, cdf: np.ndarray, size: Any) -> np.ndarray:
+    return np.minimum(np.searchsorted(cdf, rng.random(size)), len(cdf) - 1)
+
+
+def _sample_distinct(rng: np.random.Generator, cdf: np.ndarray, size: int, k: int) -> np.ndarray:
+    """
+    Draw k distinct items per row by popularity, without replacement. A draw
+    repeating an earlier one in its row is redrawn, which keeps the
+    successive-sampling distribution; rows still repeating after
+    REDRAW_ROUNDS (k close to n) draw from the weights of their unused items.
+    """
+    rows = _sample(rng, cdf, (size, k))
+    for position in range(1, k):
+        for _ in range(REDRAW_ROUNDS):
+            repeats = np.flatnonzero((rows[:, :position] == rows[:, position, None]).any(axis=1))
+            if not repeats.size:
+                break
+            rows[repeats, position] = _sample(rng, cdf, repeats.size)
+        repeats = np.flatnonzero((rows[:, :position] == rows[:, position, None]).any(axis=1))
+        if repeats.size:
+            weights = np.diff(cdf, prepend=0.0)
+            for row in repeats:
+                unused = weights.copy()
+                unused[rows[row, :position]] = 0.0
+                remaining = np.cumsum(unused)
+                rows[row, position] = _sample(rng, remaining / remaining[-1], 1)[0]
+    return rows
+
+
+def _texts(rng: np.random.Generator, sentences: Sequence[str], mean: float, size: int) -> List[str]:
+    """
+    size texts of a lognormal number of consecutive (cyclic) sentences.
+    """
+    n = len(sentences)
+    counts = np.clip(rng.lognormal(math.log(mean), 0.5, size).astype(int), 1, n)
+    starts = rng.integers(n, size=size)
+    return [" ".join(sentences[(first + i) % n] for i in range(count)) for first, count in zip(starts, counts)]
+
+
+def generate_models(seed: int, count: int, first_id: int) -> Iterator[Tuple[List[tuple], List[tuple]]]:
+    """
+    Model rows and their benchmark rows (ranked later), one chunk at a time.
+    """
+    providers, provider_p = _weights([(entry, entry[1]) for entry in PROVIDERS])
+    sizes, size_p = _weights(COMMON_SIZES)
+    languages, language_p = _weights(LANGUAGES)
+    hardware, hardware_p = _weights(HARDWARE_OPTIONS)
+    pricing, pricing_p = _weights(PRICING_OPTIONS)
+    community_cdf = _popularity(COMMUNITY_ORGS)
+    names = [benchmark for benchmark, *_ in BENCHMARKS]
+    shares, bases, gains, noises = (np.array(column) for column in list(zip(*BENCHMARKS))[1:])
+    span = timedelta(days=3 * HISTORY_DAYS)
+    start = HISTORY_END - span
+
+    for chunk, first, size in _chunks(count):
+        rng = _rng(seed, MODELS, chunk)
+        provider_index = rng.choice(len(providers), size, p=provider_p)
+        family_draw = rng.random(size)
+        community = rng.random(size) < COMMUNITY_SHARE
+        org = _sample(rng, community_cdf, size)
+        suffix = rng.integers(len(COMMUNITY_SUFFIXES), size=size)
+        open_draw = rng.random(size)
+        unlicensed = rng.random(size) < 0.03
+
+        parameters = np.array(sizes)[rng.choice(len(sizes), size, p=size_p)]
+        continuous = rng.random(size) < 0.1
+        parameters[continuous] = np.round(rng.lognormal(math.log(10), 1.5, continuous.sum()), 1) + 0.1
+        unknown_size = rng.random(size) < 0.05
+
+        # English nearly always, plus other languages sampled by frequency
+        # without replacement (Gumbel top-k)
+        english = rng.random(size) < 0.98
+        others = np.where(rng.random(size) < 0.3, 0, np.minimum(rng.poisson(6, size), len(languages)))
+        language_order = np.argsort(-(np.log(language_p) + rng.gumbel(size=(size, len(languages)))), axis=1)
+
+        # Latent quality grows with size, with plenty of spread
+        quality = 1 / (1 + np.exp(-(np.log(parameters / 20) / 1.5 + rng.normal(0, 0.6, size))))
+        reported = rng.random((size, len(names))) < shares
+        scores = np.clip(np.round(bases + gains * quality[:, None] + rng.normal(0, 1, (size, len(names))) * noises, 1), 0, 100)
+        annotated = rng.random(size) < 0.01
+
+        descriptions = _texts(rng, DESCRIPTION_SENTENCES, 2.5, size)
+        training = _texts(rng, TRAINING_SENTENCES, 2, size)
+        strengths = _texts(rng, STRENGTH_PHRASES, 2.5, size)
+        weaknesses = _texts(rng, WEAKNESS_PHRASES, 1.5, size)
+        hardware_index = rng.choice(len(hardware), size, p=hardware_p)
+        pricing_index = rng.choice(len(pricing), size, p=pricing_p)
+        positions = (first + np.arange(size) + rng.random(size)) / count
+
+        models, benchmarks = [], []
+        for j in range(size):
+            model_id = first_id + first + j
+            provider, _, families, open_share = providers[provider_index[j]]
+            family = families[int(family_draw[j] * len(families))]
+            if community[j]:
+                provider = f"Community Lab {org[j] + 1}"
+                name = f"{family}-{COMMUNITY_SUFFIXES[suffix[j]]}"
+                open_share = 0.97
+            else:
+                name = family
+            params = None if unknown_size[j] else float(parameters[j])
+            version = f"{params:g}B-r{model_id}" if params is not None else f"r{model_id}"
+            license_type = None if unlicensed[j] else ("open_source" if open_draw[j] < open_share else "commercial")
+
+            supported = ["English"] if english[j] else []
+            supported += [languages[i] for i in language_order[j, :others[j]]]
+
+            blob = {}
+            for b in np.flatnonzero(reported[j]):
+                score = float(scores[j, b])
+                blob[names[b]] = score
+                benchmarks.append((model_id, names[b], score, 0, 0.0))
+            if annotated[j]:
+                blob["notes"] = "Self-reported"
+
+            models.append((
+                model_id, name, provider, version, params, descriptions[j], training[j], blob or None,
+                hardware[hardware_index[j]], pricing[pricing_index[j]], strengths[j], weaknesses[j],
+                supported, license_type, start + span * positions[j],
+            ))
+        yield models, benchmarks
+
+
+def generate_users(seed: int, count: int, first_id: int, hashed_password: str) -> Iterator[List[tuple]]:
+    span = timedelta(days=2 * HISTORY_DAYS)
+    start = HISTORY_END - span
+    for chunk, first, size in _chunks(count):
+        rng = _rng(seed, USERS, chunk)
+        active = rng.random(size) >= 0.03
+        positions = (first + np.arange(size) + rng.random(size)) / count
+        yield [
+            (
+                first_id + first + j,
+                f"user{first_id + first + j}@synthetic.example",
+                f"user{first_id + first + j}",
+                hashed_password,
+                bool(active[j]),
+                False,
+                start + span * positions[j],
+            )
+            for j in range(size)
+        ]
+
+
+def generate_saved_models(
+    seed: int,
+    user_ids: Sequence[int],
+    model_ids: Sequence[int],
+    mean: float,
+    first_id: int,
+) -> Iterator[List[tuple]]:
+    """
+    Saved models of every user: a Poisson number of distinct models each,
+    drawn by popularity.
+    """
+    model_ids = np.asarray(model_ids)
+    popularity = np.random.default_rng([seed, SAVED_MODELS]).permutation(len(model_ids))
+    cdf = _popularity(len(model_ids))
+    span = timedelta(days=HISTORY_DAYS)
+    start = HISTORY_END - span
+    next_id = first_id
+    for chunk, first, size in _chunks(len(user_ids)):
+        rng = _rng(seed, SAVED_MODELS, chunk)
+        counts = np.minimum(rng.poisson(mean, size), len(model_ids))
+        owners = np.repeat(np.arange(first, first + size), counts)
+        picks = popularity[_sample(rng, cdf, len(owners))]
+        pairs = np.unique(np.column_stack([owners, picks]), axis=0)
+        has_notes = rng.random(len(pairs)) < 0.3
+        note_index = rng.integers(len(NOTES), size=len(pairs))
+        positions = rng.random(len(pairs))
+        rows = []
+        for i, (owner, pick) in enumerate(pairs.tolist()):
+            rows.append((
+                next_id + i, user_ids[owner], int(model_ids[pick]),
+                NOTES[note_index[i]] if has_notes[i] else None,
+                start + span * positions[i],
+            ))
+        next_id += len(rows)
+        yield rows
+
+
+def _requirements(rng: np.random.Generator, size: int) -> List[Dict[str, Any]]:
+    answers = []
+    for question, options in REQUIREMENT_ANSWERS:
+        values, p = _weights(options)
+        answers.append((question, values, rng.choice(len(values), size, p=p)))
+    languages = [language for language, _ in LANGUAGES[:10]]
+    requirements = []
+    for j in range(size):
+        entry = {question: values[picks[j]] for question, values, picks in answers}
+        if entry["language_support"] == "specific":
+            entry["specific_languages"] = [languages[i] for i in rng.choice(10, rng.integers(1, 4), replace=False)]
+        requirements.append(entry)
+    return requirements
+
+
+def generate_recommendations(
+    seed: int,
+    count: int,
+    items_per_recommendation: int,
+    user_ids: Sequence[int],
+    model_ids: Sequence[int],
+    first_id: int,
+    first_item_id: int,
+) -> Iterator[Tuple[List[tuple], List[tuple]]]:
+    """
+    Recommendations (oldest first, ids increasing with created_at) and their
+    items. Users and models are drawn by popularity; each recommendation lists
+    distinct models with non-increasing scores.
+    """
+    model_ids = np.asarray(model_ids)
+    k = min(items_per_recommendation, len(model_ids))
+    model_rank = np.random.default_rng([seed, RECOMMENDATIONS]).permutation(len(model_ids))
+    model_cdf = _popularity(len(model_ids)) if k else None
+    user_cdf = _popularity(len(user_ids), exponent=0.9, offset=20) if len(user_ids) else None
+    span = timedelta(days=HISTORY_DAYS)
+    start = HISTORY_END - span
+
+    for chunk, first, size in _chunks(count):
+        rng = _rng(seed, RECOMMENDATIONS, chunk)
+        requirements = _requirements(rng, size)
+        anonymous = rng.random(size) < 0.05
+        owners = _sample(rng, user_cdf, size) if user_cdf is not None else np.zeros(size, dtype=int)
+        positions = (first + np.arange(size) + rng.random(size)) / count
+        recommendations = [
+            (
+                first_id + first + j,
+                None if anonymous[j] or user_cdf is None else user_ids[owners[j]],
+                requirements[j],
+                start + span * positions[j],
+            )
+            for j in range(size)
+        ]
+
+        items = []
+        if k:
+            picks = model_ids[model_rank[_sample_distinct(rng, model_cdf, size, k)]]
+            # Scores are multiples of 5, as with the default weights
+            top = rng.integers(8, 20, size) * 5
+            steps = rng.choice([0, 5, 5, 10, 15], (size, k))
+            steps[:, 0] = 0
+            scores = np.maximum(top[:, None] - np.cumsum(steps, axis=1), 30)
+            reasoning = rng.integers(len(REASONING_SENTENCES), size=(size, k, 2))
+            item_id = first_item_id + first * k
+            for j in range(size):
+                for position in range(k):
+                    a, b = reasoning[j, position]
+                    items.append((
+                        item_id, first_id + first + j, int(picks[j, position]), float(scores[j, position]),
+                        f"{REASONING_SENTENCES[a]}. {REASONING_SENTENCES[b]}.",
+                    ))
+                    item_id += 1
+        yield recommendations, items
+
+
+def _next_id(db: Session, column) -> int:
+    return (db.scalar(select(func.max(column))) or 0) + 1
+
+
+def load_synthetic(db: Session, config: SyntheticConfig) -> Dict[str, int]:
+    """
+    Generate and bulk-load a synthetic dataset, committing each chunk, then
+    rank benchmarks and reload the catalog once. Returns the row counts.
+    """
+    counts = {"models": 0, "benchmarks": 0, "users": 0, "saved_models": 0, "recommendations": 0, "items": 0}
+
+    for models, benchmarks in generate_models(config.seed, config.models, _next_id(db, LLMModel.id)):
+        counts["models"] += copy_rows(db, LLMModel.__table__, MODEL_COLUMNS, models)
+        counts["benchmarks"] += copy_rows(db, ModelBenchmark.__table__, BENCHMARK_COLUMNS, benchmarks)
+        db.commit()
+    if counts["benchmarks"]:
+        rerank(db, [benchmark for benchmark, *_ in BENCHMARKS])
+
+    hashed_password = get_password_hash(SYNTHETIC_PASSWORD)
+    for users in generate_users(config.seed, config.users, _next_id(db, User.id), hashed_password):
+        counts["users"] += copy_rows(db, User.__table__, USER_COLUMNS, users)
+        db.commit()
+
+    user_ids = db.scalars(select(User.id).where(User.is_admin.is_(False)).order_by(User.id)).all()
+    model_ids = db.scalars(select(LLMModel.id).order_by(LLMModel.id)).all()
+
+    if model_ids and config.saved_per_user > 0:
+        for saved in generate_saved_models(
+            config.seed, user_ids, model_ids, config.saved_per_user, _next_id(db, SavedModel.id)
+        ):
+            counts["saved_models"] += copy_rows(db, SavedModel.__table__, SAVED_MODEL_COLUMNS, saved)
+            db.commit()
+
+    for recommendations, items in generate_recommendations(
+        config.seed, config.recommendations, config.items_per_recommendation, user_ids, model_ids,
+        _next_id(db, Recommendation.id), _next_id(db, RecommendationItem.id),
+    ):
+        counts["recommendations"] += copy_rows(db, Recommendation.__table__, RECOMMENDATION_COLUMNS, recommendations)
+        counts["items"] += copy_rows(db, RecommendationItem.__table__, ITEM_COLUMNS, items)
+        db.commit()
+
+    for model in (LLMModel, User, SavedModel, Recommendation, RecommendationItem):
+        reset_sequence(db, model.__table__)
+    db.commit()
+    if counts["models"]:
+        catalog_cache.invalidate()
+    return counts
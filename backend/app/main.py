@@ -1,12 +1,24 @@
-from fastapi import FastAPI
+import logging
+from fastapi import FastAPI, Request, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, ORJSONResponse
 from app.api.v1.api import api_router
+from app.core.batch import scoring_pool
+from app.core.catalog import catalog_cache
 from app.core.config import settings
+from app.core.hashing import PasswordHasherBusy, password_hasher
+from app.db.pool import warm_up, warm_up_async
+from app.db.query_counter import QueryCountMiddleware
+from app.db.session import SessionLocal, async_engine, engine
+
+logger = logging.getLogger(__name__)
 
 app = FastAPI(
     title="LLM Model Advisor",
     description="API for recommending the best LLM models based on user needs",
     version="1.0.0",
+    default_response_class=ORJSONResponse,
 )
 
 # Configure CORS
@@ -18,9 +30,57 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Report the number of SQL queries each request executed
+app.add_middleware(QueryCountMiddleware)
+
+# Shed load instead of queueing unbounded password hashing work
+@app.exception_handler(PasswordHasherBusy)
+async def password_hasher_busy_handler(request: Request, exc: PasswordHasherBusy):
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": "Authentication is busy, please retry"},
+        headers={"Retry-After": "1"},
+    )
+
 # Include API router
 app.include_router(api_router, prefix="/api/v1")
 
+@app.on_event("startup")
+async def warm_up_connection_pools() -> None:
+    """Open pooled connections before serving the first request"""
+    if not settings.DB_POOL_WARMUP:
+        return
+    try:
+        await run_in_threadpool(warm_up, engine, settings.DB_POOL_SIZE)
+        await warm_up_async(async_engine, settings.DB_POOL_SIZE)
+    except Exception:
+        logger.exception("Could not warm up database connection pools")
+
+@app.on_event("startup")
+def build_catalog_snapshot() -> None:
+    """Build the catalog snapshot before serving the first request"""
+    db = SessionLocal()
+    try:
+        catalog_cache.rebuild(db)
+    except Exception:
+        # The snapshot is built lazily on first use if the database is not ready yet
+        logger.exception("Could not build catalog snapshot at startup")
+    finally:
+        db.close()
+
+@app.on_event("startup")
+def start_password_hasher() -> None:
+    """Create the password hashing pool"""
+    password_hasher.start()
+
+@app.on_event("shutdown")
+def stop_password_hasher() -> None:
+    password_hasher.shutdown()
+
+@app.on_event("shutdown")
+def stop_scoring_pool() -> None:
+    scoring_pool.shutdown()
+
 @app.get("/")
 async def root():
     return {"message": "Welcome to LLM Model Advisor API. Visit /docs for documentation."}
@@ -1,4 +1,4 @@
-from sqlalchemy import Boolean, Column, ForeignKey, Integer, String, Text, Float, Table, DateTime, JSON
+from sqlalchemy import Boolean, Column, ForeignKey, Index, Integer, String, Text, Float, Table, DateTime, JSON, literal_column
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.db.session import Base
@@ -28,7 +28,7 @@ class LLMModel(Base):
     name = Column(String, nullable=False, index=True)
     provider = Column(String, nullable=False, index=True)
     version = Column(String)
-    parameters = Column(Float)  # Billions of parameters
+    parameters = Column(Float, index=True)  # Billions of parameters
     description = Column(Text)
     training_data = Column(Text)
     performance_benchmarks = Column(JSON)  # Store benchmark data as JSON
@@ -37,13 +37,44 @@ class LLMModel(Base):
     strengths = Column(Text)
     weaknesses = Column(Text)
     supported_languages = Column(JSON)  # Store as JSON array
-    license_type = Column(String)
+    license_type = Column(String, index=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     
     # Relationships
     saved_by = relationship("SavedModel", back_populates="model")
     recommendations = relationship("RecommendationItem", back_populates="model")
+    benchmarks = relationship("ModelBenchmark", back_populates="model", cascade="all, delete-orphan")
+    
+    __table_args__ = (
+        # One row per model identity, a missing version counting as one value;
+        # the conflict target of bulk catalog upserts
+        Index(
+            "uq_llm_models_identity",
+            "name",
+            "provider",
+            func.coalesce(version, literal_column("''")),
+            unique=True,
+        ),
+    )
+
+# Benchmark scores normalized out of performance_benchmarks, for leaderboards
+class ModelBenchmark(Base):
+    __tablename__ = "model_benchmarks"
+
+    model_id = Column(Integer, ForeignKey("llm_models.id", ondelete="CASCADE"), primary_key=True)
+    benchmark = Column(String, primary_key=True)
+    score = Column(Float, nullable=False)
+    rank = Column(Integer, nullable=False)  # 1 is best; ties share a rank
+    percentile = Column(Float, nullable=False)  # 100 for first place, 0 for last
+    
+    # Relationships
+    model = relationship("LLMModel", back_populates="benchmarks")
+    
+    __table_args__ = (
+        # Leaderboard pages: WHERE benchmark = ? AND score >= ? ORDER BY score DESC, model_id
+        Index("ix_model_benchmarks_benchmark_score", "benchmark", score.desc(), "model_id"),
+    )
 
 # User's saved models
 class SavedModel(Base):
@@ -59,6 +90,19 @@ class SavedModel(Base):
     user = relationship("User", back_populates="saved_models")
     model = relationship("LLMModel", back_populates="saved_by")
 
+# Named recommendation scoring profile, defined by admins
+class ScoringProfile(Base):
+    __tablename__ = "scoring_profiles"
+
+    id = Column(Integer, primary_key=True, index=True)
+    name = Column(String, unique=True, index=True, nullable=False)
+    description = Column(Text)
+    weights = Column(JSON)  # Criterion -> weight, overriding the default points
+    min_score = Column(Float)  # Default cutoff if null
+    top_k = Column(Integer)  # Default result count if null
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+
 # Recommendation session
 class Recommendation(Base):
     __tablename__ = "recommendations"
@@ -71,13 +115,18 @@ class Recommendation(Base):
     # Relationships
     user = relationship("User", back_populates="recommendations")
     items = relationship("RecommendationItem", back_populates="recommendation")
+    
+    __table_args__ = (
+        # Keyset pagination of a user's history on (created_at, id)
+        Index("ix_recommendations_user_created_id", "user_id", "created_at", "id"),
+    )
 
 # Recommendation items (models recommended in a session)
 class RecommendationItem(Base):
     __tablename__ = "recommendation_items"
 
     id = Column(Integer, primary_key=True, index=True)
-    recommendation_id = Column(Integer, ForeignKey("recommendations.id"))
+    recommendation_id = Column(Integer, ForeignKey("recommendations.id"), index=True)
     model_id = Column(Integer, ForeignKey("llm_models.id"))
     score = Column(Float)  # Recommendation score/match percentage
     reasoning = Column(Text)  # Why this model was recommended
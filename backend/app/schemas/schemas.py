@@ -1,7 +1,14 @@
 from pydantic import BaseModel, EmailStr, Field, validator
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Generic, Literal, TypeVar
 from datetime import datetime
 
+T = TypeVar("T")
+
+# Keyset pagination envelope
+class CursorPage(BaseModel, Generic[T]):
+    items: List[T]
+    next_cursor: Optional[str] = None
+
 # User schemas
 class UserBase(BaseModel):
     email: EmailStr
@@ -80,6 +87,78 @@ class LLMModelResponse(LLMModelInDB):
     class Config:
         from_attributes = True
 
+# Compact projection for list views (fields=summary)
+class LLMModelSummary(BaseModel):
+    id: int
+    name: str
+    provider: str
+    parameters: Optional[float] = None
+    license_type: Optional[str] = None
+    
+    class Config:
+        from_attributes = True
+
+# Model search schemas
+class ModelSearchHit(BaseModel):
+    model: LLMModelResponse
+    score: float
+    highlights: Dict[str, str]
+
+class ModelSearchResponse(BaseModel):
+    query: str
+    total: int
+    items: List[ModelSearchHit]
+
+class LeaderboardEntry(BaseModel):
+    model: LLMModelSummary
+    score: float
+    rank: int
+    percentile: float
+
+# Pareto frontier schemas
+class ParetoObjective(BaseModel):
+    # A benchmark name, "parameters" or "cost" (tier 0-3 parsed from pricing_info)
+    name: str
+    # Defaults to max for benchmarks, min for parameters and cost
+    direction: Optional[Literal["min", "max"]] = None
+
+class ParetoRequest(BaseModel):
+    objectives: List[ParetoObjective] = Field(..., min_length=1, max_length=10)
+    # Hard constraints
+    license_types: Optional[List[Optional[str]]] = None
+    min_parameters: Optional[float] = None
+    max_parameters: Optional[float] = None
+    max_cost_tier: Optional[int] = Field(None, ge=0, le=3)
+    min_scores: Dict[str, float] = {}
+
+class ParetoPoint(BaseModel):
+    model: LLMModelSummary
+    values: Dict[str, float]
+
+class ParetoResponse(BaseModel):
+    objectives: List[ParetoObjective]
+    candidates: int
+    items: List[ParetoPoint]
+
+class SimilarModel(BaseModel):
+    model: LLMModelResponse
+    score: float
+
+class SemanticSearchRequest(BaseModel):
+    query: str = Field(..., min_length=1, max_length=2000)
+    limit: int = Field(10, ge=1, le=100)
+
+# Bulk catalog import schemas
+class CatalogImportError(BaseModel):
+    line: int
+    error: str
+
+class CatalogImportResult(BaseModel):
+    processed: int
+    upserted: int
+    error_count: int
+    errors: List[CatalogImportError]  # The first 1000 errors
+
 # Saved model schemas
 class SavedModelCreate(BaseModel):
     model_id: int
@@ -94,6 +173,31 @@ class SavedModelResponse(BaseModel):
     class Config:
         from_attributes = True
 
+class SavedModelSummaryResponse(SavedModelResponse):
+    model: LLMModelSummary
+
+# Scoring profile schemas
+class ScoringProfileBase(BaseModel):
+    name: str = Field(..., min_length=1, max_length=100)
+    description: Optional[str] = None
+    weights: Optional[Dict[str, float]] = None  # Criterion -> weight, over the default points
+    min_score: Optional[float] = None
+    top_k: Optional[int] = Field(None, ge=1, le=100)
+
+class ScoringProfileCreate(ScoringProfileBase):
+    pass
+
+class ScoringProfileUpdate(ScoringProfileBase):
+    name: Optional[str] = Field(None, min_length=1, max_length=100)
+
+class ScoringProfileResponse(ScoringProfileBase):
+    id: int
+    created_at: datetime
+    updated_at: Optional[datetime] = None
+    
+    class Config:
+        from_attributes = True
+
 # Recommendation schemas
 class RequirementQuestion(BaseModel):
     id: str
@@ -102,6 +206,11 @@ class RequirementQuestion(BaseModel):
 
 class RecommendationCreate(BaseModel):
     requirements: Dict[str, Any]
+    profile: Optional[str] = None  # Name of a scoring profile
+    weights: Optional[Dict[str, float]] = None  # Criterion -> weight, over the profile's
+    min_score: Optional[float] = None
+    top_k: Optional[int] = Field(None, ge=1, le=100)
+    strict: bool = False  # Exclude models failing license, size or language requirements
 
 class RecommendationItemResponse(BaseModel):
     id: int
@@ -120,3 +229,9 @@ class RecommendationResponse(BaseModel):
     
     class Config:
         from_attributes = True
+
+class RecommendationItemSummaryResponse(RecommendationItemResponse):
+    model: LLMModelSummary
+
+class RecommendationSummaryResponse(RecommendationResponse):
+    items: List[RecommendationItemSummaryResponse]
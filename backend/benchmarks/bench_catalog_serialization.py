@@ -0,0 +1,108 @@
+"""
+Benchmark serialization of a GET /models/ page.
+
+Compares the previous path (FastAPI validates each row against
+LLMModelResponse, runs jsonable_encoder and encodes with the stdlib json
+module) with FastAPI's path under ORJSONResponse and with the lean path used
+by read_models (joining the snapshot's pre-encoded rows). Reports the cost
+per page.
+
+    python benchmarks/bench_catalog_serialization.py --page-size 100 --repeat 2000
+"""
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import sys
+import time
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.responses import JSONResponse, ORJSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+from typing import List
+
+from app.core.catalog import CatalogSnapshot
+from app.core.serialization import RawJSONResponse, json_array
+from app.schemas.schemas import LLMModelResponse
+
+LANGUAGES = ["English", "Spanish", "French", "German", "Japanese", "Chinese", "Korean", "Arabic"]
+
+
+def make_rows(count: int):
+    rng = random.Random(0)
+    created = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    return [
+        SimpleNamespace(
+            id=i + 1,
+            name=f"Model {i}",
+            provider=f"Provider {i % 20}",
+            version="1.0",
+            parameters=rng.choice([3.0, 7.0, 13.0, 70.0, 180.0]),
+            description="A general purpose language model. " * 8,
+            training_data="Web text, books and code. " * 6,
+            strengths="Text generation, code, summarization and question answering",
+            weaknesses="Hallucinations on niche topics",
+            license_type=rng.choice(["commercial", "open_source"]),
+            pricing_info="Low cost per token",
+            hardware_requirements="Available through API",
+            supported_languages=rng.sample(LANGUAGES, 5),
+            performance_benchmarks={name: round(rng.random() * 100, 2) for name in ("mmlu", "gsm8k", "humaneval", "hellaswag")},
+            created_at=created,
+            updated_at=None,
+        )
+        for i in range(count)
+    ]
+
+
+def measure(fn, repeat: int):
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - started)
+    return statistics.median(samples) * 1e6, statistics.quantiles(samples, n=100)[98] * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=2000)
+    args = parser.parse_args()
+
+    rows = make_rows(args.page_size)
+    snapshot = CatalogSnapshot.build(rows, generation=1)
+    models = list(snapshot.models)
+    field = create_response_field(name="Response", type_=List[LLMModelResponse])
+    loop = asyncio.new_event_loop()
+
+    def fastapi_path(response_class, content):
+        body = loop.run_until_complete(serialize_response(field=field, response_content=content))
+        return response_class(body).body
+
+    paths = {
+        # Before: ORM rows through response_model validation and stdlib json
+        "validate + json": lambda: fastapi_path(JSONResponse, rows),
+        # Same validation, orjson encoding
+        "validate + orjson": lambda: fastapi_path(ORJSONResponse, rows),
+        # Snapshot models (already validated) through FastAPI
+        "snapshot + orjson": lambda: fastapi_path(ORJSONResponse, models),
+        # After: join pre-encoded rows
+        "pre-encoded rows": lambda: RawJSONResponse(json_array(snapshot.json_rows[m.id] for m in models)).body,
+    }
+
+    baseline = None
+    print(f"{'path':<20} {'p50 us':>10} {'p99 us':>10} {'speedup':>8}")
+    for name, fn in paths.items():
+        fn()  # warm up
+        p50, p99 = measure(fn, args.repeat)
+        baseline = baseline or p50
+        print(f"{name:<20} {p50:>10.1f} {p99:>10.1f} {baseline / p50:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
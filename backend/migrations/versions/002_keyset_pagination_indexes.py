@@ -0,0 +1,38 @@
+"""Add indexes for keyset pagination
+
+Revision ID: 002_keyset_pagination_indexes
+Revises: 890726b511bd
+Create Date: 2026-10-17 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '002_keyset_pagination_indexes'
+down_revision = '890726b511bd'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # History pages: WHERE user_id = ? AND (created_at, id) < (?, ?) ORDER BY created_at DESC, id DESC
+    op.create_index(
+        'ix_recommendations_user_created_id',
+        'recommendations',
+        ['user_id', 'created_at', 'id'],
+        unique=False,
+    )
+    # Loading items for a page of recommendations
+    op.create_index(
+        op.f('ix_recommendation_items_recommendation_id'),
+        'recommendation_items',
+        ['recommendation_id'],
+        unique=False,
+    )
+
+
+def downgrade():
+    op.drop_index(op.f('ix_recommendation_items_recommendation_id'), table_name='recommendation_items')
+    op.drop_index('ix_recommendations_user_created_id', table_name='recommendations')
@@ -0,0 +1,48 @@
+"""Add full-text search vector to llm_models
+
+Revision ID: 003_model_search_tsvector
+Revises: 002_keyset_pagination_indexes
+Create Date: 2026-10-17 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '003_model_search_tsvector'
+down_revision = '002_keyset_pagination_indexes'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Postgres only; other databases use the in-process search index
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    # Weights A-D rank name above strengths above description above weaknesses
+    op.execute(
+        """
+        ALTER TABLE llm_models ADD COLUMN search_vector tsvector
+        GENERATED ALWAYS AS (
+            setweight(to_tsvector('english', coalesce(name, '')), 'A') ||
+            setweight(to_tsvector('english', coalesce(strengths, '')), 'B') ||
+            setweight(to_tsvector('english', coalesce(description, '')), 'C') ||
+            setweight(to_tsvector('english', coalesce(weaknesses, '')), 'D')
+        ) STORED
+        """
+    )
+    op.create_index(
+        'ix_llm_models_search_vector',
+        'llm_models',
+        ['search_vector'],
+        unique=False,
+        postgresql_using='gin',
+    )
+
+
+def downgrade():
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    op.drop_index('ix_llm_models_search_vector', table_name='llm_models')
+    op.drop_column('llm_models', 'search_vector')
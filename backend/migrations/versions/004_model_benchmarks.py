@@ -0,0 +1,72 @@
+"""Add normalized model_benchmarks table
+
+Revision ID: 004_model_benchmarks
+Revises: 003_model_search_tsvector
+Create Date: 2026-10-17 14:00:00.000000
+
+"""
+import math
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '004_model_benchmarks'
+down_revision = '003_model_search_tsvector'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    model_benchmarks = op.create_table(
+        'model_benchmarks',
+        sa.Column('model_id', sa.Integer(), nullable=False),
+        sa.Column('benchmark', sa.String(), nullable=False),
+        sa.Column('score', sa.Float(), nullable=False),
+        sa.Column('rank', sa.Integer(), nullable=False),
+        sa.Column('percentile', sa.Float(), nullable=False),
+        sa.ForeignKeyConstraint(['model_id'], ['llm_models.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('model_id', 'benchmark'),
+    )
+    # Leaderboard pages: WHERE benchmark = ? AND score >= ? ORDER BY score DESC, model_id
+    op.create_index(
+        'ix_model_benchmarks_benchmark_score',
+        'model_benchmarks',
+        ['benchmark', sa.text('score DESC'), 'model_id'],
+        unique=False,
+    )
+
+    # Backfill from the JSON blobs, ranking each benchmark best first
+    llm_models = sa.table('llm_models', sa.column('id', sa.Integer), sa.column('performance_benchmarks', sa.JSON))
+    by_benchmark = {}
+    for model_id, blob in op.get_bind().execute(sa.select(llm_models.c.id, llm_models.c.performance_benchmarks)):
+        if not isinstance(blob, dict):
+            continue
+        for benchmark, score in blob.items():
+            if isinstance(score, (int, float)) and not isinstance(score, bool) and math.isfinite(score):
+                by_benchmark.setdefault(str(benchmark), []).append((float(score), model_id))
+
+    rows = []
+    for benchmark, scores in by_benchmark.items():
+        scores.sort(key=lambda entry: (-entry[0], entry[1]))
+        n = len(scores)
+        rank = 0
+        for i, (score, model_id) in enumerate(scores):
+            if i == 0 or score != scores[i - 1][0]:
+                rank = i + 1
+            percentile = 100.0 * (n - rank) / (n - 1) if n > 1 else 100.0
+            rows.append({
+                'model_id': model_id,
+                'benchmark': benchmark,
+                'score': score,
+                'rank': rank,
+                'percentile': round(percentile, 2),
+            })
+    if rows:
+        op.bulk_insert(model_benchmarks, rows)
+
+
+def downgrade():
+    op.drop_index('ix_model_benchmarks_benchmark_score', table_name='model_benchmarks')
+    op.drop_table('model_benchmarks')
@@ -0,0 +1,39 @@
+"""Add scoring_profiles table
+
+Revision ID: 005_scoring_profiles
+Revises: 004_model_benchmarks
+Create Date: 2026-10-17 16:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '005_scoring_profiles'
+down_revision = '004_model_benchmarks'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'scoring_profiles',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('name', sa.String(), nullable=False),
+        sa.Column('description', sa.Text(), nullable=True),
+        sa.Column('weights', sa.JSON(), nullable=True),
+        sa.Column('min_score', sa.Float(), nullable=True),
+        sa.Column('top_k', sa.Integer(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index(op.f('ix_scoring_profiles_id'), 'scoring_profiles', ['id'], unique=False)
+    op.create_index(op.f('ix_scoring_profiles_name'), 'scoring_profiles', ['name'], unique=True)
+
+
+def downgrade():
+    op.drop_index(op.f('ix_scoring_profiles_name'), table_name='scoring_profiles')
+    op.drop_index(op.f('ix_scoring_profiles_id'), table_name='scoring_profiles')
+    op.drop_table('scoring_profiles')
@@ -0,0 +1,37 @@
+"""Add indexes for strict recommendation matching
+
+Revision ID: 006_strict_matching_indexes
+Revises: 005_scoring_profiles
+Create Date: 2026-10-17 18:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '006_strict_matching_indexes'
+down_revision = '005_scoring_profiles'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index(op.f('ix_llm_models_license_type'), 'llm_models', ['license_type'], unique=False)
+    op.create_index(op.f('ix_llm_models_parameters'), 'llm_models', ['parameters'], unique=False)
+    # Postgres only: case-insensitive containment on the language array
+    if op.get_bind().dialect.name == 'postgresql':
+        op.create_index(
+            'ix_llm_models_supported_languages',
+            'llm_models',
+            [sa.text('(lower(supported_languages::text)::jsonb) jsonb_path_ops')],
+            unique=False,
+            postgresql_using='gin',
+        )
+
+
+def downgrade():
+    if op.get_bind().dialect.name == 'postgresql':
+        op.drop_index('ix_llm_models_supported_languages', table_name='llm_models')
+    op.drop_index(op.f('ix_llm_models_parameters'), table_name='llm_models')
+    op.drop_index(op.f('ix_llm_models_license_type'), table_name='llm_models')
@@ -0,0 +1,40 @@
+"""Add unique model identity index for catalog upserts
+
+Revision ID: 007_llm_models_identity
+Revises: 006_strict_matching_indexes
+Create Date: 2026-10-17 20:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '007_llm_models_identity'
+down_revision = '006_strict_matching_indexes'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Duplicates are referenced by saved models and recommendations, so they
+    # have to be merged by hand rather than dropped here
+    duplicates = op.get_bind().execute(sa.text(
+        "SELECT name, provider, coalesce(version, '') AS version FROM llm_models "
+        "GROUP BY name, provider, coalesce(version, '') HAVING count(*) > 1"
+    )).all()
+    if duplicates:
+        listed = ", ".join(f"{name} {version or ''} by {provider}" for name, provider, version in duplicates[:10])
+        raise RuntimeError(f"Merge duplicate models before upgrading: {listed}")
+
+    # A missing version counts as one value, as in create_model's duplicate check
+    op.create_index(
+        'uq_llm_models_identity',
+        'llm_models',
+        ['name', 'provider', sa.text("coalesce(version, '')")],
+        unique=True,
+    )
+
+
+def downgrade():
+    op.drop_index('uq_llm_models_identity', table_name='llm_models')
@@ -0,0 +1,82 @@
+import importlib.util
+import os
+import sys
+import tempfile
+import types
+
+import pytest
+
+# Keep the shared catalog files out of the real temp location
+_shared_dir = tempfile.mkdtemp(prefix="llm-advisor-tests-")
+os.environ.setdefault("CATALOG_GENERATION_FILE", os.path.join(_shared_dir, "catalog.generation"))
+os.environ.setdefault("SIMILARITY_INDEX_DIR", os.path.join(_shared_dir, "similarity"))
+
+# Cheap bcrypt cost keeps password tests fast
+os.environ.setdefault("BCRYPT_ROUNDS", "4")
+
+sqlalchemy = pytest.importorskip("sqlalchemy")
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.db.session import Base
+from app.models import models  # noqa: F401  (registers tables on Base.metadata)
+
+
+@pytest.fixture
+def engine():
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    Base.metadata.create_all(bind=engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def db_session(engine):
+    TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    db = TestingSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+# The endpoints directory name is not a valid package name, so endpoint
+# modules are imported from their files
+ENDPOINTS_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "app", "api", "v1", "endpoints.")
+
+
+@pytest.fixture(scope="session")
+def load_endpoint():
+    directory = ENDPOINTS_DIR
+
+    def load(name):
+        module_name = f"app.api.v1.endpoints.{name}"
+        if module_name not in sys.modules:
+            spec = importlib.util.spec_from_file_location(module_name, os.path.join(directory, f"{name}.py"))
+            module = importlib.util.module_from_spec(spec)
+            sys.modules[module_name] = module
+            try:
+                spec.loader.exec_module(module)
+            except BaseException:
+                del sys.modules[module_name]
+                raise
+        return sys.modules[module_name]
+
+    return load
+
+
+@pytest.fixture(scope="session")
+def main_app():
+    # app.api.v1.api imports the endpoints as a package; register one over
+    # their directory so the whole application, middleware included, loads
+    package = types.ModuleType("app.api.v1.endpoints")
+    package.__path__ = [ENDPOINTS_DIR]
+    sys.modules.setdefault(package.__name__, package)
+    from app.main import app
+    return app
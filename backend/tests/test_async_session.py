@@ -0,0 +1,80 @@
+import asyncio
+
+import pytest
+
+pytest.importorskip("aiosqlite")
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.core.catalog import CatalogCache, GenerationCounter
+from app.db.queries import user_recommendations
+from app.db.session import Base, async_database_url, sync_database_url
+from app.models.models import LLMModel, Recommendation, RecommendationItem, User
+
+
+@pytest.mark.parametrize("url, sync, async_", [
+    ("postgresql://u:p@db/llm", "postgresql://u:p@db/llm", "postgresql+asyncpg://u:p@db/llm"),
+    ("postgresql+asyncpg://u:p@db/llm", "postgresql://u:p@db/llm", "postgresql+asyncpg://u:p@db/llm"),
+    ("postgresql+psycopg2://u:p@db/llm", "postgresql+psycopg2://u:p@db/llm", "postgresql+asyncpg://u:p@db/llm"),
+    ("sqlite:///./dev.db", "sqlite:///./dev.db", "sqlite+aiosqlite:///./dev.db"),
+    ("sqlite+aiosqlite:///./dev.db", "sqlite:///./dev.db", "sqlite+aiosqlite:///./dev.db"),
+])
+def test_database_url_variants(url, sync, async_):
+    assert sync_database_url(url).render_as_string(hide_password=False) == sync
+    assert async_database_url(url).render_as_string(hide_password=False) == async_
+
+
+def test_async_session_serves_snapshot_and_history(tmp_path):
+    async def scenario():
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'async.db'}")
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        AsyncSessionLocal = async_sessionmaker(engine, expire_on_commit=False, class_=AsyncSession)
+
+        async with AsyncSessionLocal() as db:
+            user = User(email="a@example.com", username="a", hashed_password="x")
+            model = LLMModel(name="M", provider="P")
+            db.add_all([user, model])
+            await db.flush()
+            db.add(Recommendation(user_id=user.id, requirements={}, items=[
+                RecommendationItem(model_id=model.id, score=40, reasoning="Fits.")
+            ]))
+            await db.commit()
+
+            cache = CatalogCache(GenerationCounter(str(tmp_path / "catalog.generation")))
+            snapshot = await cache.get_async(db)
+            assert [m.name for m in snapshot.models] == ["M"]
+            assert await cache.get_async(db) is snapshot
+
+            history = (await db.scalars(user_recommendations(user.id))).all()
+            assert history[0].items[0].model.name == "M"
+        await engine.dispose()
+
+    asyncio.run(scenario())
+
+
+def test_concurrent_async_rebuilds_share_one_run(tmp_path):
+    async def scenario():
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'async.db'}")
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        AsyncSessionLocal = async_sessionmaker(engine, expire_on_commit=False, class_=AsyncSession)
+        cache = CatalogCache(GenerationCounter(str(tmp_path / "catalog.generation")))
+
+        async with AsyncSessionLocal() as db:
+            db.add(LLMModel(name="M", provider="P"))
+            await db.commit()
+            first = await cache.get_async(db)
+            cache.invalidate()  # stale, as after a model write
+            sessions = [AsyncSessionLocal() for _ in range(4)]
+            snapshots = await asyncio.wait_for(
+                asyncio.gather(*(cache.get_async(session) for session in sessions)), timeout=10
+            )
+            for session in sessions:
+                await session.close()
+        await engine.dispose()
+        return first, snapshots
+
+    first, snapshots = asyncio.run(scenario())
+    assert all(snapshot is snapshots[0] for snapshot in snapshots)
+    assert snapshots[0].generation == first.generation + 1
@@ -0,0 +1,68 @@
+from datetime import timedelta
+
+import pytest
+from fastapi import HTTPException
+
+from app.api import deps
+from app.core.security import create_access_token
+from app.db import query_counter
+from app.models.models import User
+
+
+@pytest.fixture(autouse=True)
+def empty_caches():
+    deps.token_cache.clear()
+    deps.principal_cache.clear()
+    yield
+    deps.token_cache.clear()
+    deps.principal_cache.clear()
+
+
+@pytest.fixture
+def user(engine, db_session):
+    query_counter.install(engine)
+    user = User(email="user@example.com", username="user", hashed_password="x")
+    db_session.add(user)
+    db_session.commit()
+    return user
+
+
+def test_principal_is_cached_between_requests(db_session, user):
+    expected = deps.Principal.from_user(user)
+    token = create_access_token(user.id)
+    db_session.expunge_all()
+    with query_counter.count_queries() as counter:
+        first = deps.get_current_user(db_session, token)
+        second = deps.get_current_user(db_session, token)
+    assert first == second == expected
+    assert counter.count == 1
+
+
+def test_invalidation_reloads_the_user(db_session, user):
+    token = create_access_token(user.id)
+    deps.get_current_user(db_session, token)
+
+    user.is_active = False
+    db_session.commit()
+    assert deps.get_current_user(db_session, token).is_active
+
+    deps.invalidate_principal(user.id)
+    with pytest.raises(HTTPException) as excinfo:
+        deps.get_current_user(db_session, token)
+    assert excinfo.value.detail == "Inactive user"
+
+
+def test_expired_and_invalid_tokens_are_rejected(db_session, user):
+    expired = create_access_token(user.id, expires_delta=timedelta(seconds=-1))
+    for token in (expired, "not-a-token"):
+        with pytest.raises(HTTPException) as excinfo:
+            deps.get_current_user(db_session, token)
+        assert excinfo.value.status_code == 401
+    assert len(deps.token_cache) == 0
+
+
+def test_cached_token_expires():
+    deps.token_cache.set("cached-token", (1, 0.0))
+    with pytest.raises(HTTPException):
+        deps.get_token_user_id("cached-token")
+    assert len(deps.token_cache) == 0
@@ -0,0 +1,152 @@
+import asyncio
+import json
+import sys
+
+import pytest
+from sqlalchemy.orm import sessionmaker
+
+from app.core.batch import aiter_ndjson, load_profiles, run_batch, score_profiles, scoring_pool
+from app.core.catalog import catalog_cache
+from app.db import batch_recommend
+from app.core.scoring import compile_catalog, score_catalog
+from app.models.models import LLMModel, Recommendation, RecommendationItem
+
+from tests.test_scoring import make_catalog
+
+
+def test_load_profiles_accepts_json_arrays_and_ndjson():
+    assert load_profiles('[{"task_type": "qa"}, 3]') == [(0, {"task_type": "qa"}), (1, "Requirements must be a JSON object")]
+    profiles = load_profiles('{"task_type": "qa"}\n\nnot json\n{"deployment": "local"}\n')
+    assert profiles[0] == (0, {"task_type": "qa"})
+    assert profiles[1][0] == 1 and profiles[1][1].startswith("Invalid JSON")
+    assert profiles[2] == (2, {"deployment": "local"})
+
+
+def test_malformed_json_array_is_a_clean_error(tmp_path, monkeypatch):
+    with pytest.raises(ValueError, match="Invalid JSON array"):
+        load_profiles('[{"task_type": "qa"},')
+    path = tmp_path / "profiles.json"
+    path.write_text('[{"task_type": "qa"},')
+    monkeypatch.setattr(sys, "argv", ["batch_recommend", str(path)])
+    with pytest.raises(SystemExit) as exc:
+        batch_recommend.main()
+    assert str(exc.value).startswith(f"Could not read {path}: Invalid JSON array")
+
+
+def test_ndjson_is_decoded_as_it_arrives():
+    async def chunks():
+        for chunk in (b'{"task_type": "qa"}\n{"deploy', b'ment": "local"}\n\nnot json\n', b'{"n": 1}'):
+            yield chunk
+
+    async def decode():
+        return [profile async for profile in aiter_ndjson(chunks())]
+
+    profiles = asyncio.run(decode())
+    assert profiles[:2] == [(0, {"task_type": "qa"}), (1, {"deployment": "local"})]
+    assert profiles[2][0] == 2 and profiles[2][1].startswith("Invalid JSON")
+    assert profiles[3] == (3, {"n": 1})
+
+
+def test_score_profiles_across_processes_matches_inline_scoring():
+    profiles = [
+        {"task_type": task, "deployment": deployment}
+        for task in ["qa", "chat", "translation", "code_generation"]
+        for deployment in ["cloud", "local", "hybrid"]
+    ] * 3
+    # The pool outlives each batch; workers must not score with a stale catalog
+    for models in (50, 20):
+        catalog = compile_catalog(make_catalog(models, 3))
+        pairs = [pair for chunk in score_profiles(catalog, profiles, chunk_size=4, max_workers=2) for pair in chunk]
+        assert sorted(position for position, _ in pairs) == list(range(len(profiles)))
+        for position, results in pairs:
+            assert results == score_catalog(catalog, profiles[position])
+    executor = scoring_pool.get(2)
+    assert scoring_pool.get(2) is executor
+
+
+def test_run_batch_persists_every_profile(db_session):
+    db_session.add(LLMModel(name="Coder", provider="P", parameters=7.0, strengths="code",
+                            hardware_requirements="local"))
+    db_session.commit()
+    catalog_cache.invalidate()
+
+    profiles = load_profiles('[{"task_type": "code_generation"}, "bad", {"deployment": "local", "task_type": "code_generation"}]')
+    records = list(run_batch(db_session, None, profiles, chunk_size=10, max_workers=1))
+
+    assert records[0] == {"index": 1, "error": "Requirements must be a JSON object"}
+    assert [record["index"] for record in records[1:]] == [0, 2]
+    assert db_session.query(Recommendation).count() == 2
+    assert db_session.query(RecommendationItem).count() == 1
+    stored = db_session.get(Recommendation, records[2]["recommendation_id"])
+    assert stored.requirements == {"deployment": "local", "task_type": "code_generation"}
+    assert stored.items[0].score == records[2]["items"][0]["score"] == 40
+
+
+def test_insert_recommendation_uses_one_transaction_and_returns_ids(db_session):
+    from app.db.bulk import insert_recommendation
+
+    model = LLMModel(name="M", provider="P")
+    db_session.add(model)
+    db_session.commit()
+    results = [{"model_id": model.id, "score": s, "reasoning": f"r{s}"} for s in (50, 40, 35)]
+
+    recommendation_id, created_at, item_ids = insert_recommendation(db_session, None, {"task_type": "qa"}, results)
+    db_session.commit()
+
+    assert created_at is not None
+    stored = db_session.get(Recommendation, recommendation_id)
+    by_id = {item.id: item for item in stored.items}
+    assert [by_id[item_id].score for item_id in item_ids] == [50, 40, 35]
+
+
+def test_ndjson_endpoint_streams_results_while_reading_the_body(main_app, load_endpoint, engine, monkeypatch):
+    recommendations = load_endpoint("recommendations")
+    monkeypatch.setattr(recommendations, "SessionLocal", sessionmaker(bind=engine))
+    user = type("Principal", (), {"id": None})()
+    monkeypatch.setitem(main_app.dependency_overrides, recommendations.get_current_user, lambda: user)
+    db = sessionmaker(bind=engine)()
+    db.add(LLMModel(name="Coder", provider="P", parameters=7.0, strengths="code"))
+    db.commit()
+    catalog_cache.invalidate()
+
+    async def scenario():
+        results = []
+        sent = []
+        started = []
+
+        async def receive():
+            # The next part of the body is only sent once the first result is out
+            if len(sent) == 0:
+                sent.append(1)
+                return {"type": "http.request", "body": b'{"task_type": "code_generation"}\n', "more_body": True}
+            while not results:
+                await asyncio.sleep(0.01)
+            if len(sent) == 1:
+                sent.append(1)
+                return {"type": "http.request", "body": b'"bad"\n', "more_body": False}
+            await asyncio.sleep(10)
+            return {"type": "http.disconnect"}
+
+        async def send(message):
+            if message["type"] == "http.response.start":
+                started.append(message)
+            if message.get("body"):
+                results.extend(json.loads(line) for line in message["body"].splitlines())
+
+        # Through the application's whole middleware stack
+        scope = {
+            "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "scheme": "http",
+            "method": "POST", "path": "/api/v1/recommendations/batch", "raw_path": b"/api/v1/recommendations/batch",
+            "root_path": "", "query_string": b"chunk_size=1", "client": ("127.0.0.1", 50000),
+            "server": ("testserver", 80), "headers": [(b"content-type", b"application/x-ndjson")],
+        }
+        await asyncio.wait_for(main_app(scope, receive, send), 10)
+        return started, results
+
+    monkeypatch.setattr("app.core.batch.settings.BATCH_MAX_WORKERS", 1)
+    started, results = asyncio.run(scenario())
+    assert started[0]["status"] == 200
+    assert b"x-query-count" in dict(started[0]["headers"])
+    assert [result["index"] for result in results] == [0, 1]
+    assert results[1]["error"] == "Requirements must be a JSON object"
+    assert db.query(Recommendation).count() == 1
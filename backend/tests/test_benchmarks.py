@@ -0,0 +1,125 @@
+from sqlalchemy import select, text
+
+from app.db.benchmarks import (
+    benchmark_scores,
+    leaderboard,
+    remove_model_benchmarks,
+    rerank,
+    sync_model_benchmarks,
+)
+from app.models.models import LLMModel, ModelBenchmark
+
+
+def add_models(db, *blobs):
+    models = [
+        LLMModel(name=f"Model {i}", provider="Provider", performance_benchmarks=blob)
+        for i, blob in enumerate(blobs)
+    ]
+    db.add_all(models)
+    db.flush()
+    sync_model_benchmarks(db, models)
+    db.commit()
+    return models
+
+
+def ranks(db, benchmark):
+    return db.execute(
+        select(ModelBenchmark.model_id, ModelBenchmark.score, ModelBenchmark.rank, ModelBenchmark.percentile)
+        .where(ModelBenchmark.benchmark == benchmark)
+        .order_by(ModelBenchmark.rank, ModelBenchmark.model_id)
+    ).all()
+
+
+def test_only_numeric_scores_are_normalized():
+    blob = {"MMLU": 86.4, "GSM8K": 92, "passed": True, "notes": "n/a", "nested": {"a": 1}, "bad": float("nan")}
+    assert benchmark_scores(blob) == {"MMLU": 86.4, "GSM8K": 92.0}
+    assert benchmark_scores(None) == {}
+    assert benchmark_scores([1, 2]) == {}
+
+
+def test_ranks_follow_writes(db_session):
+    a, b, c = add_models(db_session, {"MMLU": 80, "GSM8K": 50}, {"MMLU": 90}, {"MMLU": 70})
+    assert ranks(db_session, "MMLU") == [(b.id, 90, 1, 100.0), (a.id, 80, 2, 50.0), (c.id, 70, 3, 0.0)]
+    assert ranks(db_session, "GSM8K") == [(a.id, 50, 1, 100.0)]
+
+    # Updating a blob re-ranks both the old and the new benchmarks
+    c.performance_benchmarks = {"MMLU": 95, "GSM8K": 60}
+    sync_model_benchmarks(db_session, [c])
+    db_session.commit()
+    assert [row.model_id for row in ranks(db_session, "MMLU")] == [c.id, b.id, a.id]
+    assert ranks(db_session, "GSM8K") == [(c.id, 60, 1, 100.0), (a.id, 50, 2, 0.0)]
+
+    a.performance_benchmarks = None
+    sync_model_benchmarks(db_session, [a])
+    db_session.commit()
+    assert ranks(db_session, "GSM8K") == [(c.id, 60, 1, 100.0)]
+
+    assert remove_model_benchmarks(db_session, c.id) == {"MMLU", "GSM8K"}
+    db_session.commit()
+    assert ranks(db_session, "MMLU") == [(b.id, 90, 1, 100.0)]
+    assert ranks(db_session, "GSM8K") == []
+
+
+def test_ties_share_the_best_rank(db_session):
+    a, b, c, d, e, f, g = add_models(
+        db_session,
+        {"MMLU": 90, "GSM8K": 50},
+        {"MMLU": 80},
+        {"MMLU": 80},
+        {"MMLU": 70},
+        {"MMLU": 60.5},
+        {"MMLU": 60.5},
+        {"MMLU": 60.5},
+    )
+    assert ranks(db_session, "MMLU") == [
+        (a.id, 90, 1, 100.0),
+        (b.id, 80, 2, 83.33),
+        (c.id, 80, 2, 83.33),
+        (d.id, 70, 4, 50.0),
+        (e.id, 60.5, 5, 33.33),
+        (f.id, 60.5, 5, 33.33),
+        (g.id, 60.5, 5, 33.33),
+    ]
+    # A single score is first place
+    assert ranks(db_session, "GSM8K") == [(a.id, 50, 1, 100.0)]
+
+
+def test_rerank_writes_only_changed_rows(db_session):
+    models = add_models(db_session, *({"MMLU": score} for score in [90, 80, 70, 60, 50]))
+    changes = lambda: db_session.scalar(text("SELECT total_changes()"))
+
+    before = changes()
+    rerank(db_session, ["MMLU"])
+    assert changes() == before
+
+    # Swapping the last two places moves only their rows
+    models[4].performance_benchmarks = {"MMLU": 65}
+    sync_model_benchmarks(db_session, [models[4]])
+    db_session.commit()
+    assert [row.model_id for row in ranks(db_session, "MMLU")] == [m.id for m in models[:3] + [models[4], models[3]]]
+    # The model's JSON, a delete and an insert of its row, then two rank updates
+    assert changes() - before == 5
+
+
+def test_leaderboard_pages_with_min_score(db_session):
+    models = add_models(db_session, *({"MMLU": score} for score in [70, 85, 90, 85, 60, 95]))
+    ids = [model.id for model in models]
+
+    first = db_session.execute(leaderboard("MMLU", min_score=80, limit=2)).all()
+    assert [(row.id, row.score, row.rank) for row in first] == [(ids[5], 95, 1), (ids[2], 90, 2)]
+    last = first[-1]
+    second = db_session.execute(leaderboard("MMLU", min_score=80, after=(last.score, last.id), limit=2)).all()
+    assert [(row.id, row.rank) for row in second] == [(ids[1], 3), (ids[3], 3)]
+    last = second[-1]
+    assert db_session.execute(leaderboard("MMLU", min_score=80, after=(last.score, last.id))).all() == []
+    assert db_session.execute(leaderboard("Unknown")).all() == []
+
+
+def test_leaderboard_is_an_index_range_scan(db_session):
+    add_models(db_session, {"MMLU": 80})
+    compiled = leaderboard("MMLU", min_score=80, after=(85.0, 3)).compile(
+        dialect=db_session.bind.dialect, compile_kwargs={"literal_binds": True}
+    )
+    plan = " ".join(row[-1] for row in db_session.execute(text(f"EXPLAIN QUERY PLAN {compiled}")))
+    assert "USING INDEX ix_model_benchmarks_benchmark_score" in plan
+    assert "TEMP B-TREE" not in plan  # no sort step
@@ -0,0 +1,106 @@
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from app.core.catalog import CatalogCache, GenerationCounter, create_generation_counter
+from app.models.models import LLMModel
+
+
+def add_model(db, **fields):
+    values = dict(name="Model", provider="Provider", parameters=7.0, strengths="code")
+    values.update(fields)
+    model = LLMModel(**values)
+    db.add(model)
+    db.commit()
+    return model
+
+
+def test_generation_counter_is_shared_through_the_file(tmp_path):
+    path = str(tmp_path / "catalog.generation")
+    writer, reader = GenerationCounter(path), GenerationCounter(path)
+    assert reader.read() == 0
+    assert writer.bump() == 1
+    assert writer.bump() == 2
+    assert reader.read() == 2
+
+
+def test_snapshot_is_reused_until_invalidated(tmp_path, db_session):
+    cache = CatalogCache(GenerationCounter(str(tmp_path / "catalog.generation")))
+    add_model(db_session, name="A")
+
+    first = cache.get(db_session)
+    assert [m.name for m in first.models] == ["A"]
+    assert cache.get(db_session) is first
+    assert (cache.hits, cache.misses, cache.rebuilds) == (1, 1, 1)
+
+    add_model(db_session, name="B")
+    assert cache.get(db_session) is first  # not invalidated yet
+
+    cache.invalidate()
+    second = cache.get(db_session)
+    assert second is not first
+    assert second.generation == first.generation + 1
+    assert sorted(second.by_id) == [m.id for m in second.models]
+    assert len(second.compiled) == 2
+    assert cache.stats()["rebuilds"] == 2
+
+
+def test_invalidation_from_another_worker_is_detected(tmp_path, db_session):
+    path = str(tmp_path / "catalog.generation")
+    worker_a = CatalogCache(GenerationCounter(path))
+    worker_b = CatalogCache(GenerationCounter(path))
+    seen = []
+    worker_b.subscribe(seen.append)
+
+    stale = worker_b.get(db_session)
+    add_model(db_session)
+    worker_a.invalidate()
+
+    fresh = worker_b.get(db_session)
+    assert fresh is not stale
+    assert len(fresh.models) == 1
+    assert seen == [stale, fresh]
+
+
+def test_etags_follow_row_content_not_generation(tmp_path, db_session):
+    first_host = CatalogCache(GenerationCounter(str(tmp_path / "a.generation")))
+    second_host = CatalogCache(GenerationCounter(str(tmp_path / "b.generation")))
+    a = add_model(db_session, name="A")
+    b = add_model(db_session, name="B")
+    second_host.invalidate()
+
+    before = first_host.get(db_session)
+    assert second_host.get(db_session).etag == before.etag
+
+    b.description = "changed"
+    db_session.commit()
+    first_host.invalidate()
+    after = first_host.get(db_session)
+    assert after.etag != before.etag
+    assert after.etags[a.id] == before.etags[a.id]
+    assert after.etags[b.id] != before.etags[b.id]
+
+
+def test_generation_backend_must_be_configured(tmp_path):
+    with pytest.raises(RuntimeError, match="CATALOG_GENERATION_FILE"):
+        create_generation_counter("file", "")
+    with pytest.raises(ValueError):
+        create_generation_counter("memcached")
+    counter = create_generation_counter("file", str(tmp_path / "catalog.generation"))
+    assert counter.bump() == 1
+
+
+def test_hit_and_miss_counts_survive_concurrent_reads(tmp_path, db_session):
+    cache = CatalogCache(GenerationCounter(str(tmp_path / "catalog.generation")))
+    add_model(db_session)
+    cache.get(db_session)
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)  # switch threads as often as possible
+    try:
+        with ThreadPoolExecutor(8) as pool:
+            list(pool.map(lambda _: cache.get(db_session), range(4000)))
+    finally:
+        sys.setswitchinterval(interval)
+    assert (cache.hits, cache.misses) == (4000, 1)
+    assert cache.stats()["hits"] == 4000
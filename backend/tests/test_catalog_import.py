@@ -0,0 +1,101 @@
+import io
+import json
+
+from sqlalchemy import select, text
+
+from app.core import catalog_import
+from app.core.catalog_import import import_stream, iter_csv_rows, iter_ndjson_rows, run_import
+from app.core.export import stream_export
+from app.db.exports import model_export
+from app.models.models import LLMModel, ModelBenchmark
+
+
+def ndjson(*rows):
+    return io.StringIO("".join((row if isinstance(row, str) else json.dumps(row)) + "\n" for row in rows))
+
+
+def catalog(db):
+    return db.execute(
+        select(LLMModel.name, LLMModel.provider, LLMModel.version, LLMModel.parameters).order_by(LLMModel.id)
+    ).all()
+
+
+def count_invalidations(monkeypatch):
+    calls = []
+    monkeypatch.setattr(catalog_import.catalog_cache, "invalidate", lambda: calls.append(1))
+    return calls
+
+
+def test_rows_are_decoded_with_line_numbers():
+    rows = list(iter_ndjson_rows(ndjson({"name": "A"}, "", "[1]", "{bad")))
+    assert [line for line, _ in rows] == [1, 3, 4]
+    assert rows[0][1] == {"name": "A"}
+    assert rows[1][1] == "Row must be a JSON object"
+    assert rows[2][1].startswith("Invalid JSON")
+
+    text_csv = 'id,name,provider,version,supported_languages\n7,A,P,,"[""English""]"\n8,B,P,v1,[oops\n'
+    rows = list(iter_csv_rows(io.StringIO(text_csv)))
+    assert rows[0] == (2, {"name": "A", "provider": "P", "supported_languages": ["English"]})
+    assert rows[1][0] == 3 and rows[1][1].startswith("Invalid JSON in supported_languages")
+
+
+def test_upsert_reports_errors_and_refreshes_once(db_session, monkeypatch):
+    invalidations = count_invalidations(monkeypatch)
+    result = import_stream(db_session, ndjson(
+        {"name": "A", "provider": "P", "parameters": 7, "performance_benchmarks": {"MMLU": 70}},
+        {"name": "A", "provider": "P", "version": "2", "parameters": 13},
+        {"name": "B"},
+        {"name": "C", "provider": "P", "parameters": "many"},
+        {"name": "D", "provider": "P", "performance_benchmarks": {"MMLU": 90}},
+    ), "ndjson", batch_size=2)
+    assert (result["processed"], result["upserted"], result["error_count"]) == (5, 3, 2)
+    assert [error["line"] for error in result["errors"]] == [3, 4]
+    assert "provider" in result["errors"][0]["error"]
+    assert catalog(db_session) == [("A", "P", None, 7.0), ("A", "P", "2", 13.0), ("D", "P", None, None)]
+    assert len(invalidations) == 1
+
+    # Same identities update in place, including a NULL version; the last
+    # duplicate within a batch wins
+    result = run_import(db_session, [
+        (1, {"name": "A", "provider": "P", "parameters": 8, "performance_benchmarks": {"MMLU": 95}}),
+        (2, {"name": "D", "provider": "P", "parameters": 1}),
+        (3, {"name": "D", "provider": "P", "parameters": 2}),
+    ])
+    assert result["upserted"] == 2
+    assert catalog(db_session) == [("A", "P", None, 8.0), ("A", "P", "2", 13.0), ("D", "P", None, 2.0)]
+    ranks = db_session.execute(select(ModelBenchmark.score, ModelBenchmark.rank).order_by(ModelBenchmark.rank)).all()
+    assert ranks == [(95.0, 1)]  # D no longer has a score
+    assert len(invalidations) == 2
+
+
+def test_rejected_rows_do_not_abort_their_batch(db_session, monkeypatch):
+    count_invalidations(monkeypatch)
+    db_session.execute(text(
+        "CREATE TRIGGER reject_bad BEFORE INSERT ON llm_models WHEN NEW.name = 'Bad' "
+        "BEGIN SELECT RAISE(ABORT, 'bad row'); END"
+    ))
+    result = run_import(db_session, [
+        (1, {"name": "A", "provider": "P"}),
+        (2, {"name": "Bad", "provider": "P"}),
+        (3, {"name": "C", "provider": "P"}),
+    ])
+    assert result["upserted"] == 2
+    assert result["errors"] == [{"line": 2, "error": "Rejected by the database: bad row"}]
+    assert [row.name for row in catalog(db_session)] == ["A", "C"]
+
+
+def test_export_round_trips(db_session, monkeypatch):
+    count_invalidations(monkeypatch)
+    db_session.add_all([
+        LLMModel(name="A", provider="P", version="1", parameters=7.0, supported_languages=["English"],
+                 performance_benchmarks={"MMLU": 80}, license_type="open_source"),
+        LLMModel(name="B", provider="P", pricing_info='Free, "forever"'),
+    ])
+    db_session.commit()
+    before = db_session.execute(model_export()).all()
+    for export_format in ("csv", "ndjson"):
+        data = b"".join(stream_export(db_session, model_export(), export_format)).decode()
+        result = import_stream(db_session, io.StringIO(data, newline=""), export_format)
+        assert (result["upserted"], result["error_count"]) == (2, 0)
+    after = db_session.execute(model_export()).all()
+    assert [row[:-1] for row in after] == [row[:-1] for row in before]  # only updated_at changes
@@ -0,0 +1,98 @@
+import asyncio
+import csv
+import io
+import json
+
+from sqlalchemy import select
+from sqlalchemy.orm import sessionmaker
+
+from app.core import export
+from app.core.catalog_import import iter_csv_rows
+from app.core.export import encode_csv, export_response, stream_export
+from app.db.exports import model_export, recommendation_export
+from app.models.models import LLMModel, Recommendation, RecommendationItem, User
+
+
+def seed(db):
+    users = [User(email=f"u{i}@example.com", username=f"u{i}", hashed_password="x") for i in range(2)]
+    model = LLMModel(name="Model", provider="P", supported_languages=["English"], performance_benchmarks={"MMLU": 80})
+    db.add_all(users + [model])
+    db.flush()
+    for i in range(5):
+        recommendation = Recommendation(user_id=users[i % 2].id, requirements={"task_type": "qa", "n": i})
+        db.add(recommendation)
+        db.flush()
+        for _ in range(i % 3):
+            db.add(RecommendationItem(recommendation_id=recommendation.id, model_id=model.id, score=40.0, reasoning="Fits, well."))
+    db.commit()
+    return users
+
+
+def test_ndjson_export_streams_in_batches(db_session):
+    users = seed(db_session)
+    chunks = list(stream_export(db_session, recommendation_export(), "ndjson", batch_size=2))
+    rows = [json.loads(line) for chunk in chunks for line in chunk.splitlines()]
+    assert len(chunks) == 3  # 6 rows, 2 per batch
+    # Recommendations without items still appear, once
+    assert [(row["requirements"]["n"], row["item_id"] is not None) for row in rows] == [
+        (0, False), (1, True), (2, True), (2, True), (3, False), (4, True),
+    ]
+    own = [json.loads(line) for chunk in stream_export(db_session, recommendation_export(users[1].id), "ndjson")
+           for line in chunk.splitlines()]
+    assert {row["user_id"] for row in own} == {users[1].id}
+    assert [row["requirements"]["n"] for row in own] == [1, 3]
+
+
+def test_csv_export_embeds_json_columns(db_session):
+    seed(db_session)
+    text = b"".join(stream_export(db_session, model_export(), "csv")).decode()
+    header, row = list(csv.reader(io.StringIO(text)))
+    record = dict(zip(header, row))
+    assert header[:3] == ["id", "name", "provider"]
+    assert json.loads(record["supported_languages"]) == ["English"]
+    assert json.loads(record["performance_benchmarks"]) == {"MMLU": 80}
+    assert record["version"] == ""
+
+    items = list(csv.DictReader(io.StringIO(b"".join(stream_export(db_session, recommendation_export(), "csv")).decode())))
+    assert items[1]["reasoning"] == "Fits, well."
+
+
+def test_csv_escapes_formulas_and_import_restores_them():
+    values = ["=HYPERLINK(\"x\")", "+1", "-2 bits", "@SUM(A1)", "'=quoted", "plain", "it's", "\tTab"]
+    text = encode_csv([["description"]] + [[value] for value in values]).decode()
+    cells = [row[0] for row in csv.reader(io.StringIO(text))][1:]
+    assert cells[:6] == ["'=HYPERLINK(\"x\")", "'+1", "'-2 bits", "'@SUM(A1)", "''=quoted", "plain"]
+    assert [row["description"] for _, row in iter_csv_rows(io.StringIO(text))] == values
+    assert encode_csv([[-3, 1.5]]) == b"-3,1.5\r\n"  # numbers are left alone
+
+
+def test_disconnect_closes_the_export_session(engine, monkeypatch):
+    sessions = []
+
+    def tracked_session():
+        db = sessionmaker(bind=engine)()
+        sessions.append(db)
+        return db
+
+    monkeypatch.setattr(export, "SessionLocal", tracked_session)
+    closed = []
+    monkeypatch.setattr(export.Session, "close", lambda db: closed.append(db))
+    response = export_response(select(LLMModel.id), "csv", "models")
+
+    async def scenario():
+        sent = asyncio.Event()
+
+        async def receive():
+            await sent.wait()
+            return {"type": "http.disconnect"}
+
+        async def send(message):
+            if message.get("body"):
+                sent.set()
+                await asyncio.sleep(1)  # the client is gone before the next chunk
+
+        await response({"type": "http"}, receive, send)
+
+    # The suspended stream is closed while the response is still referenced
+    asyncio.run(scenario())
+    assert len(sessions) == 1 and closed == sessions
@@ -0,0 +1,21 @@
+import pytest
+from fastapi import HTTPException
+
+from app.core.fieldsets import SUMMARY_FIELDS, parse_fields, wants_summary
+
+
+def test_parse_fields():
+    assert parse_fields(None) is None
+    assert parse_fields("summary") == SUMMARY_FIELDS
+    assert parse_fields("name, description") == {"id", "name", "description"}
+    assert parse_fields("summary,strengths") == SUMMARY_FIELDS | {"strengths"}
+    with pytest.raises(HTTPException) as excinfo:
+        parse_fields("name,hashed_password")
+    assert excinfo.value.status_code == 400
+
+
+def test_wants_summary():
+    assert wants_summary(None) is False
+    assert wants_summary("summary") is True
+    with pytest.raises(HTTPException):
+        wants_summary("name")
@@ -0,0 +1,72 @@
+import asyncio
+
+import pytest
+from passlib.context import CryptContext
+
+from app.core import security
+from app.core.config import settings
+from app.core.hashing import PasswordHasher, PasswordHasherBusy
+
+
+@pytest.fixture
+def hasher():
+    hasher = PasswordHasher(max_workers=0, max_pending=4)
+    yield hasher
+    hasher.shutdown()
+
+
+def test_hash_and_verify(hasher):
+    async def run():
+        hashed = await hasher.hash("secret")
+        return hashed, await hasher.verify("secret", hashed), await hasher.verify("wrong", hashed)
+
+    hashed, good, bad = asyncio.run(run())
+    assert hashed.startswith("$2b$%02d$" % settings.BCRYPT_ROUNDS)
+    assert good is True
+    assert bad is False
+    assert hasher.stats()["completed"] == 3
+    assert hasher.stats()["queue_depth"] == 0
+
+
+def test_rehash_when_cost_changes(hasher):
+    old_cost = 4 if settings.BCRYPT_ROUNDS != 4 else 5
+    old_hash = CryptContext(schemes=["bcrypt"], bcrypt__rounds=old_cost).hash("secret")
+
+    verified, new_hash = asyncio.run(hasher.verify_and_update("secret", old_hash))
+    assert verified is True
+    assert new_hash.startswith("$2b$%02d$" % settings.BCRYPT_ROUNDS)
+    assert security.verify_password("secret", new_hash)
+    assert hasher.stats()["rehashed"] == 1
+
+    current = security.get_password_hash("secret")
+    assert asyncio.run(hasher.verify_and_update("secret", current)) == (True, None)
+
+
+def test_rejects_when_queue_is_full():
+    hasher = PasswordHasher(max_workers=0, max_pending=1)
+    hashed = security.get_password_hash("secret")
+
+    async def run():
+        return await asyncio.gather(
+            hasher.verify("secret", hashed),
+            hasher.verify("secret", hashed),
+            return_exceptions=True,
+        )
+
+    try:
+        first, second = asyncio.run(run())
+    finally:
+        hasher.shutdown()
+    assert first is True
+    assert isinstance(second, PasswordHasherBusy)
+    assert hasher.stats()["rejected"] == 1
+
+
+def test_process_pool_executor():
+    hasher = PasswordHasher(max_workers=1, max_pending=4)
+    try:
+        hashed = asyncio.run(hasher.hash("secret"))
+    finally:
+        hasher.shutdown()
+    assert security.verify_password("secret", hashed)
+    assert hasher.stats()["executor"] == "process"
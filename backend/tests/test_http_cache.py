@@ -0,0 +1,34 @@
+from starlette.requests import Request
+
+from app.core.http_cache import etag_matches, make_etag, not_modified
+
+
+def request_with(if_none_match=None):
+    headers = []
+    if if_none_match is not None:
+        headers.append((b"if-none-match", if_none_match.encode()))
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": headers})
+
+
+def test_make_etag_is_strong_and_stable():
+    etag = make_etag("a", 1)
+    assert etag.startswith('"') and etag.endswith('"')
+    assert etag == make_etag("a", 1)
+    assert etag != make_etag("a", 2)
+
+
+def test_if_none_match():
+    etag = make_etag("catalog")
+    assert not etag_matches(request_with(), etag)
+    assert etag_matches(request_with(etag), etag)
+    assert etag_matches(request_with(f'"other", W/{etag}'), etag)
+    assert etag_matches(request_with("*"), etag)
+    assert not etag_matches(request_with('"other"'), etag)
+
+
+def test_not_modified_keeps_validators():
+    response = not_modified('"abc"', "public, max-age=60")
+    assert response.status_code == 304
+    assert response.body == b""
+    assert response.headers["etag"] == '"abc"'
+    assert response.headers["cache-control"] == "public, max-age=60"
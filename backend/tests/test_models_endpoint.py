@@ -0,0 +1,41 @@
+import pytest
+from fastapi import HTTPException
+
+from app.models.models import LLMModel
+from app.schemas.schemas import LLMModelCreate, LLMModelUpdate
+
+
+@pytest.fixture
+def models(load_endpoint, monkeypatch):
+    module = load_endpoint("models")
+    monkeypatch.setattr(module.catalog_cache, "invalidate", lambda: None)
+    return module
+
+
+def test_identity_conflicts_are_rejected(models, db_session):
+    create = lambda **fields: models.create_model(LLMModelCreate(**fields), None, db_session)
+    first = create(name="A", provider="P")
+    create(name="A", provider="P", version="2")
+
+    # An empty version is the same identity as no version
+    with pytest.raises(HTTPException) as exc:
+        create(name="A", provider="P", version="")
+    assert exc.value.status_code == 400
+
+    # Renaming onto another model's identity is a 400, saving itself is not
+    with pytest.raises(HTTPException) as exc:
+        models.update_model(first.id, LLMModelUpdate(name="A", provider="P", version="2"), None, db_session)
+    assert exc.value.status_code == 400
+    updated = models.update_model(first.id, LLMModelUpdate(name="A", provider="P", parameters=7), None, db_session)
+    assert updated.parameters == 7
+
+
+def test_integrity_error_maps_to_400(models, db_session, monkeypatch):
+    # A concurrent insert that lands after the pre-check
+    first = models.create_model(LLMModelCreate(name="A", provider="P"), None, db_session)
+    monkeypatch.setattr(models, "_check_identity", lambda *args, **kwargs: None)
+    with pytest.raises(HTTPException) as exc:
+        models.create_model(LLMModelCreate(name="A", provider="P"), None, db_session)
+    assert exc.value.status_code == 400
+    assert db_session.query(LLMModel).count() == 1
+    assert db_session.get(LLMModel, first.id).name == "A"
@@ -0,0 +1,82 @@
+import asyncio
+import json
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from app.api.deps import Principal
+from app.core.pagination import decode_cursor, encode_cursor
+from app.db.queries import user_recommendations
+from app.db.session import Base
+from app.models.models import Recommendation, User
+
+
+def test_cursor_round_trip():
+    key = [datetime(2025, 5, 14, 10, 30, 0, 123456), 42]
+    cursor = encode_cursor(key)
+    assert "=" not in cursor
+    assert decode_cursor(cursor, (datetime, int)) == key
+    assert decode_cursor(encode_cursor([90, 3]), (float, int)) == [90.0, 3]
+
+
+@pytest.mark.parametrize("cursor, types", [
+    ("not-a-cursor", (int,)),
+    (encode_cursor([1, 2]), (int,)),
+    (encode_cursor(["a"]), (int,)),
+    (encode_cursor([True]), (int,)),
+    (encode_cursor([1.5]), (int,)),
+    (encode_cursor([{"x": 1}, 2]), (datetime, int)),
+    (encode_cursor([{"dt": "yesterday"}, 2]), (datetime, int)),
+    (encode_cursor([datetime(2025, 1, 1), "2"]), (datetime, int)),
+    (encode_cursor(["high", 2]), (float, int)),
+    (encode_cursor([None, 2]), (float, int)),
+])
+def test_malformed_cursor_is_rejected(cursor, types):
+    with pytest.raises(HTTPException) as exc:
+        decode_cursor(cursor, types)
+    assert exc.value.status_code == 400
+
+
+def test_keyset_pages_cover_history_once_in_order(load_endpoint, tmp_path):
+    recommendations = load_endpoint("recommendations")
+
+    async def scenario():
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'pages.db'}")
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        async with AsyncSession(engine, expire_on_commit=False) as db:
+            user = User(email="user@example.com", username="user", hashed_password="x")
+            db.add(user)
+            await db.flush()
+            start = datetime(2025, 1, 1)
+            # Pairs of rows share a timestamp so ties are broken by id
+            db.add_all(
+                Recommendation(user_id=user.id, requirements={}, created_at=start + timedelta(minutes=i // 2))
+                for i in range(11)
+            )
+            await db.commit()
+            principal = Principal.from_user(user)
+
+            seen, cursor = [], ""
+            while cursor is not None:
+                response = await recommendations.read_recommendations(
+                    limit=4, cursor=cursor, fields="summary", current_user=principal, db=db
+                )
+                page = json.loads(response.body)
+                seen.extend(item["id"] for item in page["items"])
+                cursor = page["next_cursor"]
+
+            expected = (await db.scalars(user_recommendations(user.id))).all()
+            assert seen == [r.id for r in expected]
+            assert len(set(seen)) == 11
+
+            with pytest.raises(HTTPException) as exc:
+                await recommendations.read_recommendations(
+                    limit=4, cursor=encode_cursor(["a"]), fields=None, current_user=principal, db=db
+                )
+            assert exc.value.status_code == 400
+        await engine.dispose()
+
+    asyncio.run(scenario())
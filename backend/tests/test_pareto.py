@@ -0,0 +1,100 @@
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from fastapi import HTTPException
+
+from app.core.catalog import CatalogSnapshot
+from app.core.pareto import (
+    candidate_mask,
+    compile_objectives,
+    cost_tier,
+    pareto_front,
+    resolve_objectives,
+    skyline,
+)
+
+
+def make_snapshot(*rows):
+    models = []
+    for i, (parameters, pricing_info, license_type, benchmarks) in enumerate(rows):
+        models.append(SimpleNamespace(
+            id=i + 1, name=f"Model {i + 1}", provider="Provider", version=None, parameters=parameters,
+            description=None, training_data=None, strengths=None, weaknesses=None,
+            license_type=license_type, pricing_info=pricing_info, hardware_requirements=None,
+            supported_languages=None, performance_benchmarks=benchmarks,
+            created_at=datetime(2024, 1, 1, tzinfo=timezone.utc), updated_at=None,
+        ))
+    return CatalogSnapshot.build(models, 1)
+
+
+def brute_force_skyline(points):
+    return [
+        i for i, point in enumerate(points)
+        if not ((points <= point).all(axis=1) & (points < point).any(axis=1)).any()
+    ]
+
+
+def test_cost_tiers():
+    assert cost_tier("Free for research and commercial use.") == 0
+    assert cost_tier("Lower cost per token than Claude Opus.") == 1
+    assert cost_tier("Pay-per-token model with higher cost. Enterprise licensing available.") == 3
+    assert cost_tier("Available through Google Cloud with various pricing tiers.") == 2
+    assert cost_tier("Commercial use follows license terms.") is None  # "follows" is not "low"
+    assert cost_tier(None) is None
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_skyline_matches_brute_force(seed):
+    rng = np.random.default_rng(seed)
+    for _ in range(20):
+        points = rng.integers(0, 6, (rng.integers(1, 300), rng.integers(1, 6)))
+        block_size = int(rng.integers(1, 8))
+        assert sorted(skyline(points, block_size=block_size).tolist()) == brute_force_skyline(points)
+    assert skyline(np.empty((0, 3), dtype=np.int32)).size == 0
+
+
+SNAPSHOT = make_snapshot(
+    (7.0, "Free for research", "open_source", {"MMLU": 60.0, "GSM8K": 40.0}),
+    (70.0, "Free for research", "open_source", {"MMLU": 80.0, "GSM8K": 70.0}),
+    (70.0, "Low cost per token", "commercial", {"MMLU": 75.0, "GSM8K": 65.0}),  # dominated by 2
+    (1500.0, "Enterprise plans", "commercial", {"MMLU": 86.0, "GSM8K": 92.0}),
+    (13.0, None, "open_source", {"MMLU": 70.0}),  # no GSM8K, no cost tier
+    (7.0, "Free for research", "open_source", {"MMLU": 60.0, "GSM8K": 40.0}),  # duplicate of 1
+)
+
+
+def front_ids(objectives, **constraints):
+    columns = compile_objectives(SNAPSHOT)
+    resolved = resolve_objectives(columns, objectives)
+    total, front, values = pareto_front(columns, resolved, candidate_mask(columns, **constraints))
+    return total, [SNAPSHOT.models[i].id for i in front], values
+
+
+def test_front_trades_quality_against_size_and_cost():
+    total, ids, values = front_ids([("MMLU", None), ("GSM8K", None), ("parameters", None), ("cost", None)])
+    assert total == 5  # model 5 lacks GSM8K and a cost tier
+    # Best MMLU first; duplicates are both kept
+    assert ids == [4, 2, 1, 6]
+    assert values[0].tolist() == [86.0, 92.0, 1500.0, 3.0]
+
+
+def test_directions_and_constraints():
+    assert front_ids([("MMLU", None), ("parameters", None)])[1] == [4, 2, 5, 1, 6]
+    # Asking for the largest models flips the size trade-off
+    assert front_ids([("MMLU", None), ("parameters", "max")])[1] == [4]
+    assert front_ids([("MMLU", None)], max_cost_tier=1)[1] == [2]
+    assert front_ids([("MMLU", None)], license_types=["commercial"], max_parameters=100)[1] == [3]
+    assert front_ids([("MMLU", None)], min_scores={"GSM8K": 80})[1] == [4]
+    assert front_ids([("MMLU", None)], min_scores={"Unknown": 1})[:2] == (0, [])
+
+
+def test_unknown_and_duplicate_objectives_are_rejected():
+    columns = compile_objectives(SNAPSHOT)
+    for objectives in ([("Unknown", None)], [("MMLU", None), ("MMLU", "min")]):
+        with pytest.raises(HTTPException) as exc:
+            resolve_objectives(columns, objectives)
+        assert exc.value.status_code == 400
@@ -0,0 +1,105 @@
+import asyncio
+
+import pytest
+from sqlalchemy import create_engine, exc, text
+from sqlalchemy.engine import make_url
+
+from app.db.pool import (
+    InstrumentedQueuePool,
+    pool_options,
+    pool_stats,
+    warm_up,
+    warm_up_async,
+)
+
+
+def file_engine(tmp_path, **overrides):
+    url = make_url(f"sqlite:///{tmp_path / 'pool.db'}")
+    options = {**pool_options(url), **overrides}
+    return create_engine(url, **options)
+
+
+def test_memory_sqlite_keeps_default_pool():
+    assert pool_options(make_url("sqlite://")) == {}
+    assert pool_options(make_url("sqlite:///:memory:")) == {}
+
+
+def test_pool_stats_track_checkouts_and_overflow(tmp_path):
+    engine = file_engine(tmp_path, pool_size=1, max_overflow=1)
+    assert isinstance(engine.pool, InstrumentedQueuePool)
+
+    first = engine.connect()
+    second = engine.connect()
+    stats = pool_stats(engine)
+    assert stats["checked_out"] == 2
+    assert stats["overflow"] == 1
+    assert stats["max_overflow"] == 1
+    assert stats["checkouts"] == 2
+    first.close()
+    second.close()
+
+    stats = pool_stats(engine)
+    assert stats["checked_out"] == 0
+    assert stats["wait_ms_max"] >= stats["wait_ms_avg"] >= 0
+
+
+def test_pool_timeout_is_counted(tmp_path):
+    engine = file_engine(tmp_path, pool_size=1, max_overflow=0, pool_timeout=0.01)
+    with engine.connect():
+        with pytest.raises(exc.TimeoutError):
+            engine.connect()
+    assert pool_stats(engine)["timeouts"] == 1
+
+
+def test_warm_up_fills_the_pool(tmp_path):
+    engine = file_engine(tmp_path, pool_size=3)
+    warm_up(engine, 3)
+    stats = pool_stats(engine)
+    assert stats["checked_in"] == 3
+    assert stats["checked_out"] == 0
+
+
+def test_async_warm_up(tmp_path):
+    pytest.importorskip("aiosqlite")
+    from sqlalchemy.ext.asyncio import create_async_engine
+
+    url = make_url(f"sqlite+aiosqlite:///{tmp_path / 'pool.db'}")
+    engine = create_async_engine(url, **pool_options(url, is_async=True))
+
+    async def run():
+        await warm_up_async(engine, 2)
+        async with engine.connect() as connection:
+            assert (await connection.execute(text("select 1"))).scalar() == 1
+        await engine.dispose()
+
+    asyncio.run(run())
+    assert pool_stats(engine.sync_engine)["class"] == "InstrumentedAsyncQueuePool"
+
+
+def test_failed_async_warm_up_returns_opened_connections(tmp_path):
+    pytest.importorskip("aiosqlite")
+    from sqlalchemy.ext.asyncio import create_async_engine
+
+    url = make_url(f"sqlite+aiosqlite:///{tmp_path / 'pool.db'}")
+    engine = create_async_engine(url, **pool_options(url, is_async=True))
+    connects = []
+    original = engine.sync_engine.pool._creator
+
+    def flaky_creator(*args):
+        connects.append(1)
+        if len(connects) == 2:
+            raise OSError("connection refused")
+        return original(*args)
+
+    engine.sync_engine.pool._creator = flaky_creator
+
+    async def run():
+        with pytest.raises(OSError):
+            await warm_up_async(engine, 3)
+        stats = pool_stats(engine.sync_engine)
+        await engine.dispose()
+        return stats
+
+    stats = asyncio.run(run())
+    assert stats["checked_out"] == 0
+    assert stats["checked_in"] == 2
@@ -0,0 +1,77 @@
+import pytest
+from sqlalchemy import event
+
+from app.db import query_counter
+from app.db.queries import user_recommendation, user_recommendations, user_saved_models
+from app.models.models import LLMModel, Recommendation, RecommendationItem, SavedModel, User
+from app.schemas.schemas import (
+    RecommendationResponse,
+    RecommendationSummaryResponse,
+    SavedModelResponse,
+    SavedModelSummaryResponse,
+)
+
+
+@pytest.fixture
+def history(engine, db_session):
+    query_counter.install(engine)
+    user = User(email="user@example.com", username="user", hashed_password="x")
+    models = [LLMModel(name=f"Model {i}", provider="P", supported_languages=["English"]) for i in range(8)]
+    db_session.add_all([user, *models])
+    db_session.flush()
+    for i in range(20):
+        recommendation = Recommendation(user_id=user.id, requirements={"task_type": "qa"})
+        recommendation.items = [
+            RecommendationItem(model_id=models[(i + j) % len(models)].id, score=50, reasoning="Fits.")
+            for j in range(5)
+        ]
+        db_session.add(recommendation)
+    db_session.add_all(SavedModel(user_id=user.id, model_id=model.id) for model in models)
+    db_session.commit()
+    user_id = user.id
+    db_session.expunge_all()
+    return user_id
+
+
+@pytest.mark.parametrize("page_size", [1, 10, 20])
+def test_recommendation_history_page_has_fixed_query_budget(db_session, history, page_size):
+    with query_counter.count_queries() as counter:
+        page = db_session.scalars(user_recommendations(history).limit(page_size)).all()
+        body = [RecommendationResponse.model_validate(r).model_dump() for r in page]
+    assert len(body) == page_size
+    assert all(len(r["items"]) == 5 for r in body)
+    assert counter.count == 3
+
+
+def test_recommendation_detail_has_fixed_query_budget(db_session, history):
+    first_id = db_session.scalars(user_recommendations(history)).first().id
+    db_session.expunge_all()
+    with query_counter.count_queries() as counter:
+        RecommendationResponse.model_validate(db_session.scalars(user_recommendation(history, first_id)).one())
+    assert counter.count == 3
+
+
+def test_saved_models_have_fixed_query_budget(db_session, history):
+    with query_counter.count_queries() as counter:
+        saved = [SavedModelResponse.model_validate(s) for s in db_session.scalars(user_saved_models(history))]
+    assert len(saved) == 8
+    assert counter.count == 2
+
+
+def test_summary_projection_skips_large_model_columns(engine, db_session, history):
+    statements = []
+    listener = lambda conn, cursor, statement, *args: statements.append(statement)
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        with query_counter.count_queries() as counter:
+            page = db_session.scalars(user_recommendations(history, summary=True).limit(5)).all()
+            body = [RecommendationSummaryResponse.model_validate(r).model_dump() for r in page]
+            saved = [SavedModelSummaryResponse.model_validate(s) for s in db_session.scalars(user_saved_models(history, summary=True))]
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+    assert counter.count == 5
+    assert set(body[0]["items"][0]["model"]) == {"id", "name", "provider", "parameters", "license_type"}
+    assert len(saved) == 8
+    model_selects = [s for s in statements if "FROM llm_models" in s]
+    assert model_selects
+    assert not any("description" in s or "training_data" in s for s in model_selects)
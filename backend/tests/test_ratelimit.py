@@ -0,0 +1,143 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from starlette.requests import Request
+
+from app.core.config import settings
+from app.core.ratelimit import MemoryBackend, RateLimiter, client_address, create_backend, retry_after_header
+from app.db.session import Base
+from app.models.models import User
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def hit(limiter, key):
+    return asyncio.run(limiter.hit(key))
+
+
+def test_bucket_allows_burst_then_refills():
+    clock = FakeClock()
+    limiter = RateLimiter(MemoryBackend(clock=clock), "login", capacity=3, refill_per_minute=6)
+
+    assert [hit(limiter, "alice")[0] for _ in range(4)] == [True, True, True, False]
+    allowed, retry_after = hit(limiter, "alice")
+    assert not allowed
+    assert retry_after == pytest.approx(10)
+
+    # Other keys have their own bucket
+    assert hit(limiter, "bob")[0]
+
+    clock.now += 10
+    assert hit(limiter, "alice")[0]
+    assert not hit(limiter, "alice")[0]
+    assert limiter.stats()["rejected"] == 3
+
+
+def test_refill_is_capped_at_capacity():
+    clock = FakeClock()
+    limiter = RateLimiter(MemoryBackend(clock=clock), "login", capacity=2, refill_per_minute=60)
+    hit(limiter, "alice")
+    clock.now += 3600
+    assert [hit(limiter, "alice")[0] for _ in range(3)] == [True, True, False]
+
+
+def test_reset_refills_bucket():
+    limiter = RateLimiter(MemoryBackend(), "login", capacity=1, refill_per_minute=1)
+    hit(limiter, "alice")
+    assert not hit(limiter, "alice")[0]
+    asyncio.run(limiter.reset("alice"))
+    assert hit(limiter, "alice")[0]
+
+
+def test_refund_returns_one_token_up_to_capacity():
+    limiter = RateLimiter(MemoryBackend(), "login", capacity=2, refill_per_minute=1)
+    hit(limiter, "alice")
+    hit(limiter, "alice")
+    asyncio.run(limiter.refund("alice"))
+    asyncio.run(limiter.refund("alice"))
+    asyncio.run(limiter.refund("alice"))
+    assert [hit(limiter, "alice")[0] for _ in range(3)] == [True, True, False]
+
+
+def make_request(peer="10.0.0.9", forwarded=()):
+    headers = [(b"x-forwarded-for", value.encode()) for value in forwarded]
+    return Request({"type": "http", "headers": headers, "client": (peer, 1234)})
+
+
+def test_client_address_trusts_only_configured_proxies(monkeypatch):
+    request = make_request(forwarded=["1.1.1.1, 2.2.2.2", "3.3.3.3"])
+    assert client_address(request) == "10.0.0.9"  # header ignored by default
+
+    monkeypatch.setattr(settings, "FORWARDED_FOR_HEADER", "X-Forwarded-For")
+    assert client_address(request) == "3.3.3.3"
+    monkeypatch.setattr(settings, "TRUSTED_PROXY_HOPS", 2)
+    assert client_address(request) == "2.2.2.2"
+    # Fewer entries than trusted proxies: not forwarded by them
+    assert client_address(make_request(forwarded=["1.1.1.1"])) == "10.0.0.9"
+
+
+def test_only_failed_logins_are_throttled(load_endpoint, monkeypatch, tmp_path):
+    auth = load_endpoint("auth")
+    backend = MemoryBackend()
+    monkeypatch.setattr(auth, "login_ip_limiter", RateLimiter(backend, "login-ip", 3, 0.001))
+    monkeypatch.setattr(auth, "login_account_limiter", RateLimiter(backend, "login-account", 5, 0.001))
+
+    async def verify_and_update(password, hashed_password):
+        return password == "right", None
+
+    monkeypatch.setattr(auth.password_hasher, "verify_and_update", verify_and_update)
+
+    async def scenario():
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'login.db'}")
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        async with AsyncSession(engine, expire_on_commit=False) as db:
+            db.add(User(email="victim@example.com", username="victim", hashed_password="x"))
+            await db.commit()
+
+            async def login(password, peer="10.0.0.1"):
+                form = SimpleNamespace(username="victim", password=password)
+                try:
+                    await auth.login_for_access_token(make_request(peer), db, form)
+                    return 200
+                except HTTPException as exc:
+                    return exc.status_code
+
+            # Successful logins don't use up the IP's or the account's budget
+            assert [await login("right") for _ in range(6)] == [200] * 6
+            # Failures from one client lock out that client
+            assert [await login("wrong", "10.0.0.2") for _ in range(4)] == [401, 401, 401, 429]
+            assert await login("right") == 200
+            # Failures spread over many clients still exhaust the account
+            assert [await login("wrong", f"10.0.1.{peer}") for peer in range(3)] == [401, 401, 429]
+            assert await login("right") == 429
+        await engine.dispose()
+
+    asyncio.run(scenario())
+
+
+def test_memory_backend_is_bounded():
+    backend = MemoryBackend(maxsize=2)
+    limiter = RateLimiter(backend, "login", capacity=1, refill_per_minute=1)
+    for key in ("a", "b", "c"):
+        hit(limiter, key)
+    assert len(backend._buckets) == 2
+
+
+def test_retry_after_header_rounds_up():
+    assert retry_after_header(0.2) == {"Retry-After": "1"}
+    assert retry_after_header(12.1) == {"Retry-After": "13"}
+
+
+def test_unknown_backend():
+    with pytest.raises(ValueError):
+        create_backend("memcached")
@@ -0,0 +1,65 @@
+from app.core import recommender
+from app.core.cache import LRUCache
+from app.core.catalog import catalog_cache
+from app.core.recommender import match_models, recommendation_cache, requirements_key
+from app.models.models import LLMModel
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_lru_cache_evicts_least_recently_used_and_expired_entries():
+    clock = FakeClock()
+    cache = LRUCache(maxsize=2, ttl=10, clock=clock)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+
+    clock.now = 11
+    assert cache.get("a") is None
+    assert cache.stats()["evictions"] == 1
+
+
+def test_requirements_key_ignores_irrelevant_differences():
+    base = {"task_type": "qa", "language_support": "specific", "specific_languages": ["French", "english"]}
+    same = {
+        "specific_languages": ["ENGLISH", "french", "French"],
+        "language_support": "specific",
+        "task_type": "qa",
+        "notes": "not scored",
+    }
+    assert requirements_key(base, 1) == requirements_key(same, 1)
+    assert requirements_key(base, 1) != requirements_key(base, 2)
+    assert requirements_key(base, 1) != requirements_key(dict(base, task_type="chat"), 1)
+    # specific_languages only matter when language_support is "specific"
+    assert requirements_key({"specific_languages": ["French"]}, 1) == requirements_key({}, 1)
+
+
+def test_match_models_is_memoized_per_catalog_generation(db_session, monkeypatch):
+    db_session.add(LLMModel(name="Coder", provider="P", parameters=7.0, strengths="code",
+                            license_type="open_source", hardware_requirements="local"))
+    db_session.commit()
+    calls = []
+    real_score = recommender.score_catalog
+    monkeypatch.setattr(recommender, "score_catalog",
+                        lambda *args: calls.append(args) or real_score(*args))
+    catalog_cache.invalidate()
+    recommendation_cache.clear()
+
+    requirements = {"task_type": "code_generation", "deployment": "local"}
+    first = match_models(requirements, db_session)
+    assert first[0]["score"] == 40
+    assert match_models(dict(requirements), db_session) == first
+    assert len(calls) == 1
+
+    catalog_cache.invalidate()
+    assert match_models(requirements, db_session) == first
+    assert len(calls) == 2
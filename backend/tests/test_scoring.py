@@ -0,0 +1,230 @@
+import itertools
+import random
+from types import SimpleNamespace
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from app.core.scoring import (
+    DEFAULT_PROFILE,
+    compile_catalog,
+    compile_profile,
+    compile_weights,
+    score_catalog,
+)
+
+
+def legacy_matching_models(requirements, models):
+    """The original per-model rule chain, kept as the reference implementation."""
+    results = []
+    for model in models:
+        score = 0
+        reasoning_points = []
+        if "task_type" in requirements:
+            task_type = requirements["task_type"]
+            if task_type == "text_generation" and "text generation" in model.strengths.lower():
+                score += 20
+                reasoning_points.append("Excellent for text generation tasks")
+            elif task_type == "code_generation" and "code" in model.strengths.lower():
+                score += 20
+                reasoning_points.append("Specialized in code generation")
+            elif task_type == "translation" and "translation" in model.strengths.lower():
+                score += 20
+                reasoning_points.append("Strong multilingual translation capabilities")
+            elif task_type == "summarization" and "summarization" in model.strengths.lower():
+                score += 20
+                reasoning_points.append("Effective at text summarization")
+            elif task_type == "qa" and ("qa" in model.strengths.lower() or "question answering" in model.strengths.lower()):
+                score += 20
+                reasoning_points.append("Optimized for question answering")
+            elif task_type == "chat" and "conversational" in model.strengths.lower():
+                score += 20
+                reasoning_points.append("Designed for conversational interactions")
+        if "size_preference" in requirements:
+            size_pref = requirements["size_preference"]
+            if size_pref == "small" and model.parameters and model.parameters <= 5:
+                score += 15
+                reasoning_points.append("Small model size as preferred")
+            elif size_pref == "medium" and model.parameters and 5 < model.parameters <= 20:
+                score += 15
+                reasoning_points.append("Medium model size as preferred")
+            elif size_pref == "large" and model.parameters and 20 < model.parameters <= 100:
+                score += 15
+                reasoning_points.append("Large model size as preferred")
+            elif size_pref == "xlarge" and model.parameters and model.parameters > 100:
+                score += 15
+                reasoning_points.append("Extra large model as preferred")
+        if "license_preference" in requirements:
+            license_pref = requirements["license_preference"]
+            if license_pref == "any" or license_pref == model.license_type:
+                score += 15
+                reasoning_points.append(f"License type ({model.license_type}) matches preference")
+        if "budget_constraint" in requirements and model.pricing_info:
+            budget = requirements["budget_constraint"]
+            if budget == "free" and "free" in model.pricing_info.lower():
+                score += 15
+                reasoning_points.append("Available for free as required")
+            elif budget == "low" and "low" in model.pricing_info.lower():
+                score += 15
+                reasoning_points.append("Low cost option")
+            elif budget == "medium" and "medium" in model.pricing_info.lower():
+                score += 15
+                reasoning_points.append("Medium cost tier")
+            elif budget == "high" and "enterprise" in model.pricing_info.lower():
+                score += 15
+                reasoning_points.append("Enterprise-grade offering")
+            elif budget == "any":
+                score += 10
+                reasoning_points.append("Matches any budget constraint")
+        if "language_support" in requirements and model.supported_languages:
+            lang_support = requirements["language_support"]
+            if lang_support == "english" and "english" in [lang.lower() for lang in model.supported_languages]:
+                score += 15
+                reasoning_points.append("Supports English as required")
+            elif lang_support == "multilingual" and len(model.supported_languages) > 5:
+                score += 15
+                reasoning_points.append("Strong multilingual support")
+            elif lang_support == "specific" and "specific_languages" in requirements:
+                specific_langs = requirements["specific_languages"]
+                supported = all(lang.lower() in [l.lower() for l in model.supported_languages] for lang in specific_langs)
+                if supported:
+                    score += 15
+                    reasoning_points.append("Supports all the specific languages required")
+        if "deployment" in requirements:
+            deployment = requirements["deployment"]
+            if deployment == "cloud" and "api" in model.hardware_requirements.lower():
+                score += 15
+                reasoning_points.append("Available as cloud API")
+            elif deployment == "local" and "local" in model.hardware_requirements.lower():
+                score += 15
+                reasoning_points.append("Suitable for local deployment")
+            elif deployment == "hybrid":
+                score += 10
+                reasoning_points.append("Can be used in hybrid deployment")
+        score += 5
+        if score >= 30:
+            results.append({
+                "model_id": model.id,
+                "score": score,
+                "reasoning": ". ".join(reasoning_points) + "."
+            })
+    results.sort(key=lambda x: x["score"], reverse=True)
+    return results[:5]
+
+
+STRENGTHS = [
+    "Excellent text generation and summarization",
+    "Code generation, QA and reasoning",
+    "Conversational assistant with translation",
+    "Question answering over documents",
+    "General knowledge",
+    "",
+]
+PRICING = [None, "", "Free for research", "Low cost per token", "Medium tier", "Enterprise plans", "Pay per token"]
+HARDWARE = ["Available through API", "Local deployment on GPUs", "API or local", "Requires datacenter"]
+LANGUAGES = ["English", "Spanish", "French", "German", "Japanese", "Chinese", "Korean", "Arabic"]
+LICENSES = ["commercial", "open_source", "research", None]
+
+
+def make_catalog(size, seed):
+    rng = random.Random(seed)
+    models = []
+    for i in range(size):
+        langs = rng.sample(LANGUAGES, rng.randint(0, len(LANGUAGES)))
+        models.append(SimpleNamespace(
+            id=i + 1,
+            strengths=rng.choice(STRENGTHS),
+            parameters=rng.choice([None, 0, 1.5, 5, 7, 20, 70, 100, 175, 1500]),
+            license_type=rng.choice(LICENSES),
+            pricing_info=rng.choice(PRICING),
+            supported_languages=[lang.upper() if rng.random() < 0.2 else lang for lang in langs] or None,
+            hardware_requirements=rng.choice(HARDWARE),
+        ))
+    return models
+
+
+QUESTIONS = {
+    "task_type": ["text_generation", "code_generation", "translation", "summarization", "qa", "chat"],
+    "size_preference": ["small", "medium", "large", "xlarge"],
+    "license_preference": ["commercial", "open_source", "research", "any"],
+    "budget_constraint": ["free", "low", "medium", "high", "any"],
+    "language_support": ["english", "multilingual", "specific"],
+    "deployment": ["cloud", "local", "hybrid"],
+}
+
+
+@pytest.mark.parametrize("seed", [1, 2, 3])
+def test_matches_legacy_rules_for_every_questionnaire_answer(seed):
+    models = make_catalog(60, seed)
+    catalog = compile_catalog(models)
+    keys = list(QUESTIONS)
+    for values in itertools.product(*(QUESTIONS[key] for key in keys)):
+        requirements = dict(zip(keys, values))
+        if requirements["language_support"] == "specific":
+            requirements["specific_languages"] = ["english", "French"]
+        assert score_catalog(catalog, requirements) == legacy_matching_models(requirements, models)
+
+
+def test_matches_legacy_rules_for_partial_and_unusual_requirements():
+    models = make_catalog(40, 7)
+    catalog = compile_catalog(models)
+    cases = [
+        {},
+        {"license_preference": None},
+        {"task_type": "unknown", "deployment": "hybrid", "budget_constraint": "any"},
+        {"language_support": "specific", "specific_languages": []},
+        {"language_support": "specific", "specific_languages": ["Klingon"]},
+        {"language_support": "specific"},
+        {"size_preference": ["small"], "license_preference": ["any"], "deployment": "hybrid"},
+    ]
+    for requirements in cases:
+        assert score_catalog(catalog, requirements) == legacy_matching_models(requirements, models)
+
+
+def test_empty_catalog():
+    assert score_catalog(compile_catalog([]), {"task_type": "qa"}) == []
+
+
+def test_weights_scale_matched_criteria():
+    models = make_catalog(60, 11)
+    catalog = compile_catalog(models)
+    requirements = {
+        "task_type": "code_generation", "license_preference": "open_source",
+        "budget_constraint": "any", "deployment": "hybrid",
+    }
+    weights = compile_weights({"task_type": 2.5, "license_preference": 0, "budget_constraint": 30, "baseline": 1})
+    by_id = {model.id: model for model in models}
+    results = score_catalog(catalog, requirements, limit=60, min_score=0, weights=weights)
+    assert len(results) == 60
+    for result in results:
+        model = by_id[result["model_id"]]
+        expected = 1 + 15 * 10 / 15  # baseline and partial hybrid deployment
+        expected += 2.5 if "code" in model.strengths.lower() else 0
+        expected += 20 if model.pricing_info else 0  # partial "any" budget
+        assert result["score"] == expected
+    scores = [result["score"] for result in results]
+    assert scores == sorted(scores, reverse=True)
+    # Zero-weight matches still explain themselves
+    assert any("License type (open_source)" in result["reasoning"] for result in results)
+
+
+def test_default_profile_is_the_legacy_rules():
+    models = make_catalog(40, 5)
+    catalog = compile_catalog(models)
+    requirements = {"task_type": "qa", "deployment": "cloud", "budget_constraint": "low"}
+    default = score_catalog(catalog, requirements)
+    assert all(isinstance(result["score"], int) for result in default)
+    profile = compile_profile(weights={"task_type": 20})
+    assert profile.weights.tolist() == DEFAULT_PROFILE.weights.tolist()
+    assert score_catalog(catalog, requirements, profile.top_k, profile.min_score, profile.weights) == default
+
+
+def test_profiles_layer_and_validate():
+    base = compile_profile(weights={"deployment": 0}, min_score=10)
+    profile = compile_profile(weights={"task_type": 40}, top_k=3, base=base)
+    assert (profile.min_score, profile.top_k) == (10, 3)
+    assert profile.weights[0] == 40 and profile.weights[5] == 0
+    for kwargs in ({"weights": {"unknown": 1}}, {"weights": {"task_type": -1}}, {"top_k": 0}):
+        with pytest.raises(ValueError):
+            compile_profile(**kwargs)
@@ -0,0 +1,135 @@
+import asyncio
+import json
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from app.core.catalog import CatalogSnapshot
+from app.core.search import ModelSearchIndex, SearchIndexCache, tokenize
+from app.db.search import MARK_START, MARK_STOP, render_headline
+
+
+def make_snapshot(*texts, generation=1):
+    rows = []
+    for i, (name, strengths, description, weaknesses) in enumerate(texts):
+        rows.append(SimpleNamespace(
+            id=i + 1, name=name, provider="Provider", version=None, parameters=7.0,
+            description=description, training_data=None, strengths=strengths,
+            weaknesses=weaknesses, license_type=None, pricing_info=None,
+            hardware_requirements=None, supported_languages=None, performance_benchmarks=None,
+            created_at=datetime(2024, 1, 1, tzinfo=timezone.utc), updated_at=None,
+        ))
+    return CatalogSnapshot.build(rows, generation)
+
+
+CATALOG = [
+    ("Coder", "Code generation and code review", "A model for programmers.", None),
+    ("Polyglot", "Multilingual translation", "Supports many languages, including code comments.", "Weak at math"),
+    ("Summit", "Summarization of long documents", "Summaries for reports.", "Not for code"),
+    ("Chatty", "Conversational assistant", None, None),
+]
+
+
+def test_tokenize_folds_case_plurals_and_stopwords():
+    assert tokenize("The Models are FAST, and the code-reviews") == ["model", "fast", "code", "review"]
+
+
+def test_bm25_ranks_by_field_weight_and_frequency():
+    index = ModelSearchIndex(make_snapshot(*CATALOG))
+    total, hits = index.search("code")
+    assert total == 3
+    # Repeated in strengths beats a description mention beats a weakness
+    assert [hit.model_id for hit in hits] == [1, 2, 3]
+    assert hits[0].score > hits[1].score > hits[2].score
+    assert hits[0].highlights["strengths"] == "<mark>Code</mark> generation and <mark>code</mark> review"
+
+
+def test_typos_expand_to_similar_terms():
+    index = ModelSearchIndex(make_snapshot(*CATALOG))
+    total, hits = index.search("multilingul")
+    assert total == 1
+    assert hits[0].model_id == 2
+    assert "<mark>Multilingual</mark>" in hits[0].highlights["strengths"]
+    assert index.search("qwertyuiop") == (0, [])
+
+
+def test_pagination_and_ties_keep_catalog_order():
+    index = ModelSearchIndex(make_snapshot(*[(f"Model {i}", "code", None, None) for i in range(10)]))
+    total, first = index.search("code", limit=4)
+    _, second = index.search("code", limit=4, offset=4)
+    assert total == 10
+    assert [hit.model_id for hit in first + second] == list(range(1, 9))
+
+
+def test_long_fields_are_snipped_around_the_match():
+    long_text = "filler words " * 40 + "rare capability here" + " and more" * 40
+    index = ModelSearchIndex(make_snapshot(("Long", None, long_text, None)))
+    snippet = index.search("capability")[1][0].highlights["description"]
+    assert snippet.startswith("…") and snippet.endswith("…")
+    assert "<mark>capability</mark>" in snippet
+    assert len(snippet) < len(long_text)
+
+
+def test_highlights_escape_html():
+    index = ModelSearchIndex(make_snapshot(("<b>Code</b>", "Code <script>alert(1)</script> & review", None, None)))
+    highlights = index.search("code")[1][0].highlights
+    assert highlights["strengths"] == "<mark>Code</mark> &lt;script&gt;alert(1)&lt;/script&gt; &amp; review"
+    assert highlights["name"] == "&lt;b&gt;<mark>Code</mark>&lt;/b&gt;"
+
+    headline = f"<img src=x onerror=alert(1)> {MARK_START}code{MARK_STOP} <mark>"
+    assert render_headline(headline) == "&lt;img src=x onerror=alert(1)&gt; <mark>code</mark> &lt;mark&gt;"
+
+
+def test_index_is_built_once_per_snapshot():
+    cache = SearchIndexCache()
+    first = make_snapshot(*CATALOG)
+    assert cache.get(first) is cache.get(first)
+    second = make_snapshot(*CATALOG, generation=2)
+    assert cache.get(second).snapshot is second
+    assert cache.builds == 2
+
+
+def test_full_text_pages_past_the_end_keep_their_total(load_endpoint, monkeypatch):
+    models = load_endpoint("models")
+    snapshot = make_snapshot(*CATALOG)
+
+    async def get_async(db):
+        return snapshot
+
+    async def available(db):
+        return True
+
+    monkeypatch.setattr(models.catalog_cache, "get_async", get_async)
+    monkeypatch.setattr(models, "search_vector_available", available)
+    monkeypatch.setattr(models.settings, "SEARCH_BACKEND", "auto")
+
+    class Result:
+        def all(self):
+            return []
+
+    class PostgresSession:
+        bind = SimpleNamespace(dialect=SimpleNamespace(name="postgresql"))
+        matches = 25
+
+        async def execute(self, statement):
+            return Result()
+
+        async def scalar(self, statement):
+            return self.matches
+
+    async def search(offset, db):
+        response = await models.search_models(q="code", limit=20, offset=offset, db=db)
+        return json.loads(response.body)
+
+    # Past the last full-text hit: an empty page, not the in-process results
+    page = asyncio.run(search(20, PostgresSession()))
+    assert (page["total"], page["items"]) == (25, [])
+
+    # No full-text match at all falls back to the in-process index
+    no_match = PostgresSession()
+    no_match.matches = 0
+    page = asyncio.run(search(0, no_match))
+    assert page["total"] == 3 and page["items"][0]["model"]["name"] == "Coder"
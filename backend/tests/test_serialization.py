@@ -0,0 +1,67 @@
+import json
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from app.core.catalog import CatalogSnapshot
+from app.core.serialization import cursor_page, json_array
+from app.schemas.schemas import CursorPage, LLMModelResponse
+
+
+def make_row(model_id, **fields):
+    values = dict(
+        id=model_id,
+        name=f"Model {model_id}",
+        provider="Provider",
+        version=None,
+        parameters=7.0,
+        description="Ünïcode description",
+        training_data=None,
+        strengths="code",
+        weaknesses=None,
+        license_type="open_source",
+        pricing_info=None,
+        hardware_requirements="API",
+        supported_languages=["English"],
+        performance_benchmarks={"mmlu": 70.5},
+        created_at=datetime(2024, 1, 1, tzinfo=timezone.utc),
+        updated_at=None,
+    )
+    values.update(fields)
+    return SimpleNamespace(**values)
+
+
+def test_pre_encoded_rows_match_response_model_encoding():
+    snapshot = CatalogSnapshot.build([make_row(1), make_row(2, parameters=None)], generation=1)
+    rows = [snapshot.json_rows[m.id] for m in snapshot.models]
+
+    expected = [m.model_dump(mode="json") for m in snapshot.models]
+    assert json.loads(json_array(rows)) == expected
+    assert json_array([]) == b"[]"
+
+    page = CursorPage[LLMModelResponse](items=list(snapshot.models), next_cursor="abc")
+    assert json.loads(cursor_page(rows, "abc")) == page.model_dump(mode="json")
+    assert json.loads(cursor_page([], None)) == {"items": [], "next_cursor": None}
+
+
+def test_pre_encoded_rows_are_byte_identical_to_the_jsonable_encoder_path():
+    snapshot = CatalogSnapshot.build([
+        make_row(1),
+        make_row(
+            2,
+            parameters=None,
+            description='Quotes "and" <tags>\u2028',
+            created_at=datetime(2024, 5, 6, 7, 8, 9, 123456),  # naive
+            updated_at=datetime(2024, 5, 6, 7, 8, 9, tzinfo=timezone(timedelta(hours=2))),
+        ),
+    ], generation=1)
+    rows = [snapshot.json_rows[m.id] for m in snapshot.models]
+    assert json_array(rows) == JSONResponse(jsonable_encoder(list(snapshot.models))).body
+
+    # Floats in exponent notation are spelled differently, with the same value
+    snapshot = CatalogSnapshot.build([make_row(3, parameters=1e-7)], generation=2)
+    new, old = snapshot.json_rows[3], JSONResponse(jsonable_encoder(snapshot.models[0])).body
+    assert b'"parameters":1e-7' in new and b'"parameters":1e-07' in old
+    assert json.loads(new) == json.loads(old)
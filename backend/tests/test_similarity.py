@@ -0,0 +1,123 @@
+import os
+import threading
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from app.core.catalog import CatalogSnapshot
+from app.core.similarity import SimilarityIndexCache, build_index, embed_query
+
+DIMENSIONS = 128
+
+
+def make_snapshot(*texts, generation=1):
+    rows = []
+    for i, (strengths, description, weaknesses) in enumerate(texts):
+        rows.append(SimpleNamespace(
+            id=i + 1, name=f"Model {i + 1}", provider="Provider", version=None, parameters=7.0,
+            description=description, training_data=None, strengths=strengths,
+            weaknesses=weaknesses, license_type=None, pricing_info=None,
+            hardware_requirements=None, supported_languages=None, performance_benchmarks=None,
+            created_at=datetime(2024, 1, 1, tzinfo=timezone.utc), updated_at=None,
+        ))
+    return CatalogSnapshot.build(rows, generation)
+
+
+CATALOG = [
+    ("Code generation and code review", "A model for programmers writing Python.", None),
+    ("Code completion", "Autocompletes Python code in editors.", "Weak at math"),
+    ("Summarization of long documents", "Summaries for legal reports.", "Not for code"),
+    ("Conversational assistant", "Friendly chat for customer support.", None),
+]
+
+
+def test_similar_ranks_closest_text_first_and_excludes_itself(tmp_path):
+    index = build_index(make_snapshot(*CATALOG), str(tmp_path), DIMENSIONS)
+    neighbours = index.similar(1, limit=3)
+    assert neighbours[0][0] == 2
+    assert 1 not in [model_id for model_id, _ in neighbours]
+    assert all(0 < score <= 1 for _, score in neighbours)
+    assert index.similar(99, limit=3) == []
+
+
+def test_free_text_query(tmp_path):
+    index = build_index(make_snapshot(*CATALOG), str(tmp_path), DIMENSIONS)
+    assert index.nearest(embed_query("chat assistant for customer support", DIMENSIONS), 1)[0][0] == 4
+    assert index.nearest(embed_query("the and of", DIMENSIONS), 5) == []  # stopwords only
+
+
+def test_new_generation_only_embeds_changed_rows(tmp_path):
+    first = build_index(make_snapshot(*CATALOG), str(tmp_path), DIMENSIONS)
+    assert (first.reused, first.embedded) == (0, 4)
+
+    changed = CATALOG[:3] + [("Chat about legal documents", "Summaries in a conversation.", None)]
+    second = build_index(make_snapshot(*changed, generation=2), str(tmp_path), DIMENSIONS, previous=first)
+    assert (second.reused, second.embedded) == (3, 1)
+    np.testing.assert_array_equal(second.columns[:, :3], first.columns[:, :3])
+    assert second.similar(4, limit=1)[0][0] == 3
+
+    grown = changed + [("Code review bot", "Reviews pull requests.", None)]
+    third = build_index(make_snapshot(*grown, generation=3), str(tmp_path), DIMENSIONS)
+    assert (third.reused, third.embedded) == (4, 1)
+
+
+def test_workers_share_the_memory_mapped_files(tmp_path):
+    snapshot = make_snapshot(*CATALOG)
+    worker_a = SimilarityIndexCache(str(tmp_path), DIMENSIONS)
+    worker_b = SimilarityIndexCache(str(tmp_path), DIMENSIONS)
+    index_a = worker_a.get(snapshot)
+    index_b = worker_b.get(snapshot)
+    assert index_a.embedded == 4
+    assert index_b.embedded == 0  # mapped the files worker A wrote
+    assert isinstance(index_b.columns, np.memmap)
+    assert index_b.similar(1, limit=2) == index_a.similar(1, limit=2)
+    assert worker_a.get(snapshot) is index_a
+
+
+def test_old_generations_are_removed(tmp_path):
+    (tmp_path / f"g1-d{DIMENSIONS}.vectors").write_bytes(b"")  # older flat layout
+    previous = None
+    for generation in range(1, 5):
+        previous = build_index(make_snapshot(*CATALOG, generation=generation), str(tmp_path), DIMENSIONS, previous)
+    assert sorted(os.listdir(tmp_path)) == [f"g3-d{DIMENSIONS}", f"g4-d{DIMENSIONS}"]  # no staging left
+    assert sorted(os.listdir(tmp_path / f"g4-d{DIMENSIONS}")) == ["fingerprints.npy", "ids.npy", "vectors"]
+
+
+def test_a_changed_set_replaces_the_generation_directory(tmp_path):
+    first = build_index(make_snapshot(*CATALOG), str(tmp_path), DIMENSIONS)
+    # Same generation, different rows (e.g. written by a worker with an older view)
+    second = build_index(make_snapshot(*CATALOG[:3]), str(tmp_path), DIMENSIONS)
+    assert len(second) == 3 and len(first) == 4
+    assert first.similar(1, limit=1)[0][0] == 2  # the old mapping still works
+    assert os.listdir(tmp_path) == [f"g1-d{DIMENSIONS}"]
+
+
+def test_catalog_changes_rebuild_in_the_background(tmp_path, monkeypatch):
+    from app.core import similarity
+
+    cache = SimilarityIndexCache(str(tmp_path), DIMENSIONS)
+    cache.on_catalog_change(make_snapshot(*CATALOG))
+    assert cache.stats()["builds"] == 0  # not used yet, nothing to keep fresh
+
+    first = cache.get(make_snapshot(*CATALOG))
+    started, release = threading.Event(), threading.Event()
+    real_build = similarity.build_index
+
+    def slow_build(*args, **kwargs):
+        started.set()
+        release.wait(5)
+        return real_build(*args, **kwargs)
+
+    monkeypatch.setattr(similarity, "build_index", slow_build)
+    grown = make_snapshot(*CATALOG, ("Code review bot", "Reviews pull requests.", None), generation=2)
+    cache.on_catalog_change(grown)
+    assert started.wait(5)
+    # Requests keep the previous generation while the new one is built
+    assert cache.get(grown) is first
+    release.set()
+    cache.wait(5)
+    assert cache.get(grown).generation == 2 and len(cache.get(grown)) == 5
+    assert cache.stats()["rebuilding"] is False
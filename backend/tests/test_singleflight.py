@@ -0,0 +1,105 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from app.core.singleflight import SingleFlight
+
+
+def test_sync_callers_share_one_run():
+    flights = SingleFlight()
+    started = threading.Event()
+    release = threading.Event()
+    runs = []
+
+    def compute():
+        runs.append(1)
+        started.set()
+        release.wait(5)
+        return object()
+
+    with ThreadPoolExecutor(8) as pool:
+        leader = pool.submit(flights.do, "key", compute)
+        started.wait(5)
+        followers = [pool.submit(flights.do, "key", compute) for _ in range(7)]
+        while flights.coalesced < 7:
+            time.sleep(0.001)
+        release.set()
+        results = [leader.result()] + [future.result() for future in followers]
+
+    assert len(runs) == 1
+    assert all(result is results[0] for result in results)
+    assert flights.stats() == {"in_flight": 0, "executed": 1, "coalesced": 7}
+    # Completed calls are not remembered
+    assert flights.do("key", lambda: 2) == 2
+
+
+def test_async_and_sync_callers_share_one_run():
+    flights = SingleFlight()
+
+    async def scenario():
+        release = asyncio.Event()
+
+        async def compute():
+            await release.wait()
+            return "result"
+
+        waiters = [asyncio.ensure_future(flights.do_async("key", compute)) for _ in range(5)]
+        await asyncio.sleep(0)
+        sync_follower = asyncio.get_running_loop().run_in_executor(None, flights.do, "key", lambda: "other")
+        while flights.coalesced < 5:
+            await asyncio.sleep(0.001)
+        # A cancelled waiter does not cancel the shared call
+        waiters.pop().cancel()
+        release.set()
+        return await asyncio.gather(*waiters, sync_follower)
+
+    assert asyncio.run(scenario()) == ["result"] * 5
+    assert flights.stats() == {"in_flight": 0, "executed": 1, "coalesced": 5}
+
+
+def test_cancelling_the_leader_does_not_fail_followers():
+    flights = SingleFlight()
+
+    async def scenario():
+        release = asyncio.Event()
+
+        async def compute():
+            await release.wait()
+            return "result"
+
+        leader = asyncio.ensure_future(flights.do_async("key", compute))
+        await asyncio.sleep(0)
+        follower = asyncio.ensure_future(flights.do_async("key", compute))
+        await asyncio.sleep(0)
+        leader.cancel()
+        await asyncio.sleep(0)
+        release.set()
+        return leader.cancelled() or await leader, await follower
+
+    assert asyncio.run(scenario()) == (True, "result")
+    assert flights.stats() == {"in_flight": 0, "executed": 1, "coalesced": 1}
+
+
+def test_errors_reach_every_waiter_and_release_the_key():
+    flights = SingleFlight()
+
+    async def scenario():
+        release = asyncio.Event()
+
+        async def fail():
+            await release.wait()
+            raise ValueError("boom")
+
+        waiters = [asyncio.ensure_future(flights.do_async("key", fail)) for _ in range(3)]
+        await asyncio.sleep(0)
+        release.set()
+        return await asyncio.gather(*waiters, return_exceptions=True)
+
+    errors = asyncio.run(scenario())
+    assert [str(error) for error in errors] == ["boom"] * 3
+    with pytest.raises(KeyError):
+        flights.do("key", lambda: {}["missing"])
+    assert flights.do("key", lambda: "ok") == "ok"
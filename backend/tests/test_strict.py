@@ -0,0 +1,70 @@
+from sqlalchemy import text
+from sqlalchemy.dialects import postgresql
+
+from app.core.catalog import catalog_cache
+from app.core.recommender import match_models, recommendation_cache
+from app.db.strict import strict_candidates
+from app.models.models import LLMModel
+
+
+def add_models(db):
+    rows = [
+        ("Small open", 3.0, "open_source", ["English", "French"]),
+        ("Small commercial", 4.0, "commercial", ["english"]),
+        ("Large open", 70.0, "open_source", ["ENGLISH", "German", "French"]),
+        ("Unknown size", None, None, None),
+        ("Zero size", 0.0, "open_source", []),
+    ]
+    models = [
+        LLMModel(name=name, provider="P", parameters=parameters, license_type=license_type,
+                 supported_languages=languages, strengths="code", hardware_requirements="local")
+        for name, parameters, license_type, languages in rows
+    ]
+    db.add_all(models)
+    db.commit()
+    return {model.name: model.id for model in models}
+
+
+def candidates(db, requirements):
+    query = strict_candidates(requirements, db.bind.dialect.name)
+    return None if query is None else sorted(db.scalars(query))
+
+
+def test_hard_constraints_become_predicates(db_session):
+    ids = add_models(db_session)
+    assert candidates(db_session, {"task_type": "qa", "license_preference": "any"}) is None
+    assert candidates(db_session, {"license_preference": "open_source", "size_preference": "small"}) == [
+        ids["Small open"]
+    ]
+    assert candidates(db_session, {"license_preference": None}) == [ids["Unknown size"]]
+    assert candidates(db_session, {"size_preference": "large"}) == [ids["Large open"]]
+    languages = {"language_support": "specific", "specific_languages": ["french", "English"]}
+    assert candidates(db_session, languages) == [ids["Small open"], ids["Large open"]]
+    assert candidates(db_session, dict(languages, specific_languages=["Klingon"])) == []
+    assert candidates(db_session, dict(languages, specific_languages="French")) == []
+    assert candidates(db_session, {"license_preference": ["any"]}) == []
+
+
+def test_strict_mode_only_scores_candidates(db_session):
+    ids = add_models(db_session)
+    catalog_cache.invalidate()
+    recommendation_cache.clear()
+    requirements = {"task_type": "code_generation", "license_preference": "commercial", "deployment": "local"}
+    lenient = match_models(requirements, db_session)
+    strict = match_models(requirements, db_session, strict=True)
+    assert len(lenient) == 5
+    assert [result["model_id"] for result in strict] == [ids["Small commercial"]]
+    assert strict[0] == lenient[0]
+
+
+def test_postgres_languages_predicate_matches_the_gin_index():
+    query = strict_candidates({"language_support": "specific", "specific_languages": ["French"]}, "postgresql")
+    sql = str(query.compile(dialect=postgresql.dialect()))
+    assert "CAST(lower(CAST(llm_models.supported_languages AS TEXT)) AS JSONB) @>" in sql
+
+
+def test_license_and_size_use_indexes(db_session):
+    query = strict_candidates({"license_preference": "commercial", "size_preference": "medium"}, "sqlite")
+    compiled = query.compile(dialect=db_session.bind.dialect, compile_kwargs={"literal_binds": True})
+    plan = " ".join(row[-1] for row in db_session.execute(text(f"EXPLAIN QUERY PLAN {compiled}")))
+    assert "USING INDEX ix_llm_models_" in plan
@@ -0,0 +1,92 @@
+from collections import Counter
+from dataclasses import replace
+
+import numpy as np
+import pytest
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.db import synthetic
+from app.db.session import Base
+from app.db.synthetic import SyntheticConfig, load_synthetic
+from app.models.models import LLMModel, ModelBenchmark, Recommendation, RecommendationItem, SavedModel, User
+
+CONFIG = SyntheticConfig(seed=7, models=300, users=40, saved_per_user=2.0, recommendations=500, items_per_recommendation=4)
+
+
+@pytest.fixture(autouse=True)
+def small_chunks(monkeypatch):
+    # Several chunks per table, and no real password hashing
+    monkeypatch.setattr(synthetic, "GENERATION_CHUNK", 128)
+    monkeypatch.setattr(synthetic, "get_password_hash", lambda password: "hashed")
+    monkeypatch.setattr(synthetic.catalog_cache, "invalidate", lambda: None)
+
+
+def load(config=CONFIG):
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+    return db, load_synthetic(db, config)
+
+
+def dump(db):
+    return [
+        db.execute(select(*model.__table__.columns).order_by(*model.__table__.primary_key.columns)).all()
+        for model in (LLMModel, ModelBenchmark, User, SavedModel, Recommendation, RecommendationItem)
+    ]
+
+
+def test_same_seed_gives_the_same_dataset():
+    first, counts = load()
+    second, _ = load()
+    assert dump(first) == dump(second)
+    assert dump(first) != dump(load(replace(CONFIG, seed=8))[0])
+    assert counts["models"] == 300 and counts["users"] == 40
+    assert counts["recommendations"] == 500 and counts["items"] == 2000
+    assert counts["saved_models"] == first.scalar(select(func.count()).select_from(SavedModel))
+
+
+def test_dataset_is_consistent_and_realistic():
+    db, counts = load()
+    models = db.scalars(select(LLMModel)).all()
+    assert len({(model.name, model.provider, model.version) for model in models}) == len(models)
+    assert Counter(model.provider for model in models).most_common(1)[0][1] > 10  # long-tailed providers
+    assert sum("English" in (model.supported_languages or []) for model in models) > 0.9 * len(models)
+
+    # Benchmark rows mirror the JSON and are ranked
+    assert counts["benchmarks"] == sum(
+        sum(1 for value in (model.performance_benchmarks or {}).values() if isinstance(value, float))
+        for model in models
+    )
+    assert db.scalar(select(func.min(ModelBenchmark.rank))) == 1
+
+    # Items reference existing rows, list distinct models and never increase in score
+    model_ids = {model.id for model in models}
+    items = db.execute(select(RecommendationItem).order_by(RecommendationItem.id)).scalars().all()
+    by_recommendation = {}
+    for item in items:
+        assert item.model_id in model_ids
+        by_recommendation.setdefault(item.recommendation_id, []).append(item)
+    for entries in by_recommendation.values():
+        assert len({item.model_id for item in entries}) == len(entries) == 4
+        assert [item.score for item in entries] == sorted((item.score for item in entries), reverse=True)
+
+    # Histories are in id order
+    created = db.scalars(select(Recommendation.created_at).order_by(Recommendation.id)).all()
+    assert created == sorted(created)
+    saved = db.execute(select(SavedModel.user_id, SavedModel.model_id)).all()
+    assert len(set(saved)) == len(saved)
+
+
+@pytest.mark.parametrize("k", [9, 10])
+def test_items_stay_distinct_when_k_is_close_to_the_catalog_size(k):
+    batches = synthetic.generate_recommendations(7, 300, k, [1], list(range(100, 110)), 1, 1)
+    items = [item for _, chunk in batches for item in chunk]
+    picks = np.array([item[2] for item in items]).reshape(300, k)
+    assert all(len(set(row)) == k for row in picks)
+    # Still drawn by popularity: the most popular model leads more often
+    # than the least popular one
+    rank = np.random.default_rng([7, synthetic.RECOMMENDATIONS]).permutation(10)
+    first = Counter(picks[:, 0])
+    assert first[100 + rank[0]] > 2 * first[100 + rank[-1]]
@@ -1,6 +1,6 @@
 import React, { useState } from 'react';
 import { useNavigate } from 'react-router-dom';
-import { useQuery, useMutation, useQueryClient } from 'react-query';
+import { useInfiniteQuery, useMutation, useQueryClient } from 'react-query';
 import {
   Box,
   Heading,
@@ -48,19 +48,21 @@ const ModelListPage = () => {
     licenseType: '',
   });
   
-  // Fetch models with filters
-  const { data: models = [], isLoading } = useQuery(
-    ['models', filters],
-    () => {
+  // Fetch models with filters, a page at a time
+  const { data, isLoading, fetchNextPage, hasNextPage, isFetchingNextPage } = useInfiniteQuery(
+    ['models', filters.provider, filters.minParameters, filters.maxParameters, filters.licenseType],
+    ({ pageParam = '' }) => {
       const params = {};
       if (filters.provider) params.provider = filters.provider;
       if (filters.minParameters) params.min_parameters = parseFloat(filters.minParameters);
       if (filters.maxParameters) params.max_parameters = parseFloat(filters.maxParameters);
       if (filters.licenseType) params.license_type = filters.licenseType;
       
-      return modelService.getModels(params).then((res) => res.data);
-    }
+      return modelService.getModelsPage(params, pageParam).then((res) => res.data);
+    },
+    { getNextPageParam: (lastPage) => lastPage.next_cursor || undefined }
   );
+  const models = data ? data.pages.flatMap((page) => page.items) : [];
   
   // Save model mutation
   const saveModelMutation = useMutation(
@@ -307,6 +309,14 @@ const ModelListPage = () => {
               ))}
             </SimpleGrid>
           )}
+          
+          {hasNextPage && (
+            <Flex justify="center" mt={6}>
+              <Button onClick={() => fetchNextPage()} isLoading={isFetchingNextPage}>
+                Load more models
+              </Button>
+            </Flex>
+          )}
         </>
       )}
     </Box>
@@ -1,5 +1,5 @@
 import React, { useState } from 'react';
-import { useQuery, useMutation, useQueryClient } from 'react-query';
+import { useInfiniteQuery, useMutation, useQueryClient } from 'react-query';
 import {
   Box,
   Button,
@@ -55,11 +55,13 @@ const AdminModelsPage = () => {
   const [deletingModel, setDeletingModel] = useState(null);
   const cancelRef = React.useRef();
   
-  // Fetch models
-  const { data: models = [], isLoading } = useQuery(
+  // Fetch models, a page at a time
+  const { data, isLoading, fetchNextPage, hasNextPage, isFetchingNextPage } = useInfiniteQuery(
     'adminModels',
-    () => modelService.getModels().then((res) => res.data)
+    ({ pageParam = '' }) => modelService.getModelsPage({}, pageParam).then((res) => res.data),
+    { getNextPageParam: (lastPage) => lastPage.next_cursor || undefined }
   );
+  const models = data ? data.pages.flatMap((page) => page.items) : [];
   
   // Create model mutation
   const createModelMutation = useMutation(
@@ -241,7 +243,7 @@ const AdminModelsPage = () => {
       
       <HStack mb={6} justify="space-between">
         <Text fontSize="lg">
-          Total Models: {models.length}
+          {hasNextPage ? 'Models Loaded' : 'Total Models'}: {models.length}
         </Text>
         <Button
           leftIcon={<AddIcon />}
@@ -306,6 +308,11 @@ const AdminModelsPage = () => {
               ))}
             </Tbody>
           </Table>
+          {hasNextPage && (
+            <Button mt={4} onClick={() => fetchNextPage()} isLoading={isFetchingNextPage}>
+              Load more models
+            </Button>
+          )}
         </Box>
       )}
       
@@ -47,22 +47,42 @@ export const authService = {
     api.put('/api/v1/users/me/password', { current_password: currentPassword, new_password: newPassword }),
 };
 
+// Models per page of the catalog; callers load further pages on demand
+export const MODELS_PAGE_SIZE = 50;
+
 export const modelService = {
-  getModels: (params) => api.get('/api/v1/models', { params }),
+  getModelsPage: (params, cursor = '') =>
+    api.get('/api/v1/models', { params: { limit: MODELS_PAGE_SIZE, ...params, cursor } }),
   getModel: (id) => api.get(`/api/v1/models/${id}`),
+  searchModels: (q, params) => api.get('/api/v1/models/search', { params: { ...params, q } }),
+  getSimilarModels: (id, params) => api.get(`/api/v1/models/${id}/similar`, { params }),
+  semanticSearch: (query, limit = 10) => api.post('/api/v1/models/semantic-search', { query, limit }),
+  getLeaderboard: (benchmark, params, cursor = '') => api.get('/api/v1/models/leaderboard', { params: { ...params, benchmark, cursor } }),
+  getParetoFront: (request) => api.post('/api/v1/models/pareto', request),
   createModel: (modelData) => api.post('/api/v1/models', modelData),
   updateModel: (id, modelData) => api.put(`/api/v1/models/${id}`, modelData),
   deleteModel: (id) => api.delete(`/api/v1/models/${id}`),
   saveModel: (modelId, notes) => api.post('/api/v1/models/save', { model_id: modelId, notes }),
   unsaveModel: (modelId) => api.delete(`/api/v1/models/save/${modelId}`),
+  exportModels: (format = 'ndjson') => api.get('/api/v1/models/export', { params: { format }, responseType: 'blob' }),
+  importModels: (file, format) => {
+    const formData = new FormData();
+    formData.append('file', file);
+    return api.post('/api/v1/models/import', formData, { params: { format } });
+  },
 };
 
 export const recommendationService = {
   getQuestions: () => api.get('/api/v1/recommendations/questions'),
-  createRecommendation: (requirements) => api.post('/api/v1/recommendations', { requirements }),
+  createRecommendation: (requirements, scoring = {}) => api.post('/api/v1/recommendations', { requirements, ...scoring }),
   getRecommendations: () => api.get('/api/v1/recommendations'),
   getRecommendation: (id) => api.get(`/api/v1/recommendations/${id}`),
   deleteRecommendation: (id) => api.delete(`/api/v1/recommendations/${id}`),
+  getScoringProfiles: () => api.get('/api/v1/recommendations/profiles'),
+  createScoringProfile: (profile) => api.post('/api/v1/recommendations/profiles', profile),
+  updateScoringProfile: (id, profile) => api.put(`/api/v1/recommendations/profiles/${id}`, profile),
+  deleteScoringProfile: (id) => api.delete(`/api/v1/recommendations/profiles/${id}`),
+  exportRecommendations: (format = 'ndjson') => api.get('/api/v1/recommendations/export', { params: { format }, responseType: 'blob' }),
 };
 
 export const adminService = {
@@ -70,4 +90,5 @@ export const adminService = {
   getUser: (id) => api.get(`/api/v1/users/${id}`),
   activateUser: (id) => api.put(`/api/v1/users/${id}/activate`),
   deactivateUser: (id) => api.put(`/api/v1/users/${id}/deactivate`),
+  exportAllRecommendations: (format = 'ndjson') => api.get('/api/v1/admin/exports/recommendations', { params: { format }, responseType: 'blob' }),
 };